@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+MinHash/LSH 유사도 인덱스 조회 지연 벤치마크
+보관 기록이 수십만 개로 늘어날 때 "비슷한 뉴스를 보낸 적 있는가?" 조회 시간 측정
+
+사용법:
+  python benchmarks/bench_minhash_index.py
+  python benchmarks/bench_minhash_index.py --sizes 1000,10000,100000,300000 --queries 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from minhash_index import MinHashLSHIndex, minhash_signature, band_buckets
+from sent_news_store import SentNewsStore
+
+WORDS = (
+    "nvidia apple tesla microsoft amazon meta alphabet fed rates inflation earnings revenue "
+    "guidance shares stock market nasdaq dow index bond yields oil opec dollar china tariffs "
+    "chip ai cloud deal merger acquisition ipo layoffs jobs report cpi gdp treasury bank "
+    "crypto bitcoin rally slump record quarter outlook forecast analyst upgrade downgrade"
+).split()
+# 실제 뉴스처럼 어휘가 넓도록 합성 단어 추가
+VOCABULARY = WORDS + [f"term{i}" for i in range(20000)]
+
+
+def make_news(rng: random.Random) -> dict:
+    title = ' '.join(rng.choice(VOCABULARY) for _ in range(10))
+    summary = ' '.join(rng.choice(VOCABULARY) for _ in range(30))
+    return {'title': title, 'summary': summary, 'original_title': title, 'original_summary': summary}
+
+
+def grow_archive(store: SentNewsStore, index: MinHashLSHIndex, target: int, rng: random.Random, samples: list):
+    """인덱스를 target 개수까지 채우기 (서명/버킷을 직접 일괄 삽입)"""
+    conn = index._conn
+    current = conn.execute('SELECT COUNT(*) FROM sent_news').fetchone()[0]
+    batch = 5000
+    while current < target:
+        news_batch = [make_news(rng) for _ in range(min(batch, target - current))]
+        ids = store.append(news_batch)
+        signature_rows = []
+        bucket_rows = []
+        for news_id, news in zip(ids, news_batch):
+            signature = minhash_signature(f"{news['title']} {news['summary'][:200]}")
+            signature_rows.append((news_id, array('I', signature).tobytes()))
+            bucket_rows.extend((band, bucket, news_id) for band, bucket in band_buckets(signature))
+        with conn:
+            conn.executemany('INSERT INTO news_signatures (news_id, signature) VALUES (?, ?)', signature_rows)
+            conn.executemany('INSERT INTO lsh_buckets (band, bucket, news_id) VALUES (?, ?, ?)', bucket_rows)
+        samples.extend(news_batch[:10])
+        current += len(news_batch)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='1000,10000,100000', help='보관 기록 개수 (콤마 구분)')
+    parser.add_argument('--queries', type=int, default=300, help='크기별 조회 횟수')
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = SentNewsStore(os.path.join(tmp_dir, 'sent_news_history.db'))
+        index = MinHashLSHIndex(store.db_file)
+        samples = []
+
+        print(f"{'기록 수':>10} | {'서명 계산(ms)':>13} | {'인덱스 조회(ms)':>15} | {'p95 조회(ms)':>12} | {'적중률':>6}")
+        print('-' * 70)
+
+        for size in sizes:
+            grow_archive(store, index, size, rng, samples)
+
+            # 절반은 과거 기록의 변형(중복), 절반은 새 뉴스
+            queries = []
+            for i in range(args.queries):
+                if i % 2 == 0:
+                    base = rng.choice(samples)
+                    queries.append(dict(base, title=base['title'] + ' update'))
+                else:
+                    queries.append(make_news(rng))
+
+            signature_times = []
+            lookup_times = []
+            hits = 0
+            for i, news in enumerate(queries):
+                started = time.perf_counter()
+                signature = minhash_signature(f"{news['title']} {news['summary'][:200]}")
+                signature_times.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                matches = index.query_signature(signature, threshold=0.5)
+                lookup_times.append(time.perf_counter() - started)
+                if i % 2 == 0 and matches:
+                    hits += 1
+
+            lookup_times.sort()
+            avg_signature = sum(signature_times) / len(signature_times) * 1000
+            avg_lookup = sum(lookup_times) / len(lookup_times) * 1000
+            p95_lookup = lookup_times[int(len(lookup_times) * 0.95)] * 1000
+            hit_rate = hits / ((len(queries) + 1) // 2)
+            print(f"{size:>10,} | {avg_signature:>13.3f} | {avg_lookup:>15.3f} | {p95_lookup:>12.3f} | {hit_rate:>6.0%}")
+
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
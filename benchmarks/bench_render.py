@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+브리프 렌더링 + 분할 시간 벤치마크
+기존 방식(필드마다 str.replace 18번 + 완성된 문자열을 '\\n\\n' 기준 분할)과
+message_render 방식(들어 있는 특수문자만 replace + 블록 경계 분할)의 브리프당 시간 비교
+
+사용법:
+  python benchmarks/bench_render.py
+  python benchmarks/bench_render.py --briefs 2000 --items 10,30
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from message_render import MAX_MESSAGE_LENGTH, escape_link, escape_markdown, split_blocks
+
+SPECIAL_CHARS = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
+WORDS = (
+    "엔비디아 애플 테슬라 연준 금리 인플레이션 실적 매출 가이던스 주가 나스닥 S&P500 국채 "
+    "수익률 유가 달러 관세 반도체 AI 클라우드 인수 IPO CPI GDP 3.5% +2.1% (YoY) Q3-2025 "
+    "$NVDA $AAPL 전망치 상향! 하향. 사상_최고 [속보] #실적 ~약 1,200억$"
+).split()
+
+HEADER = "☀️ *아퀼라 미국주식 모닝 브리프*\n_미국 주식장 주요 일간 뉴스_\n\n━━━━━━━━━━━━━━━━━━━━\n\n"
+FOOTER = "━━━━━━━━━━━━━━━━━━━━\n총 10개 주요 뉴스\n\n📧 contact@aqresearch\\.com"
+
+
+def make_news(rng: random.Random) -> dict:
+    return {
+        'title': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 12))),
+        'summary': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(30, 60))),
+        'link': f"https://example.com/news/{rng.randint(1, 10**6)}?id=(a_b)"
+    }
+
+
+def render_legacy(news_list: list) -> list:
+    """기존 방식: 필드마다 replace 18번, 완성된 문자열을 '\\n\\n' 기준으로 분할"""
+    def escape(text: str) -> str:
+        for char in SPECIAL_CHARS:
+            text = text.replace(char, f'\\{char}')
+        return text
+
+    message = HEADER
+    for idx, news in enumerate(news_list, 1):
+        message += f"{idx}\\. *{escape(news['title'])}*\n>{escape(news['summary'])} [원문]({news['link']})\n\n\n"
+    message += FOOTER
+
+    if len(message) <= MAX_MESSAGE_LENGTH:
+        return [message]
+    messages = []
+    current = ''
+    for part in message.split('\n\n'):
+        if len(current) + len(part) + 2 > MAX_MESSAGE_LENGTH:
+            messages.append(current)
+            current = part + '\n\n'
+        else:
+            current += part + '\n\n'
+    if current:
+        messages.append(current)
+    return messages
+
+
+def render_blocks(news_list: list) -> list:
+    """message_render 방식: 뉴스 하나가 블록 하나, 블록 경계에서만 분할"""
+    blocks = [HEADER]
+    for idx, news in enumerate(news_list, 1):
+        blocks.append(
+            f"{idx}\\. *{escape_markdown(news['title'])}*\n"
+            f">{escape_markdown(news['summary'])} [원문]({escape_link(news['link'])})\n\n\n"
+        )
+    blocks.append(FOOTER)
+    return split_blocks(blocks)
+
+
+def measure(render, briefs: list) -> tuple:
+    started = time.perf_counter()
+    message_count = 0
+    for news_list in briefs:
+        message_count += len(render(news_list))
+    elapsed = time.perf_counter() - started
+    return elapsed / len(briefs) * 1e6, message_count / len(briefs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--briefs', type=int, default=1000, help='항목 수별 브리프 개수')
+    parser.add_argument('--items', default='10,20,40', help='브리프당 뉴스 개수 (콤마 구분)')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+
+    print(f"{'뉴스 수':>8} | {'기존(µs/브리프)':>15} | {'신규(µs/브리프)':>15} | {'속도':>6} | {'메시지 수(기존/신규)':>20}")
+    print('-' * 78)
+
+    for item_count in (int(count) for count in args.items.split(',')):
+        briefs = [[make_news(rng) for _ in range(item_count)] for _ in range(args.briefs)]
+        legacy_us, legacy_messages = measure(render_legacy, briefs)
+        new_us, new_messages = measure(render_blocks, briefs)
+        print(f"{item_count:>8} | {legacy_us:>15.1f} | {new_us:>15.1f} | {legacy_us / new_us:>5.1f}x | "
+              f"{legacy_messages:>9.1f} / {new_messages:<9.1f}")
+
+
+if __name__ == "__main__":
+    main()
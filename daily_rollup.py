@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+일별 뉴스 롤업 (주간/월간 분석 입력)
+- 브리프 전송 후 그날 전송된 뉴스를 작은 요약(digest)으로 압축해 저장
+  (종목/주제/키워드 빈도 + 같은 이야기를 묶은 대표 뉴스)
+- 주간/월간 분석은 수백 개의 원본 기록 대신 7개/30개의 digest만 읽음
+- 저장된 건수와 실제 전송 건수가 다른 날(롤업 도입 전 기록, 실패한 갱신)은 조회 시 다시 계산
+- 대표 뉴스는 그날의 모든 이야기를 저장 (개수 제한은 렌더링할 때만 - 월간 맵 단계는 전체 사용)
+"""
+
+import json
+import re
+import sqlite3
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import List, Dict
+
+from minhash_index import estimate_similarity, minhash_signature
+from news_ranker import COMPANY_PATTERN, MACRO_PATTERN, TICKER_PATTERN, title_terms
+from news_similarity import news_text
+from sent_news_store import SentNewsStore
+
+STORY_SIMILARITY = 0.3   # 같은 이야기로 묶을 MinHash 유사도
+MAX_STORIES = 10         # 단일 프롬프트(주간 분석)에 렌더링할 하루 대표 뉴스 수
+DIGEST_VERSION = 2       # digest 형식이 바뀌면 올림 - 이전 형식은 조회 시 다시 계산
+MAX_COUNTS = 15
+
+# 기업명(영문 소문자/한글) → 티커 (같은 종목을 한 줄로 집계)
+COMPANY_TICKERS = {
+    'apple': 'AAPL', '애플': 'AAPL',
+    'nvidia': 'NVDA', '엔비디아': 'NVDA',
+    'microsoft': 'MSFT', '마이크로소프트': 'MSFT',
+    'tesla': 'TSLA', '테슬라': 'TSLA',
+    'amazon': 'AMZN', '아마존': 'AMZN',
+    'meta': 'META', '메타': 'META',
+    'alphabet': 'GOOGL', 'google': 'GOOGL', '알파벳': 'GOOGL', '구글': 'GOOGL',
+    'netflix': 'NFLX', '넷플릭스': 'NFLX',
+    'broadcom': 'AVGO', '브로드컴': 'AVGO',
+    'amd': 'AMD',
+    'intel': 'INTC', '인텔': 'INTC',
+    'berkshire': 'BRK.B',
+    'jpmorgan': 'JPM',
+    'goldman': 'GS',
+    'morgan stanley': 'MS',
+    'exxon': 'XOM',
+    'chevron': 'CVX',
+    'walmart': 'WMT',
+    'boeing': 'BA',
+    'palantir': 'PLTR', '팔란티어': 'PLTR',
+    'tsmc': 'TSM',
+    'openai': 'OpenAI', '오픈ai': 'OpenAI',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    day TEXT PRIMARY KEY,
+    news_count INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def _entity_name(match: str) -> str:
+    """'$NVDA', '(NASDAQ:NVDA)', 'Nvidia', '엔비디아' → 'NVDA' (티커를 모르는 기업은 이름 그대로)"""
+    name = re.sub(r'[$()]|NASDAQ:|NYSE:', '', match)
+    return COMPANY_TICKERS.get(name.lower(), name)
+
+
+def _group_stories(day_news: List[Dict]) -> List[List[Dict]]:
+    """같은 이야기를 다룬 뉴스끼리 묶기 (첫 뉴스의 서명과 비교하는 탐욕적 묶음)"""
+    groups = []
+    for news in day_news:
+        signature = minhash_signature(news_text(news))
+        for group_signature, members in groups:
+            if estimate_similarity(signature, group_signature) >= STORY_SIMILARITY:
+                members.append(news)
+                break
+        else:
+            groups.append((signature, [news]))
+    return [members for _, members in groups]
+
+
+def build_digest(day: str, day_news: List[Dict]) -> Dict:
+    """하루치 전송 기록 → digest"""
+    tickers = Counter()
+    topics = Counter()
+    keywords = Counter()
+    for news in day_news:
+        text = f"{news['title']} {news.get('summary') or ''} {news.get('original_title') or ''}"
+        # 뉴스 하나에서 여러 번 나와도 1회로 셈 (언급된 뉴스 수)
+        tickers.update({_entity_name(m.group(0)) for pattern in (COMPANY_PATTERN, TICKER_PATTERN)
+                        for m in pattern.finditer(text)})
+        topics.update({m.group(0).lower() for m in MACRO_PATTERN.finditer(text)})
+        keywords.update(title_terms(news.get('original_title') or news['title']))
+
+    groups = sorted(_group_stories(day_news), key=len, reverse=True)
+    stories = [
+        {
+            'title': members[0]['title'],
+            'summary': (members[0].get('summary') or '')[:200],
+            'link': members[0].get('link'),
+            'count': len(members)
+        }
+        for members in groups
+    ]
+
+    return {
+        'version': DIGEST_VERSION,
+        'day': day,
+        'news_count': len(day_news),
+        'tickers': tickers.most_common(MAX_COUNTS),
+        'topics': topics.most_common(MAX_COUNTS),
+        'keywords': [(word, count) for word, count in keywords.most_common(MAX_COUNTS) if count > 1],
+        'stories': stories
+    }
+
+
+def render_digest(digest: Dict, max_stories: int = None) -> str:
+    """digest → 프롬프트용 텍스트
+
+    Args:
+        max_stories: 대표 뉴스 수 제한 (관련 보도가 많은 순, None이면 전체)
+    """
+    lines = [f"### {digest['day']} (뉴스 {digest['news_count']}개)"]
+    for label, key in (('종목', 'tickers'), ('주제', 'topics'), ('키워드', 'keywords')):
+        if digest.get(key):
+            lines.append(f"{label}: " + ', '.join(f"{name} {count}" for name, count in digest[key]))
+    stories = digest['stories'][:max_stories] if max_stories else digest['stories']
+    for story in stories:
+        repeat = f" [관련 {story['count']}건]" if story['count'] > 1 else ""
+        lines.append(f"- {story['title']}{repeat}\n  {story['summary']}")
+    return "\n".join(lines)
+
+
+class DailyRollupStore:
+    def __init__(self, sent_news_store: SentNewsStore):
+        self.sent_news_store = sent_news_store
+
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.sent_news_store.db_file, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA busy_timeout=30000')
+        return conn
+
+    def update(self, day: date) -> Dict:
+        """그날 전송 기록으로 digest를 다시 계산해 저장 (같은 날 여러 번 호출해도 안전)"""
+        day_str = day.strftime('%Y-%m-%d')
+        next_day = (day + timedelta(days=1)).strftime('%Y-%m-%d')
+        # sent_at은 'YYYY-MM-DDTHH:MM:SS...' 이므로 'YYYY-MM-DD' < sent_at <= 다음날 'YYYY-MM-DD' 가 그날 전체
+        day_news = self.sent_news_store.between(day_str, next_day)
+        digest = build_digest(day_str, day_news)
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO daily_rollups (day, news_count, digest, updated_at) VALUES (?, ?, ?, ?)',
+                    (day_str, len(day_news), json.dumps(digest, ensure_ascii=False), datetime.now().isoformat())
+                )
+        finally:
+            conn.close()
+        return digest
+
+    def digests(self, start_day: date, end_day: date) -> List[Dict]:
+        """start_day ~ end_day (양끝 포함) digest 목록 (오래된 순, 뉴스 없는 날 제외)"""
+        start_str = start_day.strftime('%Y-%m-%d')
+        end_str = end_day.strftime('%Y-%m-%d')
+
+        conn = self._connect()
+        try:
+            stored = {
+                day: (news_count, digest)
+                for day, news_count, digest in conn.execute(
+                    'SELECT day, news_count, digest FROM daily_rollups WHERE day BETWEEN ? AND ?',
+                    (start_str, end_str)
+                )
+            }
+        finally:
+            conn.close()
+
+        result = []
+        rebuilt = 0
+        for day_str, count in sorted(self.sent_news_store.daily_counts(start_str, end_str).items()):
+            digest = json.loads(stored[day_str][1]) if day_str in stored and stored[day_str][0] == count else None
+            if digest and digest.get('version') == DIGEST_VERSION:
+                result.append(digest)
+            else:
+                result.append(self.update(datetime.fromisoformat(day_str).date()))
+                rebuilt += 1
+
+        if rebuilt:
+            print(f"🧮 일별 롤업 {rebuilt}일치 새로 계산")
+        return result
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+RSS 피드 조건부 요청(Conditional GET) 캐시
+피드별 ETag / Last-Modified를 /data 에 저장하고
+다음 요청 시 If-None-Match / If-Modified-Since 헤더로 재사용
+(304 = 새 항목 없음 - 이전 항목은 뉴스 저장소에 있으므로 본문은 저장하지 않음)
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict
+
+
+class FeedCache:
+    def __init__(self, cache_dir: str = '/data/feed_cache'):
+        self.cache_dir = cache_dir
+        self.index_file = os.path.join(cache_dir, 'index.json')
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # 여러 수집 스레드가 같은 임시 파일에 동시에 쓰지 않도록
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._remove_legacy_bodies()
+        self._index = self._load_index()
+
+    def _remove_legacy_bodies(self):
+        """이전 버전이 저장한 피드 본문(<sha1>.xml) 정리 - 더 이상 읽지 않으므로 디스크만 차지"""
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.xml', '.xml.tmp')):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                    removed += 1
+                except OSError as e:
+                    print(f"⚠️ 이전 피드 본문 삭제 실패 ({name}): {e}")
+        if removed:
+            print(f"🧹 이전 피드 본문 {removed}개 삭제")
+
+    def _load_index(self) -> Dict:
+        """캐시 인덱스 불러오기"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"⚠️ 피드 캐시 로드 실패: {e}")
+        return {}
+
+    def conditional_headers(self, feed_url: str) -> Dict[str, str]:
+        """이전 응답의 검증자로 조건부 요청 헤더 생성"""
+        with self._lock:
+            entry = self._index.get(feed_url)
+
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, feed_url: str, etag: str, last_modified: str):
+        """200 응답의 검증자 저장"""
+        if not etag and not last_modified:
+            # 검증자가 없는 피드는 조건부 요청이 불가능하므로 저장하지 않음
+            return
+
+        with self._lock:
+            self._index[feed_url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'fetched_at': datetime.now().isoformat()
+            }
+
+    def save(self):
+        """캐시 인덱스 저장 (원자적 교체)"""
+        try:
+            with self._save_lock:
+                with self._lock:
+                    data = json.dumps(self._index, ensure_ascii=False, indent=2)
+                tmp_path = self.index_file + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(tmp_path, self.index_file)
+        except Exception as e:
+            print(f"⚠️ 피드 캐시 저장 실패: {e}")
@@ -2,6 +2,7 @@
 """
 텔레그램 이미지 File ID 확인 스크립트
 봇에게 보낸 이미지의 file_id를 가져옵니다
+(HEADER_IMAGE_URL에 외부 이미지 URL을 넣어도 봇이 첫 전송 때 file_id를 자동으로 저장해 재사용)
 """
 
 import requests
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+헤더 이미지 file_id 캐시
+HEADER_IMAGE_URL이 http URL이면 첫 채팅방에 한 번만 URL로 보내고,
+응답의 file_id를 나머지 채팅방과 이후 실행에서 재사용 (텔레그램이 이미지를 매번 다시 받지 않음)
+- 키: 이미지 URL의 SHA-256
+- 원본 이미지의 ETag / Last-Modified / Content-Length가 바뀌면 캐시 무효화
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import http_client
+
+
+def photo_file_id(delivery_result: Dict) -> Optional[str]:
+    """전송 결과(TelegramDelivery)의 sendPhoto 응답에서 가장 큰 사진의 file_id"""
+    for response in (delivery_result or {}).get('responses', []):
+        photos = ((response or {}).get('result') or {}).get('photo')
+        if photos:
+            return photos[-1]['file_id']
+    return None
+
+
+class HeaderImageCache:
+    def __init__(self, cache_file: str = '/data/header_image_cache.json'):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+
+        cache_dir = os.path.dirname(cache_file)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _key(image_url: str) -> str:
+        return hashlib.sha256(image_url.encode('utf-8')).hexdigest()
+
+    def _load(self) -> Dict:
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"⚠️ 헤더 이미지 캐시 로드 실패: {e}")
+        return {}
+
+    def _save(self, cache: Dict):
+        try:
+            tmp_file = self.cache_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            print(f"⚠️ 헤더 이미지 캐시 저장 실패: {e}")
+
+    @staticmethod
+    def source_version(image_url: str) -> Optional[str]:
+        """원본 이미지 버전 (HEAD 응답의 ETag → Last-Modified → Content-Length, 확인 실패 시 None)"""
+        try:
+            response = http_client.request('HEAD', image_url, timeout=(5, 10), allow_redirects=True, max_retries=1)
+            if response.status_code != 200:
+                return None
+            for header in ('ETag', 'Last-Modified', 'Content-Length'):
+                if response.headers.get(header):
+                    return f"{header}:{response.headers[header]}"
+        except Exception as e:
+            print(f"⚠️ 헤더 이미지 확인 실패: {e}")
+        return None
+
+    def lookup(self, image_url: str) -> Tuple[Optional[str], Optional[str]]:
+        """캐시된 file_id (원본이 바뀌었으면 None)
+
+        Returns:
+            (file_id 또는 None, 현재 원본 버전)
+        """
+        version = self.source_version(image_url)
+        with self._lock:
+            entry = self._load().get(self._key(image_url))
+
+        if not entry:
+            return None, version
+        # 원본 확인에 실패하면 캐시를 그대로 사용 (다음 실행에서 다시 확인)
+        if version and entry.get('version') and version != entry['version']:
+            print(f"🔄 헤더 이미지 원본 변경 감지 - 다시 업로드")
+            return None, version
+        return entry['file_id'], version
+
+    def store(self, image_url: str, file_id: str, version: Optional[str]):
+        with self._lock:
+            cache = self._load()
+            cache[self._key(image_url)] = {
+                'file_id': file_id,
+                'version': version,
+                'resolved_at': datetime.now().isoformat()
+            }
+            self._save(cache)
+
+    def invalidate(self, image_url: str):
+        with self._lock:
+            cache = self._load()
+            if cache.pop(self._key(image_url), None) is not None:
+                self._save(cache)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+공용 HTTP 클라이언트 (OpenAI / Telegram / RSS 피드)
+- 프로세스 전체에서 하나의 requests.Session 공유 → keep-alive 연결 재사용
+- 429/5xx 응답은 지터 지수 백오프로 재시도 (Retry-After, Telegram retry_after 준수)
+- OpenAI x-ratelimit-* 헤더로 한도 소진 시 리셋까지 대기
+- 호스트별 적응형 동시성 제한 (성공 시 조금씩 늘리고 제한/오류 시 절반으로)
+"""
+
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 1.0   # 초
+BACKOFF_CAP = 30.0   # 초
+MAX_RETRY_AFTER = 120.0  # 서버가 알려준 대기 시간 상한 (잘못된 헤더로 워커가 몇 시간씩 멈추지 않도록)
+
+_session = None
+_session_lock = threading.Lock()
+_hosts: Dict[str, 'HostState'] = {}
+_hosts_lock = threading.Lock()
+
+
+class HostState:
+    """호스트별 동시성 제한 + 레이트 리밋 대기 상태"""
+
+    def __init__(self, initial_limit: int = 4, max_limit: int = 16):
+        self.limit = float(initial_limit)
+        self.max_limit = max_limit
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            wait = self.blocked_until - time.monotonic()
+        # 레이트 리밋 리셋 대기는 잠금 밖에서
+        if wait > 0:
+            time.sleep(wait)
+
+    def release(self, throttled: bool):
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                # 곱셈 감소
+                self.limit = max(1.0, self.limit / 2)
+            else:
+                # 덧셈 증가 (한 번에 1씩이 아니라 limit 회 성공마다 1)
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def block_for(self, seconds: float):
+        with self._cond:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+def get_session() -> requests.Session:
+    """공유 세션 (연결 풀 재사용)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=20, pool_maxsize=32)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def _host_state(url: str) -> HostState:
+    host = urlsplit(url).netloc
+    with _hosts_lock:
+        if host not in _hosts:
+            _hosts[host] = HostState()
+        return _hosts[host]
+
+
+def _parse_duration(value: str) -> float:
+    """OpenAI 리셋 시간 형식 ('1s', '6m0s', '20ms', '1h2m') → 초"""
+    total = 0.0
+    for amount, unit in re.findall(r'([\d.]+)(ms|h|m|s)', value or ''):
+        amount = float(amount)
+        total += {'ms': amount / 1000, 's': amount, 'm': amount * 60, 'h': amount * 3600}[unit]
+    return total
+
+
+def retry_after(response: requests.Response) -> float:
+    """서버가 알려준 재시도 대기 시간 (없으면 None)"""
+    header = response.headers.get('Retry-After')
+    if header:
+        try:
+            return max(0.0, float(header))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(header).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    # Telegram: {"ok": false, "parameters": {"retry_after": 5}}
+    try:
+        retry_after = response.json().get('parameters', {}).get('retry_after')
+        if retry_after is not None:
+            return float(retry_after)
+    except (ValueError, AttributeError):
+        pass
+
+    return _ratelimit_reset(response)
+
+
+def _ratelimit_reset(response: requests.Response) -> float:
+    """OpenAI x-ratelimit-* 헤더 기준 한도 소진 시 리셋까지 남은 시간 (없으면 None)"""
+    for kind in ('requests', 'tokens'):
+        if response.headers.get(f'x-ratelimit-remaining-{kind}') == '0':
+            reset = _parse_duration(response.headers.get(f'x-ratelimit-reset-{kind}'))
+            if reset:
+                return reset
+    return None
+
+
+def _failed_before_send(error: Exception) -> bool:
+    """요청을 보내기 전(연결 단계)에 실패했는지 - 서버가 요청을 받았을 가능성이 없음"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    # ConnectionError(MaxRetryError(reason=NewConnectionError)) - DNS 실패, 연결 거부 등
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def backoff(attempt: int) -> float:
+    """지터 지수 백오프 (full jitter)"""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+def request(method: str, url: str, max_retries: int = 3, idempotent: bool = None, host_throttle: bool = True,
+            **kwargs) -> requests.Response:
+    """재시도/레이트 리밋을 처리하는 HTTP 요청
+
+    Args:
+        max_retries: 429/5xx/연결 오류 시 재시도 횟수
+        idempotent: 요청 전송 후 실패(읽기 타임아웃, 연결 끊김)에도 재시도할지 (기본: GET/HEAD만)
+            - 텔레그램 전송/OpenAI 호출처럼 중복되면 안 되는 요청은 연결 단계 실패만 재시도
+        host_throttle: 429를 호스트 전체 제한으로 보고 호스트 동시성을 줄이고 대기할지
+            - 텔레그램처럼 429가 대상(채팅방)별 제한이고 호출자가 직접 조절하면 False
+
+    Returns:
+        마지막 응답 (재시도 후에도 실패한 응답 포함)
+    """
+    if idempotent is None:
+        idempotent = method.upper() in ('GET', 'HEAD')
+
+    session = get_session()
+    state = _host_state(url)
+
+    attempt = 0
+    while True:
+        state.acquire()
+        throttled = False
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            throttled = True
+            # 요청이 서버에 도달했을 수 있는 실패(읽기 타임아웃, 전송 후 연결 끊김)는 멱등 요청만 재시도
+            retryable = idempotent or _failed_before_send(e)
+            if attempt >= max_retries or not retryable:
+                raise
+            delay = backoff(attempt)
+            print(f"🔁 {urlsplit(url).netloc} 연결 오류 - {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries}): {e}")
+        else:
+            if response.status_code in RETRY_STATUS_CODES:
+                throttled = host_throttle or response.status_code != 429
+                if attempt >= max_retries:
+                    return response
+                wait = retry_after(response)
+                delay = min(wait, MAX_RETRY_AFTER) if wait is not None else backoff(attempt)
+                # stream=True 응답은 닫아야 연결이 풀로 돌아감
+                response.close()
+                if response.status_code == 429 and host_throttle:
+                    state.block_for(delay)
+                print(f"🔁 {urlsplit(url).netloc} {response.status_code} - {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries})")
+            else:
+                reset = _ratelimit_reset(response)
+                if reset:
+                    # 성공했지만 한도 소진 - 다음 요청은 리셋 후에
+                    state.block_for(min(reset, MAX_RETRY_AFTER))
+                return response
+        finally:
+            state.release(throttled)
+
+        time.sleep(delay)
+        attempt += 1
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request('GET', url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request('POST', url, **kwargs)
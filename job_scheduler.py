@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+이벤트 기반 일간 작업 스케줄러 (schedule 라이브러리 + 1분 폴링 대체)
+- 다음 실행 시각을 계산해 그 시각까지 정확히 대기 → 시작 지연이 밀리초 수준
+- 작업별 마지막 성공 실행(예정 시각)을 /data 에 저장
+- 시작 시 놓친 실행이 유예 시간(grace) 안이면 따라잡아 실행 → 재시작해도 브리프가 사라지지 않음
+- 준비 시간(lead)이 있는 작업은 예정 시각보다 먼저 시작하고, 예정 시각(슬롯)을 인자로 받음
+- 작업은 워커 풀에서 실행 (대기 루프는 막히지 않음), 작업별 제한 시간 + 같은 작업 중복 실행 방지
+- 시각은 서버 로컬 시간 기준 (KST 고정)
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+MAX_SLEEP_SECONDS = 3600  # 시계 변경(NTP 보정 등)에 대비해 최대 1시간마다 다시 계산
+
+
+class DailyJob:
+    def __init__(self, name: str, at: str, func: Callable[[datetime], object], timeout_minutes: int = 90,
+                 lead_minutes: int = 0):
+        """
+        Args:
+            name: 작업 이름 (마지막 실행 기록 키)
+            at: 'HH:MM' 예정 시각 (슬롯)
+            func: func(scheduled_at) - 예정 시각을 받아 실행 (따라잡기 실행에서도 원래 시각 기준)
+                실패하면 예외를 내거나 False 반환 - 그 슬롯은 완료로 기록하지 않음 (재시작 시 따라잡기 대상)
+            timeout_minutes: 제한 시간 - 넘으면 실패로 기록 (스레드는 강제 종료할 수 없으므로 끝날 때까지 중복 실행은 막음)
+            lead_minutes: 예정 시각보다 먼저 시작할 준비 시간
+        """
+        self.name = name
+        self.at = datetime.strptime(at, '%H:%M').time()
+        self.func = func
+        self.timeout = (timeout_minutes + lead_minutes) * 60
+        self.lead = timedelta(minutes=lead_minutes)
+        self.lock = threading.Lock()  # 같은 작업이 겹쳐 실행되지 않도록
+
+    def next_slot(self, after: datetime) -> datetime:
+        """시작 시각(슬롯 - 준비 시간)이 after 이후인 첫 슬롯"""
+        slot = datetime.combine((after + self.lead).date(), self.at)
+        if slot - self.lead <= after:
+            slot += timedelta(days=1)
+        return slot
+
+    def last_slot(self, now: datetime) -> datetime:
+        """시작 시각이 now 이전(포함)인 마지막 슬롯 (준비 중이면 아직 오지 않은 슬롯)"""
+        slot = datetime.combine((now + self.lead).date(), self.at)
+        if slot - self.lead > now:
+            slot -= timedelta(days=1)
+        return slot
+
+
+class JobScheduler:
+    def __init__(self, state_file: str = '/data/scheduler_state.json', grace_minutes: int = 180,
+                 max_workers: int = 4, timeout_minutes: int = 90):
+        self.state_file = state_file
+        self.grace = timedelta(minutes=grace_minutes)
+        self.timeout_minutes = timeout_minutes
+        self.jobs: List[DailyJob] = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._state_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+
+        state_dir = os.path.dirname(state_file)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            os.getenv('SCHEDULER_STATE_FILE', '/data/scheduler_state.json'),
+            grace_minutes=int(os.getenv('SCHEDULER_CATCHUP_GRACE_MINUTES', '180')),
+            max_workers=int(os.getenv('SCHEDULER_MAX_WORKERS', '4')),
+            timeout_minutes=int(os.getenv('SCHEDULER_JOB_TIMEOUT_MINUTES', '90'))
+        )
+
+    def every_day(self, name: str, at: str, func: Callable[[datetime], object],
+                  timeout_minutes: int = None, lead_minutes: int = 0) -> DailyJob:
+        job = DailyJob(name, at, func, timeout_minutes or self.timeout_minutes, lead_minutes)
+        self.jobs.append(job)
+        self._wakeup.set()
+        return job
+
+    def _load(self) -> Dict:
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"⚠️ 스케줄러 상태 로드 실패: {e}")
+        return {}
+
+    def _save(self, state: Dict):
+        try:
+            tmp_file = self.state_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            print(f"⚠️ 스케줄러 상태 저장 실패: {e}")
+
+    def last_success(self, job: DailyJob) -> Optional[datetime]:
+        """작업의 마지막 성공 실행 예정 시각"""
+        entry = self._load().get(job.name)
+        return datetime.fromisoformat(entry['scheduled_at']) if entry else None
+
+    def _mark_success(self, job: DailyJob, scheduled_at: datetime, started_at: datetime):
+        with self._state_lock:
+            state = self._load()
+            state[job.name] = {
+                'scheduled_at': scheduled_at.isoformat(),
+                'started_at': started_at.isoformat(),
+                'finished_at': datetime.now().isoformat()
+            }
+            self._save(state)
+
+    def _run(self, job: DailyJob, scheduled_at: datetime, catch_up: bool = False):
+        """작업을 워커 풀에 넣고 바로 반환 (감시 스레드가 제한 시간/결과 처리)"""
+        # 이전 실행이 아직 끝나지 않았으면 건너뜀 (중복 실행 방지)
+        if not job.lock.acquire(blocking=False):
+            print(f"⏭️ {job.name}: 이전 실행이 아직 진행 중 - {scheduled_at.strftime('%Y-%m-%d %H:%M')} 실행 건너뜀")
+            return
+
+        started_at = datetime.now()
+        lateness_ms = (started_at - (scheduled_at - job.lead)).total_seconds() * 1000
+        label = "따라잡기 실행" if catch_up else "실행"
+        lead = f", 준비 시간 {job.lead}" if job.lead else ""
+        print(f"⏰ {job.name} {label} (예정 {scheduled_at.strftime('%Y-%m-%d %H:%M')}{lead}, 시작 지연 {lateness_ms:,.0f}ms)")
+        try:
+            future = self._executor.submit(job.func, scheduled_at)
+        except RuntimeError as e:  # 종료 중
+            job.lock.release()
+            print(f"❌ {job.name} 실행 실패: {e}")
+            return
+        # 실제로 끝났을 때 잠금 해제 (제한 시간을 넘겨도 끝날 때까지는 다시 실행하지 않음)
+        future.add_done_callback(lambda _: job.lock.release())
+        threading.Thread(
+            target=self._supervise, args=(job, future, scheduled_at, started_at),
+            name=f"{job.name}-watch", daemon=True
+        ).start()
+
+    def _supervise(self, job: DailyJob, future, scheduled_at: datetime, started_at: datetime):
+        try:
+            result = future.result(timeout=job.timeout)
+        except FutureTimeoutError:
+            print(f"⏱️ {job.name}: 제한 시간 {job.timeout // 60}분 초과 - 실패로 기록 (작업이 끝날 때까지 중복 실행 방지)")
+            return
+        except Exception as e:
+            print(f"❌ {job.name} 실행 오류: {e} - 완료로 기록하지 않음")
+            return
+        if result is False:
+            print(f"❌ {job.name} 실패 - 완료로 기록하지 않음")
+            return
+        elapsed = (datetime.now() - started_at).total_seconds()
+        print(f"✅ {job.name} 완료 ({elapsed:,.1f}초)")
+        self._mark_success(job, scheduled_at, started_at)
+
+    def catch_up(self, now: datetime = None):
+        """놓친 실행 중 유예 시간 안인 것만 실행 (가장 최근 예정 시각 1회)"""
+        now = now or datetime.now()
+        for job in self.jobs:
+            slot = job.last_slot(now)
+            last = self.last_success(job)
+            if last and last >= slot:
+                continue
+            if now - slot > self.grace:
+                print(f"⏭️ {job.name}: {slot.strftime('%Y-%m-%d %H:%M')} 실행을 놓쳤지만 유예 시간({self.grace}) 초과 - 건너뜀")
+                continue
+            self._run(job, slot, catch_up=True)
+
+    def stop(self, wait: bool = False):
+        self._stopped = True
+        self._wakeup.set()
+        self._executor.shutdown(wait=wait)
+
+    def run_forever(self, catch_up: bool = True):
+        """(놓친 실행 따라잡기 후) 다음 실행 시각까지 대기 → 실행 반복"""
+        # 시작 시각 기준으로 계산 (따라잡기 실행은 워커 풀에서 진행되고 대기 루프는 바로 시작)
+        after = datetime.now()
+        self._wakeup.clear()
+        if catch_up:
+            self.catch_up(after)
+        while not self._stopped:
+            if not self.jobs:
+                self._wakeup.wait(MAX_SLEEP_SECONDS)
+                self._wakeup.clear()
+                continue
+
+            # 실행이 길어져 다음 예정 시각을 지났으면 바로 실행 (건너뛰지 않음)
+            fire = min(job.next_slot(after) - job.lead for job in self.jobs)
+            due_jobs = [job for job in self.jobs if job.next_slot(after) - job.lead == fire]
+
+            # 예정 시각까지 대기 (작업 추가/종료 시 깨어나 다시 계산)
+            while not self._stopped:
+                remaining = (fire - datetime.now()).total_seconds()
+                if remaining <= 0:
+                    break
+                if self._wakeup.wait(min(remaining, MAX_SLEEP_SECONDS)):
+                    self._wakeup.clear()
+                    break
+            if self._stopped:
+                break
+            if datetime.now() < fire:
+                continue  # 작업 목록이 바뀜 - 다시 계산
+
+            for job in due_jobs:
+                self._run(job, fire + job.lead)
+            after = fire
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+GPT 응답 캐시 (콘텐츠 주소 기반, 디스크 저장)
+- 키: 모델 + 파라미터 + 프롬프트 전체의 SHA-256
+- TTL 만료 + 전체 크기 초과 시 오래 안 쓴 항목부터 삭제 (LRU)
+- 재시작/재시도/수동 재실행으로 같은 프롬프트를 다시 만들면 API 호출 없이 재사용
+- LLM_CACHE_BYPASS=1 또는 bypass=True 로 캐시 우회
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict
+
+import http_client
+
+OPENAI_CHAT_URL = 'https://api.openai.com/v1/chat/completions'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used_at);
+CREATE TABLE IF NOT EXISTS llm_cache_stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class CachedResponse:
+    """캐시 적중 시 requests.Response 대신 돌려주는 응답 (status_code / json() / text)"""
+
+    status_code = 200
+
+    def __init__(self, body: str):
+        self.text = body
+
+    def json(self) -> Dict:
+        return json.loads(self.text)
+
+
+class LLMCache:
+    def __init__(self, db_file: str = '/data/llm_cache.db', ttl_hours: float = 6,
+                 max_size_mb: float = 50, bypass: bool = False):
+        self.db_file = db_file
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA busy_timeout=30000')
+        return conn
+
+    @staticmethod
+    def make_key(payload: Dict) -> str:
+        """요청 본문(모델, 파라미터, 메시지) 전체의 해시"""
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _count(self, conn: sqlite3.Connection, name: str):
+        """누적 적중/미스 횟수 (프로세스 간 합산)"""
+        conn.execute(
+            'INSERT INTO llm_cache_stats (name, value) VALUES (?, 1) '
+            'ON CONFLICT(name) DO UPDATE SET value = value + 1',
+            (name,)
+        )
+
+    def get(self, key: str) -> str:
+        """유효한 캐시 응답 (없거나 만료되면 None)"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                row = conn.execute(
+                    'SELECT response FROM llm_cache WHERE key = ? AND created_at > ?',
+                    (key, now - self.ttl_seconds)
+                ).fetchone()
+                if row:
+                    conn.execute('UPDATE llm_cache SET last_used_at = ? WHERE key = ?', (now, key))
+                self._count(conn, 'hits' if row else 'misses')
+        finally:
+            conn.close()
+
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row else None
+
+    def put(self, key: str, model: str, response_text: str):
+        """응답 저장 후 만료/용량 초과 항목 정리"""
+        now = time.time()
+        size = len(response_text.encode('utf-8'))
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO llm_cache (key, model, response, size, created_at, last_used_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, model, response_text, size, now, now)
+                )
+                conn.execute('DELETE FROM llm_cache WHERE created_at <= ?', (now - self.ttl_seconds,))
+
+                # 전체 크기가 한도를 넘으면 오래 안 쓴 항목부터 삭제
+                total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM llm_cache').fetchone()[0]
+                if total > self.max_size_bytes:
+                    excess = total - self.max_size_bytes
+                    freed = 0
+                    stale_keys = []
+                    for stale_key, stale_size in conn.execute(
+                        'SELECT key, size FROM llm_cache ORDER BY last_used_at'
+                    ):
+                        if freed >= excess:
+                            break
+                        stale_keys.append((stale_key,))
+                        freed += stale_size
+                    conn.executemany('DELETE FROM llm_cache WHERE key = ?', stale_keys)
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """이 프로세스 적중/미스 + 누적 통계"""
+        conn = self._connect()
+        try:
+            totals = dict(conn.execute('SELECT name, value FROM llm_cache_stats').fetchall())
+            entries, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache').fetchone()
+        finally:
+            conn.close()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'total_hits': totals.get('hits', 0),
+            'total_misses': totals.get('misses', 0),
+            'entries': entries,
+            'size_bytes': size
+        }
+
+    def chat_completion(self, api_key: str, payload: Dict, timeout: float, bypass: bool = False):
+        """chat/completions 호출 (캐시 우선)
+
+        Returns:
+            캐시 적중 시 CachedResponse, 아니면 requests.Response
+        """
+        bypass = bypass or self.bypass
+        key = self.make_key(payload)
+
+        if not bypass:
+            try:
+                cached = self.get(key)
+            except Exception as e:
+                print(f"⚠️ GPT 응답 캐시 조회 실패: {e}")
+                cached = None
+            if cached is not None:
+                print(f"💾 GPT 응답 캐시 적중 ({payload.get('model')}) - 적중 {self.hits} / 미스 {self.misses}")
+                return CachedResponse(cached)
+
+        response = http_client.post(
+            OPENAI_CHAT_URL,
+            headers={
+                'Authorization': f'Bearer {api_key}',
+                'Content-Type': 'application/json'
+            },
+            json=payload,
+            timeout=timeout
+        )
+
+        if response.status_code == 200:
+            try:
+                # 잘린 응답(finish_reason=length)은 재사용하면 같은 실패가 반복되므로 저장하지 않음
+                if response.json()['choices'][0].get('finish_reason') == 'stop':
+                    self.put(key, payload.get('model'), response.text)
+            except Exception as e:
+                print(f"⚠️ GPT 응답 캐시 저장 실패: {e}")
+        return response
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_cache() -> LLMCache:
+    """환경 변수 설정을 따르는 공용 캐시"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache(
+                db_file=os.getenv('LLM_CACHE_FILE', '/data/llm_cache.db'),
+                ttl_hours=float(os.getenv('LLM_CACHE_TTL_HOURS', '6')),
+                max_size_mb=float(os.getenv('LLM_CACHE_MAX_MB', '50')),
+                bypass=os.getenv('LLM_CACHE_BYPASS', '').lower() in ('1', 'true', 'yes')
+            )
+        return _default_cache
+
+
+def chat_completion(api_key: str, payload: Dict, timeout: float, bypass: bool = False):
+    """공용 캐시를 거치는 chat/completions 호출"""
+    return get_cache().chat_completion(api_key, payload, timeout, bypass=bypass)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+텔레그램 MarkdownV2 메시지 렌더링 (일간/주간/월간 공용)
+- 특수문자 이스케이프를 한 곳에서 처리 (일간/주간/월간에 복사돼 있던 함수 통합)
+- 메시지는 블록(헤더, 뉴스 항목, 푸터) 목록으로 만들고
+  4000자 분할은 블록 경계에서만 → 뉴스 항목이나 굵게/링크 서식이 중간에 잘리지 않음
+- 분할은 브리프당 한 번 (결과는 아웃박스에 저장되어 모든 채팅방/재시도에 재사용)
+"""
+
+from typing import List
+
+MAX_MESSAGE_LENGTH = 4000  # 텔레그램 4096자 제한에 여유
+
+# MarkdownV2에서 이스케이프해야 하는 문자 (역슬래시가 먼저 - 뒤에서 붙인 역슬래시를 다시 이스케이프하지 않도록)
+# (CPython에서는 문자별 str.replace가 str.translate/re.sub보다 빠름)
+_SPECIAL_CHARS = '\\_*[]()~`>#+-=|{}.!'
+
+
+def escape_markdown(text: str) -> str:
+    """MarkdownV2 특수문자 이스케이프"""
+    text = str(text)
+    for char in _SPECIAL_CHARS:
+        if char in text:
+            text = text.replace(char, '\\' + char)
+    return text
+
+
+def escape_link(url: str) -> str:
+    """MarkdownV2 인라인 링크 URL 이스케이프"""
+    # 링크 URL 안에서는 '\' 와 ')' 만 이스케이프
+    return str(url or '').replace('\\', '\\\\').replace(')', '\\)')
+
+
+def _split_oversized(block: str, max_length: int) -> List[str]:
+    """한 블록이 제한보다 길면 줄 경계에서 나눔 (서식은 한 줄 안에서만 쓰므로 안전)"""
+    chunks = []
+    current = ''
+    for line in block.splitlines(keepends=True):
+        while len(line) > max_length:
+            # 줄 하나가 제한보다 길면 강제로 자르되, 이스케이프 역슬래시 뒤에서는 자르지 않음
+            cut = max_length
+            while cut > 0 and line[cut - 1] == '\\':
+                cut -= 1
+            if current:
+                chunks.append(current)
+                current = ''
+            chunks.append(line[:cut])
+            line = line[cut:]
+        if current and len(current) + len(line) > max_length:
+            chunks.append(current)
+            current = ''
+        current += line
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_blocks(blocks: List[str], max_length: int = MAX_MESSAGE_LENGTH,
+                 header: str = '', footer: str = '') -> List[str]:
+    """블록 목록을 max_length 이하 메시지로 묶음 (블록 경계에서만 분할)
+
+    Args:
+        header / footer: 분할된 모든 메시지에 반복해서 붙일 머리말/꼬리말
+    """
+    budget = max_length - len(header) - len(footer)
+    pieces = []
+    for block in blocks:
+        if len(block) > budget:
+            pieces.extend(_split_oversized(block, budget))
+        else:
+            pieces.append(block)
+
+    messages = []
+    current = ''
+    for piece in pieces:
+        if current and len(current) + len(piece) > budget:
+            messages.append(header + current + footer)
+            current = ''
+        current += piece
+    if current or not messages:
+        messages.append(header + current + footer)
+    return messages
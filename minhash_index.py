@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+전송 뉴스 MinHash/LSH 유사도 인덱스
+- 제목+요약의 단어 shingle로 MinHash 서명 생성
+- 서명을 밴드로 나눠 LSH 버킷에 저장 (sent_news_history.db 내부 테이블)
+- 보관 기간 전체에서 "비슷한 뉴스를 보낸 적 있는가?"를 인덱스 조회로 확인
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import zlib
+from array import array
+from typing import List, Dict, Tuple
+
+from news_similarity import news_text, normalize_text
+
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // NUM_BANDS  # 밴드당 4행 → 유사도 약 0.5부터 후보
+
+_EMPTY_HASH = (1 << 32) - 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS news_signatures (
+    news_id INTEGER PRIMARY KEY REFERENCES sent_news (id) ON DELETE CASCADE,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    news_id INTEGER NOT NULL REFERENCES sent_news (id) ON DELETE CASCADE,
+    PRIMARY KEY (band, bucket, news_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_lsh_buckets_news_id ON lsh_buckets (news_id);
+"""
+
+
+def shingles(text: str) -> set:
+    """단어 단위 shingle (단어 + 연속 2단어) 집합"""
+    words = re.findall(r'\w+', normalize_text(text))
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def minhash_signature(text: str) -> List[int]:
+    """MinHash 서명 (NUM_PERMUTATIONS개의 최소 해시)
+    
+    shingle마다 shake_128로 NUM_PERMUTATIONS개의 32비트 해시를 한 번에 만들고
+    위치별 최솟값을 취함 (파이썬 루프 대신 C 구현 min/zip 사용)
+    """
+    grams = shingles(text)
+    if not grams:
+        return [_EMPTY_HASH] * NUM_PERMUTATIONS
+    rows = [
+        array('I', hashlib.shake_128(gram.encode('utf-8')).digest(4 * NUM_PERMUTATIONS))
+        for gram in grams
+    ]
+    return list(map(min, zip(*rows)))
+
+
+def band_buckets(signature: List[int]) -> List[Tuple[int, int]]:
+    """서명 → (밴드 번호, 버킷 해시) 목록"""
+    return [
+        (band, zlib.crc32(array('I', signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]).tobytes()))
+        for band in range(NUM_BANDS)
+    ]
+
+
+def estimate_similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """두 서명의 일치 비율 = Jaccard 유사도 추정치"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERMUTATIONS
+
+
+class MinHashLSHIndex:
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+
+        # 조회 지연을 줄이기 위해 연결을 유지 (스레드 간 접근은 잠금으로 직렬화)
+        self._conn = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA busy_timeout=30000')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._conn.executescript(SCHEMA)
+
+    def index_pending(self) -> int:
+        """아직 인덱싱되지 않은 전송 기록을 인덱스에 추가 (증분)"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT id, title, summary, original_title, original_summary FROM sent_news '
+                'WHERE id > (SELECT COALESCE(MAX(news_id), 0) FROM news_signatures) ORDER BY id'
+            ).fetchall()
+            if not rows:
+                return 0
+
+            signature_rows = []
+            bucket_rows = []
+            for news_id, title, summary, original_title, original_summary in rows:
+                signature = minhash_signature(news_text({
+                    'title': title,
+                    'summary': summary or '',
+                    'original_title': original_title,
+                    'original_summary': original_summary
+                }))
+                signature_rows.append((news_id, array('I', signature).tobytes()))
+                bucket_rows.extend((band, bucket, news_id) for band, bucket in band_buckets(signature))
+
+            # 다른 프로세스가 같은 행을 먼저 인덱싱했어도 안전하도록 OR IGNORE
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO news_signatures (news_id, signature) VALUES (?, ?)',
+                    signature_rows
+                )
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO lsh_buckets (band, bucket, news_id) VALUES (?, ?, ?)',
+                    bucket_rows
+                )
+        return len(rows)
+
+    def query_signature(self, signature: List[int], threshold: float = 0.3, limit: int = 5) -> List[Tuple[int, float]]:
+        """서명과 비슷한 과거 뉴스 (news_id, 추정 유사도) - 유사도 높은 순"""
+        buckets = band_buckets(signature)
+        # 밴드별 (band, bucket) 조건을 OR로 묶어 기본키 인덱스 탐색만 수행
+        conditions = ' OR '.join(['(b.band = ? AND b.bucket = ?)'] * len(buckets))
+        params = [value for pair in buckets for value in pair]
+
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT DISTINCT s.news_id, s.signature FROM lsh_buckets b '
+                'JOIN news_signatures s ON s.news_id = b.news_id '
+                f'WHERE {conditions}',
+                params
+            ).fetchall()
+
+        matches = []
+        for news_id, blob in rows:
+            score = estimate_similarity(signature, array('I', blob).tolist())
+            if score >= threshold:
+                matches.append((news_id, score))
+        matches.sort(key=lambda x: x[1], reverse=True)
+        return matches[:limit]
+
+    def query(self, news: Dict, threshold: float = 0.3, limit: int = 5) -> List[Tuple[int, float]]:
+        """뉴스와 비슷한 과거 뉴스 (news_id, 추정 유사도)"""
+        return self.query_signature(minhash_signature(news_text(news)), threshold=threshold, limit=limit)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
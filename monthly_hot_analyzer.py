@@ -1,47 +1,145 @@
 #!/usr/bin/env python3
 """
 월간 핫 뉴스 분석기
-지난 30일간의 뉴스 기록 → GPT-4o 분석 → 월간 TOP 10
+지난 30일간의 일별 롤업 → 주 단위 요약 (GPT-4o-mini, 병렬) → GPT-4o 종합 → 월간 TOP 10
 매월 1일 한국시간 오전에 실행
 """
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict
-import requests
+
+import llm_cache
+from daily_rollup import DailyRollupStore, render_digest
+from sent_news_store import SentNewsStore
 
 
 class MonthlyHotNewsAnalyzer:
     def __init__(self, openai_api_key: str, sent_news_file: str = '/data/sent_news_history.json'):
         self.openai_api_key = openai_api_key
-        self.sent_news_file = sent_news_file
+        self.sent_news_store = SentNewsStore.from_legacy_file(sent_news_file)
+        self.daily_rollups = DailyRollupStore(self.sent_news_store)
+        
+        # 맵 단계: 주 단위 일별 롤업을 작은 모델로 병렬 요약
+        self.map_model = os.getenv('MONTHLY_MAP_MODEL', 'gpt-4o-mini')
+        self.map_workers = int(os.getenv('MONTHLY_MAP_WORKERS', '6'))
     
-    def _load_monthly_news_history(self) -> List[Dict]:
-        """지난 30일간 전송된 뉴스 기록 로드"""
+    def _load_monthly_digests(self) -> List[Dict]:
+        """지난 30일간 일별 롤업 로드 (원본 기록 대신 날짜별 digest)"""
         try:
-            if not os.path.exists(self.sent_news_file):
-                print("⚠️ 뉴스 기록 파일 없음")
-                return []
+            today = datetime.now().date()
+            digests = self.daily_rollups.digests(today - timedelta(days=29), today)
             
-            with open(self.sent_news_file, 'r', encoding='utf-8') as f:
-                history = json.load(f)
+            print(f"📊 지난 30일간 전송된 뉴스: {sum(d['news_count'] for d in digests)}개 ({len(digests)}일치 롤업)")
+            return digests
             
-            # 30일 전 날짜 계산
-            thirty_days_ago = datetime.now() - timedelta(days=30)
-            
-            # 30일 이내 뉴스만 필터링
-            monthly_news = [
-                news for news in history.get('sent_news', [])
-                if news.get('sent_at', '') > thirty_days_ago.isoformat()
-            ]
+        except Exception as e:
+            print(f"⚠️ 일별 롤업 로드 실패: {e}")
+            return []
+    
+    @staticmethod
+    def _extract_json(response_text: str) -> Dict:
+        """GPT 응답에서 JSON 추출 (코드 블록 감싸기 대응)"""
+        if "```json" in response_text:
+            json_start = response_text.find("```json") + 7
+            json_end = response_text.find("```", json_start)
+            response_text = response_text[json_start:json_end].strip()
+        elif "```" in response_text:
+            json_start = response_text.find("```") + 3
+            json_end = response_text.find("```", json_start)
+            response_text = response_text[json_start:json_end].strip()
+        return json.loads(response_text)
+    
+    @staticmethod
+    def _split_into_chunks(daily_digests: List[Dict]) -> List[List[Dict]]:
+        """오늘부터 거꾸로 7일 단위로 일별 롤업을 묶음 (오래된 순)"""
+        today = datetime.now().date()
+        weeks = {}
+        for digest in daily_digests:
+            week = (today - datetime.fromisoformat(digest['day']).date()).days // 7
+            weeks.setdefault(week, []).append(digest)
+        return [weeks[week] for week in sorted(weeks, reverse=True)]
+    
+    @staticmethod
+    def _chunk_period(chunk: List[Dict]) -> str:
+        first, last = chunk[0]['day'], chunk[-1]['day']
+        return first if first == last else f"{first} ~ {last}"
+    
+    def _summarize_chunk(self, chunk: List[Dict]) -> Dict:
+        """맵 단계: 한 주치 일별 롤업을 핵심 이슈 요약으로 압축
+        
+        실패하면 대표 뉴스 제목 목록으로 대체해서 종합 단계에서 빠지지 않게 함
+        """
+        period = self._chunk_period(chunk)
+        news_count = sum(digest['news_count'] for digest in chunk)
+        # 맵 단계는 주 단위로 나눠 보내므로 대표 뉴스를 자르지 않음 (전송된 모든 이야기 포함)
+        news_text = "\n\n".join(render_digest(digest) for digest in chunk)
+        
+        prompt = f"""아래는 {period} 기간에 전송된 미국 주식 뉴스 {news_count}개의 날짜별 요약입니다.
+(날짜별 종목/주제 언급 빈도와 같은 이야기를 묶은 대표 뉴스)
+여러 날에 걸친 같은 이야기는 하나의 이슈로 묶어서, 이 기간의 **주요 이슈 최대 8개**를 정리해주세요.
+
+{news_text}
+
+**응답 형식** (JSON만):
+{{
+  "issues": [
+    {{
+      "title": "이슈 제목 (한국어)",
+      "summary": "무슨 일이 있었고 시장에 어떤 영향을 주었는지 2-3문장 (한국어)",
+      "news_count": 5,
+      "related_tickers": ["NVDA"],
+      "importance": "high/medium/low"
+    }}
+  ]
+}}
+
+관련 뉴스가 많은 이슈, 시장 영향이 큰 이슈 순으로 정렬하세요. JSON만 출력하세요."""
+        
+        try:
+            response = llm_cache.chat_completion(
+                self.openai_api_key,
+                {
+                    'model': self.map_model,
+                    'messages': [
+                        {'role': 'system', 'content': '당신은 금융 뉴스를 요약하는 애널리스트입니다. JSON 형식으로만 응답하세요.'},
+                        {'role': 'user', 'content': prompt}
+                    ],
+                    'temperature': 0.2,
+                    'max_tokens': 1500
+                },
+                timeout=60
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}")
             
-            print(f"📊 지난 30일간 전송된 뉴스: {len(monthly_news)}개")
-            return monthly_news
+            issues = self._extract_json(response.json()['choices'][0]['message']['content']).get('issues', [])
+            print(f"   ✅ {period}: 뉴스 {news_count}개 → 이슈 {len(issues)}개")
+            return {'period': period, 'news_count': news_count, 'issues': issues}
             
         except Exception as e:
-            print(f"⚠️ 뉴스 기록 로드 실패: {e}")
-            return []
+            print(f"   ⚠️ {period} 요약 실패 - 제목 목록으로 대체: {e}")
+            return {
+                'period': period,
+                'news_count': news_count,
+                'issues': [],
+                'titles': [story['title'] for digest in chunk for story in digest['stories']]
+            }
+    
+    @staticmethod
+    def _render_week_summary(summary: Dict) -> str:
+        lines = [f"### {summary['period']} (뉴스 {summary['news_count']}개)"]
+        for issue in summary['issues']:
+            tickers = ', '.join(issue.get('related_tickers') or [])
+            lines.append(
+                f"- {issue.get('title', '')} [관련 뉴스 {issue.get('news_count', 1)}개, 중요도 {issue.get('importance', '')}"
+                f"{', ' + tickers if tickers else ''}]\n  {issue.get('summary', '')}"
+            )
+        for title in summary.get('titles', []):
+            lines.append(f"- {title}")
+        return "\n".join(lines)
     
     def analyze_monthly_hot_news(self) -> List[Dict]:
         """월간 핫 뉴스 TOP 10 분석 (GPT-4o 사용)"""
@@ -49,21 +147,25 @@ class MonthlyHotNewsAnalyzer:
         print(f"📅 월간 핫 뉴스 TOP 10 분석 시작 (GPT-4o)")
         print(f"{'='*60}\n")
         
-        # 1. 지난 30일 뉴스 기록 로드
-        monthly_news = self._load_monthly_news_history()
+        # 1. 지난 30일 일별 롤업 로드
+        daily_digests = self._load_monthly_digests()
+        monthly_news_count = sum(digest['news_count'] for digest in daily_digests)
         
-        if not monthly_news:
+        if not monthly_news_count:
             print("❌ 분석할 뉴스가 없습니다.")
             return []
         
-        if len(monthly_news) < 50:
-            print(f"⚠️ 뉴스 개수가 적습니다 ({len(monthly_news)}개). 최소 50개 권장.")
+        if monthly_news_count < 50:
+            print(f"⚠️ 뉴스 개수가 적습니다 ({monthly_news_count}개). 최소 50개 권장.")
         
-        # 2. 뉴스 데이터 준비 (최대 300개)
-        news_summary = "\n\n".join([
-            f"[{idx+1}] {news.get('title', '')}\n요약: {news.get('summary', '')[:200]}\n날짜: {news.get('sent_at', '')[:10]}"
-            for idx, news in enumerate(monthly_news[:300])
-        ])
+        # 2. 맵: 주 단위로 묶은 일별 롤업을 병렬로 요약
+        chunks = self._split_into_chunks(daily_digests)
+        print(f"🗂️ {len(chunks)}개 청크로 나눠 {self.map_model}로 병렬 요약 중...")
+        with ThreadPoolExecutor(max_workers=max(1, min(self.map_workers, len(chunks)))) as executor:
+            week_summaries = list(executor.map(self._summarize_chunk, chunks))
+        
+        news_summary = "\n\n".join(self._render_week_summary(summary) for summary in week_summaries)
+        print(f"📦 종합 단계 입력: 주간 요약 {len(week_summaries)}개 ({len(news_summary)}자)\n")
         
         # 3. GPT-4o 프롬프트
         current_month = datetime.now().strftime('%Y년 %m월')
@@ -72,7 +174,7 @@ class MonthlyHotNewsAnalyzer:
 
 지난 30일간 ({current_month}) 미국 주식 시장의 뉴스를 종합 분석하여 **월간 가장 중요했던 이슈 TOP 10**을 선정해주세요.
 
-**지난 30일간 전송된 뉴스** ({len(monthly_news)}개):
+**지난 30일간 전송된 뉴스 {monthly_news_count}개를 기간별로 요약한 이슈 목록**:
 {news_summary}
 
 ---
@@ -116,6 +218,7 @@ class MonthlyHotNewsAnalyzer:
 - 모든 텍스트는 반드시 한국어로 작성
 - TOP 10개만 선정
 - 월간 관점의 **심층 분석** 필수
+- 여러 기간에 걸쳐 반복된 이슈는 하나로 합쳐서 평가
 - heat_score는 종합 점수 (1-100)
 - 점수 순으로 정렬
 
@@ -123,16 +226,11 @@ JSON만 출력하세요."""
 
         try:
             print(f"🤖 GPT-4o로 월간 종합 분석 중... (최고 품질)\n")
-            print(f"   분석 대상: {len(monthly_news)}개 뉴스")
-            print(f"   예상 시간: 30-60초\n")
+            print(f"   분석 대상: {monthly_news_count}개 뉴스 (기간별 요약 {len(week_summaries)}개)\n")
             
-            response = requests.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers={
-                    'Authorization': f'Bearer {self.openai_api_key}',
-                    'Content-Type': 'application/json'
-                },
-                json={
+            response = llm_cache.chat_completion(
+                self.openai_api_key,
+                {
                     'model': 'gpt-4o',  # GPT-4o 사용 (월간 분석)
                     'messages': [
                         {
@@ -154,18 +252,7 @@ JSON만 출력하세요."""
             
             result = response.json()
             response_text = result['choices'][0]['message']['content']
-            
-            # JSON 추출
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            
-            analysis = json.loads(response_text)
+            analysis = self._extract_json(response_text)
             
             monthly_summary = analysis.get('monthly_summary', '')
             market_mood = analysis.get('market_mood', '')
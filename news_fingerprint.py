@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+뉴스 정확 중복 지문 (정규화 URL + 정규화 제목)
+- 추적 파라미터(utm_* 등), AMP/모바일 주소, 스킴/호스트 차이를 없앤 정규화 URL
+- 제목 끝 매체명(" - Reuters" 등)과 구두점/대소문자를 없앤 정규화 제목
+- 둘 다 64비트 해시로 저장 (sent_news_history.db 내부 테이블, 지문 → 전송 기록)
+- 같은 기사가 다른 URL/매체(Yahoo의 Reuters 전재 등)로 다시 올라와도 GPT 호출 전에 제거
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+from news_similarity import normalize_text
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS news_fingerprints (
+    fingerprint INTEGER NOT NULL,
+    news_id INTEGER NOT NULL REFERENCES sent_news (id) ON DELETE CASCADE,
+    PRIMARY KEY (fingerprint, news_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_news_fingerprints_news_id ON news_fingerprints (news_id);
+"""
+
+# 기사 내용과 무관한 추적/유입 경로 파라미터
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', '_ga', '_gl',
+    'ref', 'ref_src', 'referrer', 'cmpid', 'cmp', 'src', 'source', '__source', 'soc_src', 'soc_trk',
+    'ncid', 'guccounter', 'guce_referrer', 'guce_referrer_sig', 'tsrc', '.tsrc', 'taid', 'mod',
+    'siteid', 'yptr', 'sr_share', 'smid', 'partner', 'feedname', 'rss', 'xid', 's_cid',
+    'amp', 'outputtype'
+}
+TRACKING_PREFIXES = ('utm_', 'at_', 'hsa_', 'pk_', 'mtm_')
+
+# 같은 기사를 가리키는 호스트 접두어 (모바일/AMP/www)
+HOST_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.')
+
+# 제목 끝에 붙는 매체명 (" - Reuters", " | CNBC" 등) - 전재 기사도 같은 지문이 되도록 제거
+PUBLISHER_SUFFIX = re.compile(
+    r'\s+[-|–—]\s+(reuters|bloomberg|cnbc|marketwatch|yahoo finance|investing\.com|'
+    r'associated press|ap news|the wall street journal|wsj|barron\'s|the motley fool|motley fool|'
+    r'financial times|ft|business insider|fox business|benzinga|seeking alpha|zacks)\s*$',
+    re.IGNORECASE
+)
+
+# 이보다 짧은 제목은 과거 기록과 비교하지 않음 ("Stock market today" 같은 반복 제목 오탐 방지)
+MIN_TITLE_WORDS = 4
+
+
+def _resolve_amp_cache(host: str, path: str) -> Optional[str]:
+    """Google AMP 캐시 주소 → 원본 URL
+
+    - https://www.google.com/amp/s/example.com/a/b
+    - https://example-com.cdn.ampproject.org/c/s/example.com/a/b
+    """
+    if host.endswith('.cdn.ampproject.org') or (host.startswith('google.') and path.startswith('/amp/')):
+        # /amp/s/, /c/s/, /v/s/ 등 접두 경로 뒤가 원본 호스트/경로 (스킴은 어차피 https로 통일)
+        match = re.match(r'^/(?:(?:amp|[a-z])/)+(.+)$', path)
+        if match:
+            return 'https://' + match.group(1)
+    return None
+
+
+def canonical_url(url: str) -> str:
+    """같은 기사를 가리키는 URL을 하나로 정규화 (비교용 - 전송 링크는 원본 유지)"""
+    url = (url or '').strip()
+    if not url:
+        return ''
+    parts = urlsplit(url if '//' in url else '//' + url)
+
+    host = (parts.hostname or '').lower().rstrip('.')
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    path = unquote(parts.path) or '/'
+
+    resolved = _resolve_amp_cache(host, path)
+    if resolved:
+        return canonical_url(resolved)
+
+    # AMP 경로: /amp, /amp/, /.../amp/..., .amp.html
+    path = re.sub(r'/amp(?=/|$)', '', path)
+    path = re.sub(r'\.amp(\.html?)$', r'\1', path)
+    path = re.sub(r'/{2,}', '/', path).rstrip('/') or '/'
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    # 스킴은 https로 통일, 기본 포트/프래그먼트 제거
+    netloc = host if parts.port in (None, 80, 443) else f"{host}:{parts.port}"
+    return urlunsplit(('https', netloc, path, urlencode(query), ''))
+
+
+def normalized_title(title: str) -> str:
+    """비교용 제목 (매체명 접미어 제거 + 소문자/구두점/공백 정규화)"""
+    return normalize_text(PUBLISHER_SUFFIX.sub('', (title or '').strip()))
+
+
+def _hash(kind: str, value: str) -> int:
+    """64비트 부호 있는 정수 해시 (SQLite INTEGER 범위)"""
+    digest = hashlib.blake2b(f"{kind}:{value}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def url_fingerprint(url: str) -> Optional[int]:
+    canonical = canonical_url(url)
+    return _hash('url', canonical) if canonical else None
+
+
+def title_fingerprint(title: str) -> Optional[int]:
+    normalized = normalized_title(title)
+    return _hash('title', normalized) if normalized else None
+
+
+def news_fingerprints(news: Dict) -> Dict[str, Optional[int]]:
+    """뉴스의 {'url': 지문, 'title': 지문} (원문 제목 우선)"""
+    return {
+        'url': url_fingerprint(news.get('link', '')),
+        'title': title_fingerprint(news.get('original_title') or news.get('title', ''))
+    }
+
+
+def comparable_fingerprints(news: Dict) -> Dict[str, Optional[int]]:
+    """중복 비교에 쓸 지문 (제목이 MIN_TITLE_WORDS 단어보다 짧으면 제목 지문은 None)"""
+    fingerprints = news_fingerprints(news)
+    title = normalized_title(news.get('original_title') or news.get('title', ''))
+    if len(title.split()) < MIN_TITLE_WORDS:
+        fingerprints['title'] = None
+    return fingerprints
+
+
+class FingerprintIndex:
+    def __init__(self, db_file: str, title_days: int = 7):
+        """
+        Args:
+            title_days: 제목 지문은 최근 N일 전송 기록과만 비교 (URL 지문은 보관 기간 전체)
+        """
+        self.db_file = db_file
+        self.title_days = title_days
+        self._lock = threading.Lock()
+
+        # 조회 지연을 줄이기 위해 연결을 유지 (스레드 간 접근은 잠금으로 직렬화)
+        self._conn = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA busy_timeout=30000')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._conn.executescript(SCHEMA)
+
+    def index_pending(self) -> int:
+        """아직 인덱싱되지 않은 전송 기록의 지문 추가 (증분)"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT id, link, original_title FROM sent_news '
+                'WHERE id > (SELECT COALESCE(MAX(news_id), 0) FROM news_fingerprints) ORDER BY id'
+            ).fetchall()
+            if not rows:
+                return 0
+
+            fingerprint_rows = []
+            for news_id, link, original_title in rows:
+                # 이전 버전 기록은 번역된 제목만 있으므로 URL 지문만 사용
+                fingerprints = news_fingerprints({'link': link or '', 'original_title': original_title or ''})
+                fingerprint_rows.extend(
+                    (fingerprint, news_id) for fingerprint in fingerprints.values() if fingerprint is not None
+                )
+
+            # 다른 프로세스가 같은 행을 먼저 인덱싱했어도 안전하도록 OR IGNORE
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO news_fingerprints (fingerprint, news_id) VALUES (?, ?)',
+                    fingerprint_rows
+                )
+        return len(rows)
+
+    def _existing(self, fingerprints: Set[int], since: str = None) -> Set[int]:
+        """전송 기록에 있는 지문 (since: 이 시각 이후 전송분만)"""
+        if not fingerprints:
+            return set()
+        placeholders = ', '.join('?' * len(fingerprints))
+        params = list(fingerprints)
+        query = 'SELECT DISTINCT f.fingerprint FROM news_fingerprints f'
+        if since:
+            query += ' JOIN sent_news s ON s.id = f.news_id'
+        query += f' WHERE f.fingerprint IN ({placeholders})'
+        if since:
+            query += ' AND s.sent_at > ?'
+            params.append(since)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return {row[0] for row in rows}
+
+    def sent_before(self, news_list: List[Dict]) -> List[int]:
+        """전송 기록과 URL 또는 제목 지문이 같은 뉴스의 인덱스 (기본키 탐색만 수행)"""
+        fingerprints = [comparable_fingerprints(news) for news in news_list]
+
+        urls = {fp['url'] for fp in fingerprints if fp['url'] is not None}
+        titles = {fp['title'] for fp in fingerprints if fp['title'] is not None}
+        since = (datetime.now() - timedelta(days=self.title_days)).isoformat()
+        sent_urls = self._existing(urls)
+        sent_titles = self._existing(titles, since)
+
+        return [
+            idx for idx, fp in enumerate(fingerprints)
+            if fp['url'] in sent_urls or fp['title'] in sent_titles
+        ]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
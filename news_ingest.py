@@ -0,0 +1,699 @@
+#!/usr/bin/env python3
+"""
+RSS 피드 상시 수집 (백그라운드) + 로컬 뉴스 저장소 (SQLite, /data)
+- 피드마다 자기 주기로 폴링해 항목을 저장소에 upsert (링크 기준)
+  → 브리프 시점에 피드에 남아 있는 30개가 아니라 12시간 동안 올라온 전체를 볼 수 있음
+- 브리프의 뉴스 수집(fetch_rss_news)은 저장소 조회 (밀리초)
+- 데몬이 없는 수동 실행은 주기가 지난 피드만 한 번 폴링한 뒤 조회
+- 피드별 high-water mark(가장 최근 처리한 발행 시각 + 항목 id) 아래로 내려가면 더 읽지 않음
+- 브리프 커서: 지난 브리프가 이미 검토한 항목은 다음 브리프의 중복 검사/GPT에 다시 넣지 않음
+- 시각은 모두 시간대 포함 UTC (published, first_seen, last_seen)
+- 다운로드는 스트리밍 (gzip/deflate, 크기 상한) + XML 증분 파싱
+  high-water mark/기준 시각 아래 항목이나 최대 항목 수에 닿으면 나머지 본문은 받지 않음
+- 요약은 저장 전에 정규화 (HTML/엔티티/상투 문구 제거, 항목 id + 원문 해시별 캐시) - 정규화 전후 토큰 수도 저장
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import feedparser
+
+import http_client
+from feed_cache import FeedCache
+from text_normalize import SummaryNormalizer, strip_html
+
+# 해외주식 RSS 피드 소스
+RSS_FEEDS = {
+    # 종합 뉴스
+    'MarketWatch': 'https://www.marketwatch.com/rss/topstories',
+    'Reuters Business': 'https://www.reutersagency.com/feed/?taxonomy=best-topics&post_type=best',
+    'Bloomberg Markets': 'https://feeds.bloomberg.com/markets/news.rss',
+    'CNBC Top News': 'https://www.cnbc.com/id/100003114/device/rss/rss.html',
+    'Yahoo Finance': 'https://finance.yahoo.com/news/rssindex',
+    'Investing.com': 'https://www.investing.com/rss/news.rss',
+
+    # 기술주/스타트업
+    'TechCrunch': 'https://techcrunch.com/feed/',
+    'The Verge': 'https://www.theverge.com/rss/index.xml',
+
+    # 거시경제
+    'Financial Times': 'https://www.ft.com/?format=rss',
+    'Wall Street Journal': 'https://feeds.a.dj.com/rss/RSSMarketsMain.xml',
+
+    # 한국 해외주식 뉴스
+    '연합인포맥스': 'https://news.einfomax.co.kr/news/rss.xml',
+    '서울경제': 'https://www.sedaily.com/RSS/S01.xml',
+    '한국경제': 'https://www.hankyung.com/feed/economy',
+}
+
+# 항목이 빨리 밀려나는 피드는 더 자주 폴링 (초, 나머지는 FEED_POLL_INTERVAL)
+FEED_POLL_INTERVALS = {
+    'CNBC Top News': 120,
+    'Yahoo Finance': 120,
+    'MarketWatch': 180,
+    'Investing.com': 180,
+}
+MAX_ERROR_BACKOFF = 1800  # 실패가 이어지는 피드의 최대 폴링 간격 (초)
+PRUNE_INTERVAL = 3600
+CHUNK_SIZE = 16 * 1024
+
+ENTRY_TAGS = {'item', 'entry'}  # RSS / Atom
+DATE_TAGS = ('pubDate', 'published', 'updated', 'date')  # date = dc:date
+SUMMARY_TAGS = ('description', 'summary', 'encoded', 'content')  # encoded = content:encoded
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS news_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    link TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT,
+    published TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    summary_tokens INTEGER,
+    raw_summary_tokens INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_news_items_published ON news_items (published);
+CREATE INDEX IF NOT EXISTS idx_news_items_first_seen ON news_items (first_seen);
+CREATE TABLE IF NOT EXISTS feed_state (
+    source TEXT PRIMARY KEY,
+    newest_published TEXT,
+    newest_entry_id TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# 이후 추가된 컬럼 (기존 DB에는 ALTER TABLE로 추가)
+ADDED_COLUMNS = {
+    'summary_tokens': 'INTEGER',
+    'raw_summary_tokens': 'INTEGER',
+}
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _local(tag: str) -> str:
+    """'{네임스페이스}이름' → '이름'"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    """RFC 822(RSS pubDate) 또는 ISO 8601(Atom, dc:date) → 시간대 포함 UTC"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _element_entry(elem) -> Dict:
+    """<item>/<entry> 요소 → {'id', 'title', 'link', 'summary', 'published'}"""
+    fields = {}
+    link = ''
+    for child in elem:
+        name = _local(child.tag)
+        if name == 'link':
+            # Atom: <link rel="alternate" href="..."/>, RSS: <link>...</link>
+            href = child.get('href')
+            if href and child.get('rel', 'alternate') == 'alternate' and not link:
+                link = href
+            elif (child.text or '').strip() and not link:
+                link = child.text.strip()
+        elif name not in fields:
+            fields[name] = ''.join(child.itertext()).strip()
+
+    return {
+        'id': fields.get('guid') or fields.get('id') or link,
+        'title': fields.get('title', ''),
+        'link': link,
+        'summary': next((fields[tag] for tag in SUMMARY_TAGS if fields.get(tag)), ''),
+        'published': next((_parse_date(fields[tag]) for tag in DATE_TAGS if fields.get(tag)), None)
+    }
+
+
+def _feedparser_entry(entry) -> Dict:
+    """feedparser 항목 → _element_entry와 같은 형식 (증분 파싱 실패 시)"""
+    published = None
+    for key in ('published_parsed', 'updated_parsed'):
+        if entry.get(key):
+            # feedparser의 *_parsed는 UTC struct_time
+            published = datetime(*entry[key][:6], tzinfo=timezone.utc)
+            break
+    return {
+        'id': entry.get('id') or entry.get('link', ''),
+        'title': entry.get('title', ''),
+        'link': entry.get('link', ''),
+        'summary': entry.get('summary', entry.get('description', '')),
+        'published': published
+    }
+
+
+def _bounded_chunks(response, metrics: Dict, max_bytes: int) -> Iterator[bytes]:
+    """응답 본문(gzip/deflate 해제 후)을 상한까지만 조각 단위로 반환 (마지막 조각은 잘라서)"""
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        if metrics['decoded_bytes'] + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - metrics['decoded_bytes']]
+            metrics['truncated'] = True
+        metrics['decoded_bytes'] += len(chunk)
+        yield chunk
+        if metrics['truncated']:
+            return
+
+
+def _stream_entries(response, metrics: Dict, max_bytes: int) -> Iterator[Dict]:
+    """응답 본문을 조각 단위로 받아 항목이 끝날 때마다 하나씩 반환
+
+    - 호출자가 중간에 멈추면(제너레이터 종료) 남은 본문은 받지 않음
+    - 크기 상한을 넘으면 거기까지 받은 항목만 사용
+    - XML 오류(형식이 깨진 피드)는 받은 본문 전체를 feedparser로 다시 파싱
+    - 문서 끝(루트 요소 닫힘 또는 본문 끝)에 닿으면 metrics['exhausted'] = True
+      (마지막 조각의 항목을 넘기기 전에 기록 - 항목 수가 정확히 상한인 피드도 조기 중단으로 보지 않음)
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    chunks = _bounded_chunks(response, metrics, max_bytes)
+    buffered = []
+    yielded = 0
+    root = None
+    try:
+        for chunk in chunks:
+            buffered.append(chunk)
+            started = time.perf_counter()
+            try:
+                parser.feed(chunk)
+                entries = []
+                for event, elem in parser.read_events():
+                    if event == 'start':
+                        if root is None:
+                            root = elem
+                    elif elem is root:
+                        metrics['exhausted'] = True
+                    elif _local(elem.tag) in ENTRY_TAGS:
+                        entries.append(_element_entry(elem))
+                        elem.clear()
+            except ET.ParseError:
+                break
+            finally:
+                metrics['parse_seconds'] += time.perf_counter() - started
+
+            for entry in entries:
+                yielded += 1
+                yield entry
+        else:
+            metrics['exhausted'] = True
+            return
+
+        # XML 오류 - 나머지 본문까지 (상한 안에서) 받아 관대한 파서로 재시도
+        metrics['fallback'] = True
+        buffered.extend(chunks)
+        started = time.perf_counter()
+        feed = feedparser.parse(b''.join(buffered))
+        metrics['parse_seconds'] += time.perf_counter() - started
+        metrics['exhausted'] = True
+        for entry in feed.entries[yielded:]:
+            yield _feedparser_entry(entry)
+    finally:
+        # 압축된 전송 바이트 (urllib3가 읽은 양)
+        try:
+            metrics['wire_bytes'] = response.raw.tell()
+        except Exception:
+            metrics['wire_bytes'] = metrics['decoded_bytes']
+        response.close()
+
+
+def parse_feed_entries(entries: Iterator[Dict], source_name: str, cutoff_time: datetime,
+                       high_water: Tuple[Optional[str], Optional[str]] = (None, None),
+                       max_entries: int = 100, normalizer: SummaryNormalizer = None) -> Tuple[List[Dict], Tuple]:
+    """피드 항목 → high-water mark 이후의 새 뉴스 (조건에 닿으면 더 읽지 않음)
+
+    Args:
+        cutoff_time: 시간대 포함 UTC - 이전 항목을 만나면 중단
+        high_water: (가장 최근 처리한 발행 시각 ISO, 그 항목 id)
+        max_entries: 한 번에 읽을 최대 항목 수
+        normalizer: 요약 정규화 캐시 (없으면 캐시 없이 정규화)
+
+    Returns:
+        (뉴스 리스트, 새 high-water mark)
+    """
+    newest_published, newest_entry_id = high_water
+    mark = datetime.fromisoformat(newest_published) if newest_published else None
+    normalizer = normalizer or SummaryNormalizer(max_entries=0)
+    if mark:
+        cutoff_time = max(cutoff_time, mark)
+
+    news_items = []
+    for count, entry in enumerate(entries, 1):
+        pub_date = entry['published']
+
+        # high-water mark 아래로 내려가면 이후 항목은 모두 처리한 것 (피드는 최신순)
+        if entry['id'] and entry['id'] == high_water[1]:
+            break
+        if pub_date and pub_date < cutoff_time:
+            break
+
+        # 제목과 링크 필수
+        title = strip_html(entry['title'])
+        link = entry['link'].strip()
+
+        if title and link:
+            # 요약문 (description 또는 summary) - HTML/상투 문구 제거 후 500자
+            normalized = normalizer.normalize(entry['id'] or link, entry['summary'], title)
+            news_items.append({
+                'title': title,
+                'link': link,
+                'summary': normalized['summary'],
+                'source': source_name,
+                'published': pub_date.isoformat() if pub_date else None,
+                'summary_tokens': normalized['summary_tokens'],
+                'raw_summary_tokens': normalized['raw_summary_tokens']
+            })
+
+            if pub_date and (not mark or pub_date > mark):
+                mark = pub_date
+                newest_published, newest_entry_id = pub_date.isoformat(), entry['id']
+
+        if count >= max_entries:
+            break
+
+    return news_items, (newest_published, newest_entry_id)
+
+
+def describe_transfer(result: Dict) -> str:
+    """피드 수집 결과의 전송량/파싱 시간 요약 - '12.3KB (해제 61.0KB), 파싱 4ms, 조기 중단'"""
+    text = f"{result['wire_bytes'] / 1024:,.1f}KB"
+    if result['decoded_bytes'] != result['wire_bytes']:
+        text += f" (해제 {result['decoded_bytes'] / 1024:,.1f}KB)"
+    text += f", 파싱 {result['parse_seconds'] * 1000:,.0f}ms"
+    if result['stopped_early']:
+        text += ", 조기 중단"
+    if result['truncated']:
+        text += ", 크기 상한 도달"
+    if result['fallback']:
+        text += ", feedparser 재파싱"
+    return text
+
+
+def describe_token_savings(news_or_results) -> str:
+    """요약 정규화로 줄어든 토큰 수 - '요약 1,234 → 567 토큰 (54% 절감)'
+
+    뉴스 목록 또는 수집 결과 목록 (정규화 전 토큰 수가 없는 항목은 제외)
+    """
+    pairs = [
+        (item['raw_summary_tokens'], item['summary_tokens'])
+        for item in news_or_results if item.get('raw_summary_tokens') is not None
+    ]
+    raw_tokens = sum(raw for raw, _ in pairs)
+    clean_tokens = sum(clean for _, clean in pairs)
+    saved = raw_tokens - clean_tokens
+    ratio = saved / raw_tokens * 100 if raw_tokens else 0
+    return f"요약 {raw_tokens:,} → {clean_tokens:,} 토큰 ({ratio:.0f}% 절감)"
+
+
+class NewsItemStore:
+    def __init__(self, db_file: str = '/data/news_items.db'):
+        self.db_file = db_file
+
+        db_dir = os.path.dirname(db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+            self._add_missing_columns(conn)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA busy_timeout=30000')
+        return conn
+
+    def _add_missing_columns(self, conn: sqlite3.Connection):
+        """이전 버전으로 생성된 DB에 새 컬럼 추가"""
+        existing = {row['name'] for row in conn.execute('PRAGMA table_info(news_items)')}
+        for column, column_type in ADDED_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f'ALTER TABLE news_items ADD COLUMN {column} {column_type}')
+        conn.commit()
+
+    def upsert(self, news_items: List[Dict]) -> int:
+        """링크 기준 upsert (제목/요약 수정은 반영, 처음 본 시각은 유지)
+
+        Returns:
+            새로 저장된 항목 수
+        """
+        if not news_items:
+            return 0
+        now = utc_now().isoformat()
+        links = [news['link'] for news in news_items]
+
+        conn = self._connect()
+        try:
+            with conn:
+                known = {
+                    row['link'] for row in conn.execute(
+                        f"SELECT link FROM news_items WHERE link IN ({','.join('?' * len(links))})", links
+                    )
+                }
+                conn.executemany(
+                    'INSERT INTO news_items (link, source, title, summary, published, first_seen, last_seen, '
+                    'summary_tokens, raw_summary_tokens) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT(link) DO UPDATE SET title = excluded.title, summary = excluded.summary, '
+                    'published = COALESCE(excluded.published, news_items.published), last_seen = excluded.last_seen, '
+                    'summary_tokens = excluded.summary_tokens, raw_summary_tokens = excluded.raw_summary_tokens',
+                    [
+                        (news['link'], news['source'], news['title'], news.get('summary') or '',
+                         news.get('published'), now, now, news.get('summary_tokens'), news.get('raw_summary_tokens'))
+                        for news in news_items
+                    ]
+                )
+        finally:
+            conn.close()
+        return len(set(links) - known)
+
+    def recent(self, cutoff_time: datetime, after_id: int = 0) -> List[Dict]:
+        """cutoff_time(UTC) 이후 발행된 뉴스 중 after_id 이후 저장된 것 (발행 시각이 없으면 처음 본 시각 기준)
+
+        Returns:
+            저장 순서대로, 'ingest_id'와 정규화 전후 요약 토큰 수 포함 (이전 버전 항목은 None)
+        """
+        cutoff = cutoff_time.astimezone(timezone.utc).isoformat()
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT id, link, source, title, summary, published, summary_tokens, raw_summary_tokens FROM news_items '
+                'WHERE id > ? AND (published >= ? OR (published IS NULL AND first_seen >= ?)) ORDER BY id',
+                (after_id, cutoff, cutoff)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            {
+                'title': row['title'],
+                'link': row['link'],
+                'summary': row['summary'],
+                'source': row['source'],
+                'published': row['published'],
+                'ingest_id': row['id'],
+                'summary_tokens': row['summary_tokens'],
+                'raw_summary_tokens': row['raw_summary_tokens']
+            }
+            for row in rows
+        ]
+
+    def high_water(self, source_name: str) -> Tuple[Optional[str], Optional[str]]:
+        """피드의 (가장 최근 처리한 발행 시각, 항목 id)"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT newest_published, newest_entry_id FROM feed_state WHERE source = ?', (source_name,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return (row['newest_published'], row['newest_entry_id']) if row else (None, None)
+
+    def set_high_water(self, source_name: str, mark: Tuple[Optional[str], Optional[str]]):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO feed_state (source, newest_published, newest_entry_id, updated_at) '
+                    'VALUES (?, ?, ?, ?)',
+                    (source_name, mark[0], mark[1], utc_now().isoformat())
+                )
+        finally:
+            conn.close()
+
+    def brief_cursor(self) -> int:
+        """지난 브리프가 검토한 마지막 항목 id"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'brief_cursor'").fetchone()
+        finally:
+            conn.close()
+        return int(row['value']) if row else 0
+
+    def set_brief_cursor(self, ingest_id: int):
+        """브리프 전송 후 커서 이동 (뒤로는 가지 않음)"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('brief_cursor', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = MAX(CAST(value AS INTEGER), CAST(excluded.value AS INTEGER))",
+                    (str(ingest_id),)
+                )
+        finally:
+            conn.close()
+
+    def prune(self, retention_days: int) -> int:
+        """보관 기간이 지난 항목 삭제"""
+        cutoff = (utc_now() - timedelta(days=retention_days)).isoformat()
+        conn = self._connect()
+        try:
+            with conn:
+                return conn.execute('DELETE FROM news_items WHERE last_seen < ?', (cutoff,)).rowcount
+        finally:
+            conn.close()
+
+
+class FeedIngestor:
+    def __init__(self, store: NewsItemStore, feeds: Dict[str, str] = None, feed_cache: FeedCache = None,
+                 poll_interval: int = 300, connect_timeout: float = 5, read_timeout: float = 10,
+                 max_workers: int = 8, retention_days: int = 3, max_bytes: int = 2 * 1024 * 1024,
+                 max_entries: int = 100):
+        self.store = store
+        self.feeds = feeds or RSS_FEEDS
+        self.feed_cache = feed_cache or FeedCache('/data/feed_cache')
+        self.poll_interval = poll_interval
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_workers = max_workers
+        self.retention_days = retention_days
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.normalizer = SummaryNormalizer()
+
+        self._lock = threading.Lock()
+        self._next_poll = {source_name: 0.0 for source_name in self.feeds}
+        self._failures = {source_name: 0 for source_name in self.feeds}
+        self._in_flight = set()
+        self._thread = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            NewsItemStore(os.getenv('NEWS_STORE_FILE', '/data/news_items.db')),
+            poll_interval=int(os.getenv('FEED_POLL_INTERVAL', '300')),
+            connect_timeout=float(os.getenv('FEED_CONNECT_TIMEOUT', '5')),
+            read_timeout=float(os.getenv('FEED_READ_TIMEOUT', '10')),
+            max_workers=int(os.getenv('FEED_MAX_WORKERS', '8')),
+            retention_days=int(os.getenv('NEWS_STORE_RETENTION_DAYS', '3')),
+            max_bytes=int(os.getenv('FEED_MAX_BYTES', str(2 * 1024 * 1024))),
+            max_entries=int(os.getenv('FEED_MAX_ENTRIES', '100'))
+        )
+
+    def interval(self, source_name: str) -> float:
+        return FEED_POLL_INTERVALS.get(source_name, self.poll_interval)
+
+    def fetch_feed(self, source_name: str, feed_url: str,
+                   metrics: Dict = None) -> Optional[Tuple[List[Dict], Tuple, Optional[Tuple]]]:
+        """단일 RSS 피드 수집 (연결/읽기 타임아웃, 압축 전송, 크기 상한, high-water mark 이후 항목만)
+
+        Args:
+            metrics: 전달하면 전송/해제 바이트, 파싱 시간, 조기 중단 여부를 기록
+
+        Returns:
+            (새 뉴스 리스트, 새 high-water mark, 검증자 (ETag, Last-Modified) 또는 None),
+            피드가 변경되지 않았으면(304) None
+            - 검증자와 high-water mark는 호출자가 저장이 끝난 뒤에 기록 (fetch_feed는 상태를 바꾸지 않음)
+        """
+        if metrics is None:
+            metrics = {}
+        metrics.update({'wire_bytes': 0, 'decoded_bytes': 0, 'parse_seconds': 0.0,
+                        'truncated': False, 'fallback': False, 'exhausted': False, 'stopped_early': False})
+
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (compatible; USStockNewsBot/1.0)',
+            'Accept-Encoding': 'gzip, deflate'
+        }
+        headers.update(self.feed_cache.conditional_headers(feed_url))
+
+        # 재시도 없이 1회 - 실패하면 다음 폴링에서 다시
+        # stream=True: 본문은 읽는 만큼만 받음 (조기 중단 시 나머지는 받지 않음)
+        response = http_client.get(
+            feed_url,
+            headers=headers,
+            timeout=(self.connect_timeout, self.read_timeout),
+            stream=True,
+            max_retries=0
+        )
+
+        # 지난 수집 이후 변경 없음 - 재파싱 없이 새 뉴스 없음으로 처리
+        if response.status_code == 304:
+            response.close()
+            return None
+
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+
+        entries = _stream_entries(response, metrics, self.max_bytes)
+        cutoff_time = utc_now() - timedelta(days=self.retention_days)
+        try:
+            news_items, mark = parse_feed_entries(
+                entries, source_name, cutoff_time, self.store.high_water(source_name), self.max_entries,
+                self.normalizer
+            )
+            # 크기 상한이 아닌 high-water mark/보관 기간/항목 수 상한 때문에 문서 끝 전에 멈춤
+            metrics['stopped_early'] = not metrics['exhausted'] and not metrics['truncated']
+        finally:
+            entries.close()  # 남은 본문은 받지 않고 연결 종료
+
+        # 본문을 끝까지 파싱했을 때만 검증자 사용 (잘린 본문으로 304를 받으면 항목을 놓침)
+        validators = None
+        if not metrics['truncated']:
+            validators = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return news_items, mark, validators
+
+    def _ingest(self, source_name: str) -> Dict:
+        """피드 하나 폴링 → 저장소 upsert → 다음 폴링 시각 예약"""
+        metrics = {}
+        try:
+            fetched = self.fetch_feed(source_name, self.feeds[source_name], metrics)
+            if fetched is None:
+                result = {'status': 'not_modified'}
+            else:
+                news_items, mark, validators = fetched
+                result = {
+                    'status': 'ok', 'entries': len(news_items), 'new': self.store.upsert(news_items),
+                    'summary_tokens': sum(news['summary_tokens'] for news in news_items),
+                    'raw_summary_tokens': sum(news['raw_summary_tokens'] for news in news_items),
+                    **metrics
+                }
+                # 저장이 커밋된 뒤에 mark 이동 + 검증자 기록
+                # (저장이 실패하면 다음 폴링이 304/high-water mark에 막히지 않고 같은 항목을 다시 읽음)
+                # 검증자는 바로 파일에 저장 - 수집 예산을 넘겨 늦게 끝난 피드도 빠짐없이 남도록
+                self.store.set_high_water(source_name, mark)
+                if validators:
+                    self.feed_cache.store(self.feeds[source_name], *validators)
+                    self.feed_cache.save()
+            failures = 0
+        except Exception as e:
+            result = {'status': 'error', 'error': str(e)}
+            with self._lock:
+                failures = self._failures[source_name] + 1
+
+        # 실패가 이어지면 간격을 늘림
+        delay = min(MAX_ERROR_BACKOFF, self.interval(source_name) * (2 ** failures))
+        with self._lock:
+            self._failures[source_name] = failures
+            self._next_poll[source_name] = time.time() + delay
+            self._in_flight.discard(source_name)
+        return result
+
+    def poll(self, budget: float = None, verbose: bool = False) -> Dict[str, Dict]:
+        """폴링 주기가 지난 피드를 병렬로 수집 (다른 스레드가 수집 중인 피드는 제외)
+
+        Args:
+            budget: 전체 대기 예산 (초) - 넘긴 피드는 기다리지 않음 (백그라운드에서 계속 진행)
+
+        Returns:
+            {피드 이름: 결과} - 예산 안에 끝난 피드만
+        """
+        now = time.time()
+        with self._lock:
+            due = [name for name, next_poll in self._next_poll.items()
+                   if next_poll <= now and name not in self._in_flight]
+            self._in_flight.update(due)
+        if not due:
+            return {}
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='rss')
+        futures = {name: executor.submit(self._ingest, name) for name in due}
+        done, _ = wait(futures.values(), timeout=budget)
+        executor.shutdown(wait=False)
+
+        results = {name: future.result() for name, future in futures.items() if future in done}
+        if verbose:
+            for name in due:
+                result = results.get(name)
+                if result is None:
+                    print(f"🔍 {name}: ⏰ 수집 예산 초과 (백그라운드에서 계속)")
+                elif result['status'] == 'ok':
+                    print(f"🔍 {name}: ✅ {result['entries']}개 (새 뉴스 {result['new']}개, {describe_transfer(result)})")
+                elif result['status'] == 'not_modified':
+                    print(f"🔍 {name}: 💤 변경 없음 (304)")
+                else:
+                    print(f"🔍 {name}: ❌ 실패: {result['error']}")
+        return results
+
+    def _run(self):
+        last_prune = 0.0
+        while True:
+            try:
+                results = self.poll()
+                new_count = sum(result.get('new', 0) for result in results.values())
+                if new_count:
+                    wire_bytes = sum(result.get('wire_bytes', 0) for result in results.values())
+                    parse_ms = sum(result.get('parse_seconds', 0) for result in results.values()) * 1000
+                    print(f"📥 피드 수집: 새 뉴스 {new_count}개 ({len(results)}개 피드 폴링, "
+                          f"{wire_bytes / 1024:,.1f}KB, 파싱 {parse_ms:,.0f}ms, {describe_token_savings(results.values())})")
+                if time.time() - last_prune > PRUNE_INTERVAL:
+                    self.store.prune(self.retention_days)
+                    last_prune = time.time()
+            except Exception as e:
+                print(f"⚠️ 피드 수집 오류: {e}")
+
+            with self._lock:
+                next_poll = min(self._next_poll.values())
+            time.sleep(max(1.0, next_poll - time.time()))
+
+    def start(self):
+        """백그라운드 수집 시작 (프로세스당 한 번)"""
+        with self._lock:
+            if self._thread:
+                return
+            self._thread = threading.Thread(target=self._run, name='feed-ingest', daemon=True)
+            self._thread.start()
+        print(f"📥 피드 상시 수집 시작: {len(self.feeds)}개 피드 (기본 {self.poll_interval}초 주기)")
+
+
+_ingestor = None
+_ingestor_lock = threading.Lock()
+
+
+def get_ingestor() -> FeedIngestor:
+    """프로세스 공용 수집기 (스케줄러의 백그라운드 수집과 브리프가 폴링 상태를 공유)"""
+    global _ingestor
+    with _ingestor_lock:
+        if _ingestor is None:
+            _ingestor = FeedIngestor.from_env()
+        return _ingestor
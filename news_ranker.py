@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+로컬 뉴스 사전 순위 (GPT 선별 앞단)
+결정적인 점수로 후보를 정렬해 상위 K개만 GPT 프롬프트에 전달
+- 출처 가중치, 최신성, 종목/기업 언급, 거시경제 키워드, 여러 매체 동시 보도
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import List, Dict
+
+# 출처별 가중치 (0~1)
+SOURCE_WEIGHTS = {
+    'Reuters Business': 1.0,
+    'Bloomberg Markets': 1.0,
+    'Wall Street Journal': 1.0,
+    'Financial Times': 0.95,
+    'CNBC Top News': 0.9,
+    'MarketWatch': 0.85,
+    'Yahoo Finance': 0.75,
+    'Investing.com': 0.75,
+    '연합인포맥스': 0.75,
+    '한국경제': 0.7,
+    '서울경제': 0.7,
+    'TechCrunch': 0.6,
+    'The Verge': 0.5,
+}
+DEFAULT_SOURCE_WEIGHT = 0.6
+
+# 주요 기업 (영문/한글)
+COMPANY_PATTERN = re.compile(
+    r'\b(apple|nvidia|microsoft|tesla|amazon|meta|alphabet|google|netflix|broadcom|amd|intel|'
+    r'berkshire|jpmorgan|goldman|morgan stanley|exxon|chevron|walmart|boeing|palantir|openai|tsmc)\b'
+    r'|애플|엔비디아|마이크로소프트|테슬라|아마존|메타|알파벳|구글|넷플릭스|브로드컴|인텔|팔란티어|오픈AI',
+    re.IGNORECASE
+)
+# $NVDA, (NVDA), NASDAQ:NVDA 형태의 티커
+TICKER_PATTERN = re.compile(r'\$[A-Z]{1,5}\b|\((?:NASDAQ:|NYSE:)?[A-Z]{1,5}\)')
+
+# 거시경제/시장 전반 키워드
+MACRO_PATTERN = re.compile(
+    r'\b(fed|fomc|powell|rate (?:cut|hike)s?|interest rates?|inflation|cpi|pce|payrolls?|jobs report|'
+    r'unemployment|gdp|recession|treasury|yields?|tariffs?|earnings|guidance|s&p 500|nasdaq|dow)\b'
+    r'|연준|금리|물가|인플레이션|고용|실업률|국채|관세|실적|경기침체|나스닥|다우',
+    re.IGNORECASE
+)
+
+STOPWORDS = {
+    'the', 'a', 'an', 'to', 'of', 'in', 'on', 'for', 'and', 'or', 'as', 'at', 'by', 'with',
+    'is', 'are', 'was', 'be', 'from', 'after', 'its', 'it', 'that', 'this', 'says', 'said', 'new'
+}
+
+
+def title_terms(title: str) -> set:
+    """제목의 의미 있는 단어 집합 (불용어/짧은 단어 제외)"""
+    return {word for word in re.findall(r'\w+', title.lower()) if len(word) > 2 and word not in STOPWORDS}
+
+
+class NewsRanker:
+    def __init__(self, source_weight: float = 0.25, freshness_weight: float = 0.2,
+                 entity_weight: float = 0.2, macro_weight: float = 0.15,
+                 corroboration_weight: float = 0.2, freshness_half_life_hours: float = 6):
+        self.weights = {
+            'source': source_weight,
+            'freshness': freshness_weight,
+            'entity': entity_weight,
+            'macro': macro_weight,
+            'corroboration': corroboration_weight,
+        }
+        self.freshness_half_life_hours = freshness_half_life_hours
+
+    def _freshness(self, published: str, now: datetime) -> float:
+        """발행 후 경과 시간에 따른 지수 감쇠 (발행 시간 없으면 0.5)"""
+        if not published:
+            return 0.5
+        try:
+            published_at = datetime.fromisoformat(published)
+            # 시간대 없는 값은 피드 원본(UTC) 그대로 저장된 예전 기록
+            if published_at.tzinfo is None:
+                published_at = published_at.replace(tzinfo=timezone.utc)
+            age_hours = max(0.0, (now - published_at).total_seconds() / 3600)
+        except (TypeError, ValueError):
+            return 0.5
+        return math.pow(0.5, age_hours / self.freshness_half_life_hours)
+
+    def _corroboration(self, news_list: List[Dict]) -> List[int]:
+        """같은 이야기를 다룬 다른 매체 수 (제목 단어 Jaccard 0.3 이상)
+
+        단어 → 뉴스 역색인으로 단어를 하나 이상 공유하는 쌍만 비교 (전체 쌍 비교 없음)
+        """
+        terms = [title_terms(news['title']) for news in news_list]
+        sources = [set() for _ in news_list]
+        postings = defaultdict(list)
+        for i, news in enumerate(news_list):
+            # 앞서 색인된 뉴스 중 공유 단어 수
+            shared = Counter(j for term in terms[i] for j in postings[term])
+            for j, common in shared.items():
+                other = news_list[j]
+                if other['source'] == news['source']:
+                    continue
+                if common / (len(terms[i]) + len(terms[j]) - common) >= 0.3:
+                    sources[i].add(other['source'])
+                    sources[j].add(news['source'])
+            for term in terms[i]:
+                postings[term].append(i)
+        return [len(found) for found in sources]
+
+    def score(self, news_list: List[Dict], now: datetime = None) -> List[Dict]:
+        """뉴스별 점수 계산 (원본은 그대로, 'prerank_score'/'prerank_signals'를 추가한 복사본 반환)"""
+        now = now or datetime.now(timezone.utc)
+        corroboration = self._corroboration(news_list)
+
+        scored = []
+        for news, corroborating_sources in zip(news_list, corroboration):
+            text = f"{news['title']} {news.get('summary', '')}"
+            signals = {
+                'source': SOURCE_WEIGHTS.get(news['source'], DEFAULT_SOURCE_WEIGHT),
+                'freshness': self._freshness(news.get('published'), now),
+                'entity': min(1.0, (len(COMPANY_PATTERN.findall(text)) + len(TICKER_PATTERN.findall(text))) / 2),
+                'macro': min(1.0, len(MACRO_PATTERN.findall(text)) / 2),
+                'corroboration': min(1.0, corroborating_sources / 3),
+            }
+            total = sum(self.weights[name] * value for name, value in signals.items())
+            scored.append(dict(news, prerank_score=round(total * 100, 1), prerank_signals=signals))
+        return scored
+
+    def select_top(self, news_list: List[Dict], top_k: int, now: datetime = None) -> List[Dict]:
+        """점수 상위 top_k개 (동점이면 원래 순서 유지)"""
+        scored = self.score(news_list, now=now)
+        ranked = sorted(enumerate(scored), key=lambda x: (-x[1]['prerank_score'], x[0]))
+        return [news for _, news in ranked[:top_k]]
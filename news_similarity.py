@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+로컬 뉴스 유사도 계산 (GPT 중복 검사 앞단 필터)
+문자 n-gram 해시 TF-IDF + 코사인 유사도로 후보 뉴스와 과거 뉴스를 비교
+- 확실한 중복 / 확실한 비중복은 로컬에서 판정
+- 애매한 쌍만 GPT로 전달
+"""
+
+import math
+import re
+import zlib
+from collections import defaultdict
+from typing import List, Dict, Tuple
+
+NGRAM_SIZE = 3
+HASH_BUCKETS = 1 << 20
+
+
+def normalize_text(text: str) -> str:
+    """비교용 정규화 (소문자, 구두점 제거, 공백 정리)"""
+    text = re.sub(r'[^\w\s]', ' ', (text or '').lower())
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def shingle_hashes(text: str, n: int = NGRAM_SIZE) -> Dict[int, int]:
+    """문자 n-gram 해시별 출현 횟수 (crc32 - 프로세스 간 동일한 값)"""
+    text = normalize_text(text)
+    counts = defaultdict(int)
+    if len(text) < n:
+        if text:
+            counts[zlib.crc32(text.encode('utf-8')) % HASH_BUCKETS] += 1
+        return counts
+    for i in range(len(text) - n + 1):
+        counts[zlib.crc32(text[i:i + n].encode('utf-8')) % HASH_BUCKETS] += 1
+    return counts
+
+
+def news_text(news: Dict) -> str:
+    """비교에 사용할 뉴스 텍스트 (원문 제목/요약 우선)"""
+    title = news.get('original_title') or news.get('title', '')
+    summary = news.get('original_summary') or news.get('summary', '')
+    return f"{title} {summary[:200]}"
+
+
+class SimilarityPrefilter:
+    def __init__(self, duplicate_threshold: float = 0.75, distinct_threshold: float = 0.25):
+        self.duplicate_threshold = duplicate_threshold
+        self.distinct_threshold = distinct_threshold
+
+    def _tfidf_vectors(self, docs: List[Dict[int, int]]) -> List[Dict[int, float]]:
+        """해시 n-gram 카운트 → L2 정규화된 TF-IDF 벡터"""
+        doc_freq = defaultdict(int)
+        for doc in docs:
+            for h in doc:
+                doc_freq[h] += 1
+
+        total = len(docs)
+        vectors = []
+        for doc in docs:
+            vec = {
+                h: (1 + math.log(tf)) * math.log((1 + total) / (1 + doc_freq[h])) + 1e-9
+                for h, tf in doc.items()
+            }
+            norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+            vectors.append({h: w / norm for h, w in vec.items()})
+        return vectors
+
+    def similarity_matrix(self, candidates: List[str], history: List[str], top_k: int = 3) -> List[List[Tuple[int, float]]]:
+        """후보별 가장 유사한 과거 뉴스 top_k (과거 인덱스, 코사인 유사도)"""
+        if not candidates or not history:
+            return [[] for _ in candidates]
+
+        docs = [shingle_hashes(text) for text in history + candidates]
+        vectors = self._tfidf_vectors(docs)
+        history_vectors = vectors[:len(history)]
+        candidate_vectors = vectors[len(history):]
+
+        # 역색인: n-gram 해시 → (과거 인덱스, 가중치) - 겹치는 n-gram만 계산
+        postings = defaultdict(list)
+        for hist_idx, vec in enumerate(history_vectors):
+            for h, w in vec.items():
+                postings[h].append((hist_idx, w))
+
+        results = []
+        for vec in candidate_vectors:
+            scores = defaultdict(float)
+            for h, w in vec.items():
+                for hist_idx, hw in postings.get(h, ()):
+                    scores[hist_idx] += w * hw
+            best = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
+            results.append(best)
+        return results
+
+    def classify(self, candidates: List[Dict], history: List[Dict]) -> Dict:
+        """후보 뉴스를 중복 / 비중복 / 애매(GPT 검사 필요)로 분류
+
+        Returns:
+            {
+                'duplicates': {후보 인덱스: (과거 인덱스, 점수)},
+                'borderline': {후보 인덱스: [(과거 인덱스, 점수), ...]},
+                'distinct': [후보 인덱스, ...]
+            }
+        """
+        matches = self.similarity_matrix(
+            [news_text(news) for news in candidates],
+            [news_text(news) for news in history]
+        )
+
+        result = {'duplicates': {}, 'borderline': {}, 'distinct': []}
+        for idx, best in enumerate(matches):
+            top_score = best[0][1] if best else 0.0
+            if top_score >= self.duplicate_threshold:
+                result['duplicates'][idx] = best[0]
+            elif top_score > self.distinct_threshold:
+                result['borderline'][idx] = [m for m in best if m[1] > self.distinct_threshold]
+            else:
+                result['distinct'].append(idx)
+        return result
@@ -4,18 +4,34 @@
 중요한 뉴스 10개를 한 글로 모아서 텔레그램에 전송
 """
 
-import feedparser
-import requests
 import json
-from datetime import datetime, timedelta
-from typing import List, Dict
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional
 import os
 import sys
 
+import llm_cache
+from sent_news_store import SentNewsStore
+from news_similarity import SimilarityPrefilter
+from minhash_index import MinHashLSHIndex
+from news_fingerprint import FingerprintIndex, comparable_fingerprints
+from run_ledger import RunLedger, daily_window
+from news_ranker import NewsRanker
+from prompt_packer import pack_news
+from daily_rollup import DailyRollupStore
+from telegram_delivery import get_delivery, message_part, photo_part
+from header_image_cache import HeaderImageCache, photo_file_id
+from message_render import escape_link, escape_markdown, split_blocks
+from news_ingest import describe_token_savings, get_ingestor
+
 # Railway 로깅을 위한 버퍼링 비활성화
 sys.stdout.reconfigure(line_buffering=True)
 sys.stderr.reconfigure(line_buffering=True)
 
+# GPT 중복 검사 한 번에 보내는 애매한 후보 수 (넘으면 나눠서 모두 검사)
+GPT_REVIEW_BATCH = 50
+
 class USStockNewsSummary:
     def __init__(self, telegram_token: str, telegram_chat_ids: str, openai_api_key: str, news_priority: str = 'general'):
         self.telegram_token = telegram_token
@@ -26,93 +42,163 @@ class USStockNewsSummary:
         
         print(f"📢 전송 대상 채팅방: {len(self.telegram_chat_ids)}개")
         
+        # 텔레그램 동시 전송 엔진 (프로세스 공용 - 채팅방별 전송 제한 공유)
+        self.delivery = get_delivery(telegram_token)
+        
+        # 헤더 이미지 file_id 캐시 (URL 이미지는 한 번만 업로드)
+        self.header_images = HeaderImageCache('/data/header_image_cache.json')
+        
         # 전송 기록 파일 경로 - Railway Volume 필수 사용
         self.sent_news_file = '/data/sent_news_history.json'
-        print(f"📁 데이터 저장 경로: {self.sent_news_file}")
         
         # /data 디렉토리가 없으면 생성
         os.makedirs('/data', exist_ok=True)
         
-        # 해외주식 RSS 피드 소스
-        self.rss_feeds = {
-            # 종합 뉴스
-            'MarketWatch': 'https://www.marketwatch.com/rss/topstories',
-            'Reuters Business': 'https://www.reutersagency.com/feed/?taxonomy=best-topics&post_type=best',
-            'Bloomberg Markets': 'https://feeds.bloomberg.com/markets/news.rss',
-            'CNBC Top News': 'https://www.cnbc.com/id/100003114/device/rss/rss.html',
-            'Yahoo Finance': 'https://finance.yahoo.com/news/rssindex',
-            'Investing.com': 'https://www.investing.com/rss/news.rss',
-            
-            # 기술주/스타트업
-            'TechCrunch': 'https://techcrunch.com/feed/',
-            'The Verge': 'https://www.theverge.com/rss/index.xml',
-            
-            # 거시경제
-            'Financial Times': 'https://www.ft.com/?format=rss',
-            'Wall Street Journal': 'https://feeds.a.dj.com/rss/RSSMarketsMain.xml',
-            
-            # 한국 해외주식 뉴스
-            '연합인포맥스': 'https://news.einfomax.co.kr/news/rss.xml',
-            '서울경제': 'https://www.sedaily.com/RSS/S01.xml',
-            '한국경제': 'https://www.hankyung.com/feed/economy',
-        }
+        # 전송 기록 저장소 (SQLite, 기존 JSON은 최초 1회 마이그레이션)
+        self.sent_news_store = SentNewsStore.from_legacy_file(self.sent_news_file)
+        print(f"📁 데이터 저장 경로: {self.sent_news_store.db_file}")
+        
+        # 보관 기간 전체 유사도 인덱스 (MinHash/LSH, 같은 DB 파일)
+        self.similarity_index = MinHashLSHIndex(self.sent_news_store.db_file)
+        
+        # 정규화 URL/제목 지문 인덱스 (같은 DB 파일) - 정확한 중복은 GPT 호출 전에 제거
+        self.fingerprint_index = FingerprintIndex(
+            self.sent_news_store.db_file,
+            title_days=int(os.getenv('EXACT_DEDUP_TITLE_DAYS', '7'))
+        )
+        
+        # 주간/월간 분석용 일별 롤업 (전송 후 갱신)
+        self.daily_rollups = DailyRollupStore(self.sent_news_store)
+        
+        # RSS 상시 수집기 + 로컬 뉴스 저장소 (프로세스 공용 - 스케줄러가 백그라운드 수집 시작)
+        self.ingestor = get_ingestor()
+        self.rss_feeds = self.ingestor.feeds
+        
+        # 브리프 시점에 폴링 주기가 지난 피드만 수집 (데몬이 없는 수동 실행) - 이 예산을 넘긴 피드는 기다리지 않음
+        self.feed_collect_budget = float(os.getenv('FEED_COLLECT_BUDGET', '30'))
+        
+        # 로컬 유사도 1차 필터 (확실한 중복/비중복은 GPT 없이 판정)
+        self.similarity_prefilter = SimilarityPrefilter(
+            duplicate_threshold=float(os.getenv('DEDUP_DUPLICATE_THRESHOLD', '0.75')),
+            distinct_threshold=float(os.getenv('DEDUP_DISTINCT_THRESHOLD', '0.25'))
+        )
+        
+        # GPT 선별 전 로컬 사전 순위 - 상위 K개만 프롬프트에 포함
+        self.news_ranker = NewsRanker()
+        self.prerank_top_k = int(os.getenv('PRERANK_TOP_K', '40'))
+        
+        # 선별 프롬프트의 뉴스 목록 토큰 예산
+        self.prompt_token_budget = int(os.getenv('PROMPT_TOKENS_DAILY', '6000'))
     
-    def _load_sent_news_history(self) -> Dict:
-        """전송 기록 불러오기"""
+    def _load_sent_news_history(self, days: int = 7) -> Dict:
+        """최근 N일 전송 기록 불러오기"""
         try:
-            if os.path.exists(self.sent_news_file):
-                with open(self.sent_news_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            since = datetime.now() - timedelta(days=days)
+            return {'sent_news': self.sent_news_store.since(since)}
         except Exception as e:
             print(f"⚠️ 전송 기록 로드 실패: {e}")
         return {'sent_news': []}
     
-    def _save_sent_news_history(self, history: Dict):
-        """전송 기록 저장"""
-        try:
-            with open(self.sent_news_file, 'w', encoding='utf-8') as f:
-                json.dump(history, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"⚠️ 전송 기록 저장 실패: {e}")
-    
-    def _clean_old_history(self, history: Dict, days: int = 1095) -> Dict:
-        """N일 이전 기록 삭제 (기본 3년 = 1095일)"""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        cutoff_str = cutoff_date.isoformat()
-        
-        cleaned = {
-            'sent_news': [
-                news 
-                for news in history.get('sent_news', []) 
-                if news.get('sent_at', '') > cutoff_str
-            ]
-        }
+    def _check_duplicate_by_similarity(self, new_news_list: List[Dict], history: Dict) -> List[Dict]:
+        """유사한 주제의 뉴스 필터링
         
-        removed_count = len(history.get('sent_news', [])) - len(cleaned['sent_news'])
-        if removed_count > 0:
-            print(f"🗑️ {removed_count}개의 오래된 기록 삭제 (3년 이상)")
+        1단계: 모든 후보를 최근 전송 기록과 로컬 유사도로 비교
+        2단계: 애매한 후보만 GPT로 판정
+        """
+        sent_news = history.get('sent_news', [])
         
-        return cleaned
-    
-    def _check_duplicate_by_similarity(self, new_news_list: List[Dict], history: Dict) -> List[Dict]:
-        """GPT를 사용하여 유사한 주제의 뉴스 필터링"""
-        if not history.get('sent_news'):
+        # 최근 기록 밖(보관 기간 전체)에서 비슷한 과거 뉴스도 비교 대상에 포함
+        sent_news = sent_news + self._find_archive_matches(new_news_list, sent_news)
+        
+        if not sent_news:
             print("📝 전송 기록 없음 - 중복 체크 생략")
             return new_news_list
         
-        # 최근 전송한 뉴스 정보 (제목 + 요약)
+        # 원문 제목이 저장된 기록만 로컬 비교 가능 (이전 버전 기록은 한국어 번역본만 있음)
+        comparable = [news for news in sent_news if news.get('original_title')]
+        legacy = [news for news in sent_news if not news.get('original_title')]
+        
+        local = self.similarity_prefilter.classify(new_news_list, comparable)
+        duplicate_indices = set(local['duplicates'])
+        print(f"🧮 로컬 유사도 검사: 중복 {len(local['duplicates'])}개, "
+              f"비중복 {len(local['distinct'])}개, 애매 {len(local['borderline'])}개 "
+              f"(과거 {len(comparable)}개와 비교)")
+        
+        # GPT 검토 대상: 애매한 후보 (번역본만 있는 과거 기록은 로컬 비교가 불가능하므로 남은 후보 전체)
+        review_indices = sorted(local['borderline'])
+        if legacy:
+            review_indices = [idx for idx in range(len(new_news_list)) if idx not in duplicate_indices]
+            legacy = legacy[-30:]
+        
+        # 한 번에 GPT_REVIEW_BATCH개씩 - 각 배치는 그 후보들이 닮은 과거 뉴스와만 비교
+        batch_count = -(-len(review_indices) // GPT_REVIEW_BATCH)
+        if batch_count > 1:
+            print(f"📦 GPT 검토 후보 {len(review_indices)}개를 {batch_count}번에 나눠 검사")
+        for start in range(0, len(review_indices), GPT_REVIEW_BATCH):
+            batch_indices = review_indices[start:start + GPT_REVIEW_BATCH]
+            past_indices = sorted({
+                hist_idx
+                for idx in batch_indices
+                for hist_idx, _ in local['borderline'].get(idx, [])
+            })
+            past_news = [comparable[hist_idx] for hist_idx in past_indices] + legacy
+            if not past_news:
+                continue
+            
+            review_news = [new_news_list[idx] for idx in batch_indices]
+            duplicate_numbers = self._check_duplicate_with_gpt(review_news, past_news)
+            duplicate_indices.update(
+                batch_indices[number - 1]
+                for number in duplicate_numbers
+                if isinstance(number, int) and 1 <= number <= len(batch_indices)
+            )
+        
+        if not duplicate_indices:
+            print(f"✅ 유사 주제 없음 - 모든 뉴스 유지")
+            return new_news_list
+        
+        filtered = [news for idx, news in enumerate(new_news_list) if idx not in duplicate_indices]
+        print(f"🔄 유사 주제 발견: {len(duplicate_indices)}개 뉴스 제거")
+        print(f"📊 중복 제거 후: {len(filtered)}개 뉴스")
+        return filtered
+    
+    def _find_archive_matches(self, news_list: List[Dict], known_news: List[Dict]) -> List[Dict]:
+        """LSH 인덱스로 보관 기간 전체에서 비슷한 과거 뉴스 조회"""
+        try:
+            # 인덱스에 없는 기록(마이그레이션/다른 프로세스 저장분) 먼저 반영
+            self.similarity_index.index_pending()
+            
+            known_ids = {news.get('id') for news in known_news}
+            match_ids = set()
+            for news in news_list:
+                for news_id, _ in self.similarity_index.query(news):
+                    if news_id not in known_ids:
+                        match_ids.add(news_id)
+            
+            matched = self.sent_news_store.get_many(sorted(match_ids))
+            if matched:
+                print(f"🗂️ 보관 기록에서 비슷한 과거 뉴스 {len(matched)}개 발견 (LSH 인덱스)")
+            return matched
+        except Exception as e:
+            print(f"⚠️ 유사도 인덱스 조회 실패: {e}")
+            return []
+    
+    def _check_duplicate_with_gpt(self, new_news_list: List[Dict], past_news: List[Dict]) -> List[int]:
+        """GPT로 새 뉴스와 과거 뉴스의 주제 중복 판정 (중복인 새 뉴스 번호 반환)"""
+        # 비교 대상 과거 뉴스 정보 (전송 시각 + 제목 + 요약) - LSH 조회분은 보관 기간 전체라 수개월 전 기사일 수 있음
         past_news_summary = "\n\n".join([
-            f"[과거 뉴스 {idx+1}] 제목: {news.get('title', '')}\n요약: {news.get('summary', '')[:200]}"
-            for idx, news in enumerate(history['sent_news'][-30:])  # 최근 30개만
+            f"[과거 뉴스 {idx+1}] 전송: {news.get('sent_at', '')[:16].replace('T', ' ')}\n"
+            f"제목: {news.get('title', '')}\n요약: {news.get('summary', '')[:200]}"
+            for idx, news in enumerate(past_news)
         ])
         
         # 새로운 뉴스 정보
         new_news_summary = "\n\n".join([
             f"[새 뉴스 {idx+1}] 제목: {news.get('title', '')}\n요약: {news.get('summary', '')[:200]}"
-            for idx, news in enumerate(new_news_list[:50])  # 최대 50개
+            for idx, news in enumerate(new_news_list)
         ])
         
-        prompt = f"""다음은 최근 7일 이내에 이미 전송된 뉴스들입니다:
+        prompt = f"""다음은 이미 전송된 과거 뉴스들입니다 (각 뉴스의 전송 시각 포함):
 
 {past_news_summary}
 
@@ -136,6 +222,7 @@ class USStockNewsSummary:
 - 같은 기업/인물이 나와도 **다른 사건**이면 중복 아님
 - 주가 뉴스는 **같은 날짜, 같은 가격대**만 중복
 - 후속 보도나 새로운 진전이 있으면 중복 아님
+- 과거 뉴스의 전송 시각을 확인해, 오래전 사건과 같은 주제라도 **새로 일어난 사건**이면 중복 아님
 
 **응답 형식** (JSON만):
 {{
@@ -145,15 +232,11 @@ class USStockNewsSummary:
 JSON만 출력하세요."""
 
         try:
-            print(f"🤖 GPT로 중복 주제 검사 중... (새 뉴스 {len(new_news_list[:50])}개 vs 과거 {len(history['sent_news'][-30:])}개)")
+            print(f"🤖 GPT로 애매한 후보 중복 검사 중... (새 뉴스 {len(new_news_list)}개 vs 과거 {len(past_news)}개)")
             
-            response = requests.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers={
-                    'Authorization': f'Bearer {self.openai_api_key}',
-                    'Content-Type': 'application/json'
-                },
-                json={
+            response = llm_cache.chat_completion(
+                self.openai_api_key,
+                {
                     'model': 'gpt-4o-mini',
                     'messages': [
                         {'role': 'system', 'content': '당신은 뉴스 중복 검사 전문가입니다. JSON 형식으로만 응답하세요.'},
@@ -167,7 +250,7 @@ JSON만 출력하세요."""
             
             if response.status_code != 200:
                 print(f"⚠️ GPT 중복 검사 실패: {response.status_code}")
-                return new_news_list
+                return []
             
             result = response.json()
             response_text = result['choices'][0]['message']['content']
@@ -183,114 +266,102 @@ JSON만 출력하세요."""
                 response_text = response_text[json_start:json_end].strip()
             
             duplicate_check = json.loads(response_text)
-            duplicate_numbers = duplicate_check.get('duplicate_news_numbers', [])
-            
-            if duplicate_numbers:
-                print(f"🔄 유사 주제 발견: {len(duplicate_numbers)}개 뉴스 제거")
-                # 중복 번호에 해당하지 않는 뉴스만 반환
-                filtered = [
-                    news for idx, news in enumerate(new_news_list[:50]) 
-                    if (idx + 1) not in duplicate_numbers
-                ]
-                filtered.extend(new_news_list[50:])
-                
-                print(f"📊 중복 제거 후: {len(filtered)}개 뉴스")
-                return filtered
-            else:
-                print(f"✅ 유사 주제 없음 - 모든 뉴스 유지")
-                return new_news_list
+            return duplicate_check.get('duplicate_news_numbers', [])
             
         except Exception as e:
             print(f"⚠️ GPT 중복 검사 오류: {e}")
-            return new_news_list
+            return []
     
     def _mark_news_as_sent(self, news_list: List[Dict]):
         """뉴스를 전송됨으로 표시"""
-        history = self._load_sent_news_history()
-        history = self._clean_old_history(history)
+        try:
+            saved_ids = self.sent_news_store.append(news_list)
+            print(f"✅ {len(saved_ids)}개 뉴스 전송 기록 저장")
+        except Exception as e:
+            print(f"⚠️ 전송 기록 저장 실패: {e}")
+            return
         
-        current_time = datetime.now().isoformat()
+        # 유사도/지문 인덱스 증분 갱신
+        try:
+            self.similarity_index.index_pending()
+            self.fingerprint_index.index_pending()
+        except Exception as e:
+            print(f"⚠️ 유사도 인덱스 갱신 실패: {e}")
+        
+        # 오늘 일별 롤업 갱신 (주간/월간 분석 입력)
+        try:
+            digest = self.daily_rollups.update(datetime.now().date())
+            print(f"🧮 일별 롤업 갱신: {digest['day']} 뉴스 {digest['news_count']}개, 대표 이슈 {len(digest['stories'])}개")
+        except Exception as e:
+            print(f"⚠️ 일별 롤업 갱신 실패: {e}")
+        
+        # 3년 이상 지난 기록 정리 (하루 한 번, 백그라운드)
+        self.sent_news_store.prune_in_background()
+    
+    def _remove_exact_duplicates(self, news_list: List[Dict]) -> List[Dict]:
+        """같은 기사의 다른 URL(추적 파라미터, AMP/모바일)과 같은 제목(매체 전재) 제거
+        (짧은 제목은 전송 기록 비교와 마찬가지로 수집분 안에서도 URL로만 비교)
         
+        지문 집합/인덱스 조회만 하므로 후보 수에 비례하는 시간으로 끝남 (GPT 호출 없음)
+        """
+        seen = set()
+        unique_news = []
         for news in news_list:
-            history['sent_news'].append({
-                'title': news['title'],
-                'link': news['link'],
-                'summary': news['summary'],
-                'sent_at': current_time
-            })
+            fingerprints = {fp for fp in comparable_fingerprints(news).values() if fp is not None}
+            if fingerprints & seen:
+                continue
+            seen |= fingerprints
+            unique_news.append(news)
+        
+        within_run = len(news_list) - len(unique_news)
+        try:
+            self.fingerprint_index.index_pending()
+            sent_indices = set(self.fingerprint_index.sent_before(unique_news))
+        except Exception as e:
+            print(f"⚠️ 지문 인덱스 조회 실패: {e}")
+            sent_indices = set()
+        unique_news = [news for idx, news in enumerate(unique_news) if idx not in sent_indices]
         
-        self._save_sent_news_history(history)
-        print(f"✅ {len(news_list)}개 뉴스 전송 기록 저장")
+        if within_run or sent_indices:
+            print(f"🔄 정확한 중복 제거: 수집분 내 {within_run}개, 전송 기록과 동일 {len(sent_indices)}개 (URL/제목 지문)")
+        return unique_news
     
-    def fetch_rss_news(self, hours: int = 12) -> List[Dict]:
-        """RSS 피드에서 뉴스 수집"""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        all_news = []
-        
-        print(f"📰 뉴스 수집 시작 (최근 {hours}시간)")
-        print(f"   기준 시간: {cutoff_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-        
-        for source_name, feed_url in self.rss_feeds.items():
-            try:
-                print(f"🔍 {source_name} 수집 중...", end=" ")
-                feed = feedparser.parse(feed_url)
-                count = 0
-                
-                for entry in feed.entries[:30]:  # 최대 30개
-                    try:
-                        # 발행 시간 파싱
-                        pub_date = None
-                        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                            pub_date = datetime(*entry.published_parsed[:6])
-                        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                            pub_date = datetime(*entry.updated_parsed[:6])
-                        
-                        # 시간 필터
-                        if pub_date and pub_date < cutoff_time:
-                            continue
-                        
-                        # 제목과 링크 필수
-                        title = entry.get('title', '').strip()
-                        link = entry.get('link', '').strip()
-                        
-                        if not title or not link:
-                            continue
-                        
-                        # 요약문 (description 또는 summary)
-                        summary = entry.get('summary', entry.get('description', ''))[:500]
-                        
-                        all_news.append({
-                            'title': title,
-                            'link': link,
-                            'summary': summary,
-                            'source': source_name,
-                            'published': pub_date.isoformat() if pub_date else None
-                        })
-                        count += 1
-                    
-                    except Exception as e:
-                        continue
-                
-                print(f"✅ {count}개")
-            
-            except Exception as e:
-                print(f"❌ 실패: {e}")
+    def fetch_rss_news(self, hours: int = 12, exclude_links: set = None) -> List[Dict]:
+        """최근 hours시간 뉴스 중 지난 브리프 이후 새로 수집된 것 (상시 수집된 로컬 저장소 조회)
         
-        print(f"\n📊 총 수집: {len(all_news)}개 뉴스\n")
+        Args:
+            exclude_links: 이미 후보에 있는 뉴스 링크 (발송 직전 보충 수집 시 중복 검사 생략)
         
-        # 중복 제거 (제목 기준)
-        seen_titles = set()
-        unique_news = []
+        조회한 마지막 항목 id는 self.collected_cursor에 남김 (브리프 전송 후 커서 이동)
+        """
+        # 발행 시각은 UTC로 저장되므로 기준 시각도 UTC로 계산
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+        brief_cursor = self.ingestor.store.brief_cursor()
+        
+        print(f"📰 뉴스 수집 시작 (최근 {hours}시간, 지난 브리프 이후 수집분)")
+        print(f"   기준 시간: {cutoff_time.astimezone().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        
+        # 폴링 주기가 지난 피드만 수집 (백그라운드 수집 중이면 대부분 생략)
+        started = time.monotonic()
+        polled = self.ingestor.poll(budget=self.feed_collect_budget, verbose=True)
+        if polled:
+            print(f"⏱️ 피드 폴링 {len(polled)}개: {time.monotonic() - started:.1f}초")
+        
+        # 로컬 저장소 조회
+        started = time.monotonic()
+        all_news = self.ingestor.store.recent(cutoff_time, after_id=brief_cursor)
+        self.collected_cursor = max([brief_cursor] + [news['ingest_id'] for news in all_news])
+        print(f"🗄️ 로컬 뉴스 저장소 조회: {(time.monotonic() - started) * 1000:.1f}ms")
+        # 수집 시 요약 정규화(HTML/상투 문구 제거)로 줄어든 프롬프트 토큰
+        print(f"🧹 요약 정규화: {describe_token_savings(all_news)}")
+        
+        print(f"\n📊 총 수집: {len(all_news)}개 뉴스\n")
         
-        for news in all_news:
-            title_lower = news['title'].lower()
-            if title_lower not in seen_titles:
-                seen_titles.add(title_lower)
-                unique_news.append(news)
+        # 정확한 중복 제거 (정규화 URL/제목 지문 - 이번 수집분 안에서, 그리고 전송 기록과)
+        unique_news = self._remove_exact_duplicates(all_news)
         
-        removed = len(all_news) - len(unique_news)
-        if removed > 0:
-            print(f"🔄 중복 제거: {removed}개 (제목 기준)")
+        if exclude_links:
+            unique_news = [news for news in unique_news if news['link'] not in exclude_links]
         
         print(f"📊 최종 수집: {len(unique_news)}개 뉴스\n")
         
@@ -305,11 +376,25 @@ JSON만 출력하세요."""
         if not news_list:
             return []
         
-        # 뉴스 목록을 GPT에 전달할 형식으로 변환
-        news_text = "\n\n".join([
-            f"[뉴스 {idx+1}]\n제목: {news['title']}\n출처: {news['source']}\n링크: {news['link']}\n내용: {news['summary'][:300]}"
-            for idx, news in enumerate(news_list[:100])  # 최대 100개
-        ])
+        # 로컬 점수로 후보 축소 (출처, 최신성, 종목 언급, 거시 키워드, 동시 보도)
+        candidate_count = len(news_list)
+        news_list = self.news_ranker.select_top(news_list, self.prerank_top_k)
+        print(f"📐 사전 순위: {candidate_count}개 중 상위 {len(news_list)}개를 GPT에 전달")
+        for news in news_list[:5]:
+            signals = ', '.join(f"{name} {value:.2f}" for name, value in news['prerank_signals'].items())
+            print(f"   {news['prerank_score']:5.1f}점 [{news['source']}] {news['title'][:60]} ({signals})")
+        
+        # 뉴스 목록을 토큰 예산 안에서 GPT에 전달할 형식으로 변환
+        packed = pack_news(
+            news_list,
+            lambda number, news: f"[뉴스 {number}]\n제목: {news['title']}\n출처: {news['source']}\n링크: {news['link']}\n내용: {news['summary']}",
+            token_budget=self.prompt_token_budget,
+            day_of=lambda news: (news.get('published') or '')[:10]
+        )
+        news_list = [news_list[idx] for idx in packed['indices']]
+        news_text = packed['text']
+        print(f"🧾 프롬프트 패킹: {len(news_list)}개, 약 {packed['tokens']} 토큰 "
+              f"(요약 {packed['summary_chars']}자, 예산 초과 제외 {packed['dropped']}개)")
         
         prompt = f"""당신은 해외주식 투자자를 위한 뉴스 큐레이터입니다.
 
@@ -348,13 +433,9 @@ JSON만 출력하세요."""
         try:
             print(f"🤖 GPT로 중요 뉴스 {top_n}개 선별 중...\n")
             
-            response = requests.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers={
-                    'Authorization': f'Bearer {self.openai_api_key}',
-                    'Content-Type': 'application/json'
-                },
-                json={
+            response = llm_cache.chat_completion(
+                self.openai_api_key,
+                {
                     'model': 'gpt-4o-mini',
                     'messages': [
                         {'role': 'system', 'content': '당신은 금융 뉴스 전문 애널리스트입니다. JSON 형식으로만 응답하세요.'},
@@ -397,7 +478,10 @@ JSON만 출력하세요."""
                         'summary': item['summary'],
                         'link': original_news['link'],
                         'source': original_news['source'],
-                        'importance': item.get('importance_score', 0)
+                        'importance': item.get('importance_score', 0),
+                        # 다음 실행의 로컬 중복 검사용 원문
+                        'original_title': original_news['title'],
+                        'original_summary': original_news['summary']
                     })
             
             print(f"✅ {len(top_news)}개 중요 뉴스 선별 완료\n")
@@ -411,20 +495,21 @@ JSON만 출력하세요."""
             print(f"❌ GPT 분석 오류: {e}")
             return []
     
-    def format_summary_message(self, news_list: List[Dict], time_of_day: str = None) -> str:
-        """텔레그램 메시지 포맷 (MarkdownV2)"""
-        from datetime import timezone, timedelta
+    def format_summary_message(self, news_list: List[Dict], time_of_day: str = None,
+                               send_at: datetime = None) -> List[str]:
+        """텔레그램 메시지 포맷 (MarkdownV2)
         
-        def escape_markdown(text: str) -> str:
-            """MarkdownV2 특수문자 이스케이프"""
-            special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-            for char in special_chars:
-                text = text.replace(char, f'\\{char}')
-            return text
+        Args:
+            send_at: 발송 예정 시각 (미리 준비한 브리프도 헤더에 발송 시각 표시, 기본: 지금)
+        
+        Returns:
+            블록 목록 (헤더, 뉴스 항목별 블록, 푸터) - 분할은 항목 경계에서만
+        """
+        from datetime import timezone, timedelta
         
         # 시간대 자동 판단
         if time_of_day is None:
-            current_hour = datetime.now().hour
+            current_hour = (send_at or datetime.now()).hour
             time_of_day = 'morning' if current_hour < 12 else 'evening'
         
         # 헤더 설정
@@ -437,7 +522,7 @@ JSON만 출력하세요."""
         
         # 한국 시간 (KST = UTC+9)
         kst = timezone(timedelta(hours=9))
-        now_kst = datetime.now(kst)
+        now_kst = send_at.astimezone(kst) if send_at else datetime.now(kst)
         kst_time = now_kst.strftime('%Y\\-%m\\-%d %H:%M')
         
         # 미국 동부 시간 (EST/EDT)
@@ -458,7 +543,7 @@ JSON만 출력하세요."""
         now_us = now_kst.astimezone(us_et)
         us_time = now_us.strftime('%H:%M')
         
-        message = f"""{header}
+        header_block = f"""{header}
 _{subheader}_
 
 📅 {kst_time} KST \\| {escape_markdown(us_time)} {escape_markdown(us_tz_name)}
@@ -467,159 +552,106 @@ _{subheader}_
 
 """
         
-        # 뉴스 목록
+        blocks = [header_block]
+        
+        # 뉴스 목록 (뉴스 하나가 블록 하나)
         for idx, news in enumerate(news_list, 1):
-            title = news['title']
-            summary = news['summary']
-            link = news['link']
-            
-            # 이스케이프 적용
-            title_escaped = escape_markdown(title)
-            summary_escaped = escape_markdown(summary)
-            
-            message += f"""{idx}\\. *{title_escaped}*
->{summary_escaped} [원문]({link})
+            block = f"""{idx}\\. *{escape_markdown(news['title'])}*
+>{escape_markdown(news['summary'])} [원문]({escape_link(news['link'])})
 
 """
             
             # 마지막 뉴스가 아니면 빈 줄 추가
             if idx < len(news_list):
-                message += "\n"
+                block += "\n"
+            blocks.append(block)
         
         # 푸터
-        message += f"""━━━━━━━━━━━━━━━━━━━━
+        blocks.append(f"""━━━━━━━━━━━━━━━━━━━━
 총 {len(news_list)}개 주요 뉴스
 
 해외주식 & 매크로 소식 자동 포워딩 문의👇
-📧 contact@aqresearch\\.com"""
+📧 contact@aqresearch\\.com""")
         
-        return message
+        return blocks
     
-    def send_telegram_message(self, message: str, photo_url: str = None):
-        """텔레그램으로 메시지 전송 (여러 채팅방 지원)"""
-        import time
+    def _broadcast_with_header_image(self, photo_url: str, caption: str, fallback: Dict) -> Dict[str, Dict]:
+        """이미지 + 캡션 전송
         
-        success_count = 0
-        fail_count = 0
-        
-        for chat_idx, chat_id in enumerate(self.telegram_chat_ids, 1):
-            print(f"\n📤 [{chat_idx}/{len(self.telegram_chat_ids)}] 채팅방 {chat_id}에 전송 중...")
-            
-            # 1. 이미지가 있으면 이미지 + 텍스트를 한 메시지로 전송
-            if photo_url:
-                print(f"📸 헤더 이미지 + 뉴스 통합 전송 시도: {photo_url[:50]}...")
-                
-                photo_url_api = f"https://api.telegram.org/bot{self.telegram_token}/sendPhoto"
-                
-                max_caption_length = 1000
-                
-                if len(message) <= max_caption_length:
-                    # 짧으면 한 번에 전송
-                    if photo_url.startswith('http'):
-                        photo_payload = {
-                            'chat_id': chat_id,
-                            'photo': photo_url,
-                            'caption': message,
-                            'parse_mode': 'MarkdownV2',
-                            'disable_web_page_preview': True
-                        }
-                    else:
-                        photo_payload = {
-                            'chat_id': chat_id,
-                            'photo': photo_url,
-                            'caption': message,
-                            'parse_mode': 'MarkdownV2',
-                            'disable_web_page_preview': True
-                        }
-                    
-                    try:
-                        response = requests.post(photo_url_api, json=photo_payload, timeout=30)
-                        
-                        if response.status_code == 200:
-                            print(f"✅ 채팅방 {chat_id}: 이미지 + 뉴스 통합 전송 성공")
-                            success_count += 1
-                            # 다음 채팅방 전송 전 대기 (API 제한 방지)
-                            if chat_idx < len(self.telegram_chat_ids):
-                                time.sleep(1)
-                            continue
-                        else:
-                            print(f"⚠️ 채팅방 {chat_id}: 통합 전송 실패 - {response.text}")
-                            
-                    except Exception as e:
-                        print(f"⚠️ 채팅방 {chat_id}: 통합 전송 오류 - {e}")
-            
-            # 2. 텍스트 메시지 전송
-            url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
-            
-            if photo_url and len(message) <= 1000:
-                continue
-            
-            # 메시지가 너무 길면 분할 (4096자 제한)
-            max_length = 4000
-            
-            if len(message) <= max_length:
-                messages = [message]
-            else:
-                parts = message.split('\n\n')
-                messages = []
-                current = parts[0] + "\n\n"
-                
-                for part in parts[1:]:
-                    if len(current) + len(part) < max_length:
-                        current += part + "\n\n"
-                    else:
-                        messages.append(current)
-                        current = part + "\n\n"
-                
-                if current:
-                    messages.append(current)
-            
-            chat_success = True
-            for idx, msg in enumerate(messages):
-                payload = {
-                    'chat_id': chat_id,
-                    'text': msg,
-                    'parse_mode': 'MarkdownV2',
-                    'disable_web_page_preview': True
-                }
-                
-                try:
-                    response = requests.post(url, json=payload, timeout=10)
-                    if response.status_code == 200:
-                        print(f"✅ 채팅방 {chat_id}: 메시지 {idx+1}/{len(messages)} 전송 성공")
-                    else:
-                        print(f"❌ 채팅방 {chat_id}: 전송 실패 - {response.text}")
-                        chat_success = False
-                except Exception as e:
-                    print(f"❌ 채팅방 {chat_id}: 전송 오류 - {e}")
-                    chat_success = False
-                
-                # 분할 메시지 간 짧은 대기
-                if idx < len(messages) - 1:
-                    time.sleep(0.5)
-            
-            if chat_success:
-                success_count += 1
-            else:
-                fail_count += 1
-            
-            # 다음 채팅방 전송 전 대기 (API 제한 방지)
-            if chat_idx < len(self.telegram_chat_ids):
-                time.sleep(5)  # 채팅방 간 5초 간격
+        http URL 이미지는 첫 채팅방에 먼저 보내 file_id를 얻고 나머지 채팅방은 file_id로 전송
+        (캐시된 file_id가 있으면 첫 채팅방부터 사용, 텔레그램이 거부하면 캐시 무효화 후 URL로)
+        """
+        if not photo_url.startswith('http'):
+            # 이미 file_id
+            return self.delivery.broadcast(
+                self.telegram_chat_ids, [photo_part(photo_url, caption, fallback=fallback)], label='daily'
+            )
         
-        print(f"\n📊 전송 결과: 성공 {success_count}개, 실패 {fail_count}개 (총 {len(self.telegram_chat_ids)}개 채팅방)")
+        cached_file_id, version = self.header_images.lookup(photo_url)
+        photo = cached_file_id or photo_url
+        print(f"🖼️ 헤더 이미지: {'캐시된 file_id 사용' if cached_file_id else 'URL로 첫 업로드'}")
+        
+        first_chat, other_chats = self.telegram_chat_ids[:1], self.telegram_chat_ids[1:]
+        results = self.delivery.broadcast(first_chat, [photo_part(photo, caption, fallback=fallback)], label='daily')
+        
+        first_result = results.get(first_chat[0]) if first_chat else None
+        file_id = photo_file_id(first_result)
+        if file_id:
+            if file_id != cached_file_id:
+                self.header_images.store(photo_url, file_id, version)
+                print(f"💾 헤더 이미지 file_id 저장 - 이후 채팅방/실행에서 재사용")
+            photo = file_id
+        elif first_result and first_result['ok'] and cached_file_id:
+            # 텍스트 대체 전송으로 성공 = 캐시된 file_id 거부
+            self.header_images.invalidate(photo_url)
+            photo = photo_url
+        
+        if other_chats:
+            results.update(self.delivery.broadcast(
+                other_chats, [photo_part(photo, caption, fallback=fallback)], label='daily'
+            ))
+        return results
     
-    def run(self, hours: int = 12, top_n: int = 10, header_image_url: str = None, time_of_day: str = None):
-        """실행
+    def send_telegram_message(self, blocks: List[str], photo_url: str = None):
+        """텔레그램으로 메시지 전송 (여러 채팅방 동시 전송, 텔레그램 전송 제한 준수)
         
         Args:
-            hours: 수집할 뉴스 시간 범위
-            top_n: 선별할 뉴스 개수
-            header_image_url: 헤더 이미지 URL
-            time_of_day: 'morning', 'evening', None (자동)
+            blocks: format_summary_message()의 블록 목록
+        
+        Returns:
+            (전송에 성공한 채팅방 수, 실패했지만 아웃박스에서 재전송 예정인 채팅방 수)
+        """
+        message = ''.join(blocks)
+        
+        # 메시지가 너무 길면 뉴스 항목 경계에서 분할 (브리프당 한 번 - 모든 채팅방/재시도에 재사용)
+        messages = split_blocks(blocks)
+        
+        text_parts = [message_part(msg) for msg in messages]
+        
+        # 이미지가 있고 캡션 길이 안이면 이미지 + 텍스트를 한 메시지로 (실패하면 텍스트만)
+        max_caption_length = 1000
+        # 실패한 채팅방은 아웃박스에 남아 스케줄러가 재전송
+        if photo_url and len(message) <= max_caption_length:
+            print(f"📸 헤더 이미지 + 뉴스 통합 전송: {photo_url[:50]}...")
+            results = self._broadcast_with_header_image(photo_url, message, text_parts[0])
+        else:
+            results = self.delivery.broadcast(self.telegram_chat_ids, text_parts, label='daily')
+        
+        delivered = sum(1 for result in results.values() if result['ok'])
+        queued = sum(1 for result in results.values() if result['queued'])
+        return delivered, queued
+    
+    def prepare_brief(self, hours: int = 12, top_n: int = 10, time_of_day: str = None,
+                      send_at: datetime = None) -> Optional[Dict]:
+        """브리프 준비 (수집 → 중복 검사 → GPT 선별 → 렌더링) - 발송은 deliver_brief
+        
+        Returns:
+            {'candidates', 'top_news', 'blocks', 'time_of_day', 'send_at', 'prepared_at'}, 뉴스가 없으면 None
         """
         print(f"\n{'='*50}")
-        print(f"🚀 해외주식 뉴스 {hours}시간 요약 시작 (GPT-4o-mini)")
+        print(f"🚀 해외주식 뉴스 {hours}시간 요약 준비 시작 (GPT-4o-mini)")
+        if send_at:
+            print(f"   발송 예정: {send_at.strftime('%Y-%m-%d %H:%M')}")
         print(f"{'='*50}\n")
         
         # 1. 뉴스 수집
@@ -627,28 +659,106 @@ _{subheader}_
         
         if not news_list:
             print("❌ 수집된 뉴스가 없습니다.")
-            return
+            return None
         
         # 2. 중요 뉴스 선별
         top_news = self.analyze_and_select_top_news(news_list, top_n=top_n)
         
         if not top_news:
             print("❌ 선별된 뉴스가 없습니다.")
-            return
+            return None
         
         # 3. 요약 메시지 생성
-        summary = self.format_summary_message(top_news, time_of_day=time_of_day)
+        return {
+            'candidates': news_list,
+            'cursor': self.collected_cursor,
+            'top_news': top_news,
+            'blocks': self.format_summary_message(top_news, time_of_day=time_of_day, send_at=send_at),
+            'time_of_day': time_of_day,
+            'send_at': send_at,
+            'prepared_at': datetime.now()
+        }
+    
+    def top_up_brief(self, brief: Dict, hours: int = 12, top_n: int = 10) -> Dict:
+        """발송 직전 보충 - 준비 이후 새로 올라온 뉴스가 있으면 기존 후보와 합쳐 다시 선별
+        
+        Returns:
+            갱신된 브리프 (새 뉴스가 없거나 선별에 실패하면 기존 브리프 그대로)
+        """
+        print(f"🔁 발송 직전 보충 수집 (준비 시각 {brief['prepared_at'].strftime('%H:%M:%S')} 이후 새 뉴스)\n")
+        fresh_news = self.fetch_rss_news(
+            hours=hours,
+            exclude_links={news['link'] for news in brief['candidates']}
+        )
+        if not fresh_news:
+            print("💤 새 뉴스 없음 - 준비한 브리프 그대로 발송\n")
+            return brief
+        
+        print(f"➕ 새 뉴스 {len(fresh_news)}개 - 다시 선별\n")
+        candidates = brief['candidates'] + fresh_news
+        top_news = self.analyze_and_select_top_news(candidates, top_n=top_n)
+        if not top_news:
+            print("⚠️ 보충 선별 실패 - 준비한 브리프 그대로 발송\n")
+            return brief
+        
+        return dict(
+            brief,
+            candidates=candidates,
+            cursor=self.collected_cursor,
+            top_news=top_news,
+            blocks=self.format_summary_message(top_news, time_of_day=brief['time_of_day'], send_at=brief['send_at']),
+            prepared_at=datetime.now()
+        )
+    
+    def deliver_brief(self, brief: Dict, header_image_url: str = None) -> bool:
+        """준비한 브리프 발송 + 전송 기록
+        
+        아웃박스에 재전송 대기로 남은 채팅방도 전송된 것으로 봄 (아웃박스가 끝까지 재전송하므로
+        같은 시간대 브리프를 다시 만들면 구독자가 브리프를 두 번 받게 됨)
         
+        Returns:
+            한 곳 이상의 채팅방에 전송했거나 재전송 대기 중이면 True
+        """
         # 4. 텔레그램 전송
         print("📤 텔레그램 전송 중...\n")
-        self.send_telegram_message(summary, photo_url=header_image_url)
-        
-        # 5. 전송된 뉴스 기록
-        self._mark_news_as_sent(top_news)
+        delivered, queued = self.send_telegram_message(brief['blocks'], photo_url=header_image_url)
+        accepted = delivered + queued > 0
+        
+        # 5. 전송된 뉴스 기록 + 이번 브리프가 검토한 항목까지 커서 이동 (모든 채팅방이 dead-letter면 기록하지 않음)
+        top_news = brief['top_news']
+        if accepted:
+            self._mark_news_as_sent(top_news)
+            self.ingestor.store.set_brief_cursor(brief['cursor'])
+        if queued:
+            print(f"📮 {queued}개 채팅방은 아웃박스에서 재전송 예정")
+        
+        # GPT 응답 캐시 통계
+        cache_stats = llm_cache.get_cache().stats()
+        print(f"💾 GPT 응답 캐시: 이번 실행 적중 {cache_stats['hits']} / 미스 {cache_stats['misses']} "
+              f"(누적 적중 {cache_stats['total_hits']} / 미스 {cache_stats['total_misses']}, {cache_stats['entries']}개 저장)")
         
         print(f"\n{'='*50}")
-        print(f"✅ 완료: {len(top_news)}개 뉴스 요약 전송")
+        print(f"✅ 완료: {len(top_news)}개 뉴스 요약 전송" if accepted else "❌ 모든 채팅방 전송 실패 - 전송 기록 안 함")
         print(f"{'='*50}\n")
+        
+        return accepted
+    
+    def run(self, hours: int = 12, top_n: int = 10, header_image_url: str = None, time_of_day: str = None):
+        """실행 (준비 후 바로 발송)
+        
+        Args:
+            hours: 수집할 뉴스 시간 범위
+            top_n: 선별할 뉴스 개수
+            header_image_url: 헤더 이미지 URL
+            time_of_day: 'morning', 'evening', None (자동)
+        
+        Returns:
+            한 곳 이상의 채팅방에 전송했거나 재전송 대기 중이면 True
+        """
+        brief = self.prepare_brief(hours=hours, top_n=top_n, time_of_day=time_of_day)
+        if not brief:
+            return False
+        return self.deliver_brief(brief, header_image_url=header_image_url)
 
 def main():
     """메인 실행 함수"""
@@ -667,6 +777,17 @@ def main():
         print("  - HEADER_IMAGE_URL (선택사항)")
         return
     
+    # 이미 전송한 윈도우면 건너뜀 (--force 로 강제 실행)
+    ledger = RunLedger('/data/run_ledger.json')
+    window, time_of_day = daily_window(
+        datetime.now(),
+        os.getenv('MORNING_TIME', '08:00'),
+        os.getenv('EVENING_TIME', '22:00')
+    )
+    if '--force' not in sys.argv and ledger.is_delivered('daily', window):
+        print(f"⏭️ {window} 브리프는 이미 전송됨 - 건너뜀 (강제 실행: --force)")
+        return
+    
     bot = USStockNewsSummary(
         telegram_token=telegram_token,
         telegram_chat_ids=telegram_chat_ids,
@@ -674,7 +795,8 @@ def main():
     )
     
     # 12시간, 상위 10개 뉴스
-    bot.run(hours=12, top_n=10, header_image_url=header_image_url)
+    if bot.run(hours=12, top_n=10, header_image_url=header_image_url, time_of_day=time_of_day):
+        ledger.mark_delivered('daily', window, trigger='manual')
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+토큰 예산 기반 프롬프트 패커 (뉴스 목록 → 예산 안의 프롬프트 텍스트)
+- 로컬에서 토큰 수를 세어 설정한 예산 안에서 뉴스 목록을 채움
+- 날짜(최신 우선) × 출처 라운드로빈으로 고르게 샘플링 → 최근 뉴스가 잘리지 않음
+- 예산을 넘으면 요약 길이를 단계적으로 줄이고, 그래도 넘으면 우선순위 낮은 항목 제외
+"""
+
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, List, Dict
+
+# tiktoken 인코더 로드 대기 시간 (초) - 처음 쓸 때 BPE 파일을 내려받으므로 넘으면 근사치 사용
+ENCODING_LOAD_TIMEOUT = 10
+
+# 요약을 이 이상 줄이면 선별 근거가 사라지므로 그 뒤로는 항목을 제외
+SUMMARY_STEPS = (300, 200, 150, 100)
+
+_encoding = None
+_encoding_loader = None
+_encoding_lock = threading.Lock()
+
+
+def _load_encoding():
+    global _encoding
+    try:
+        import tiktoken
+        _encoding = tiktoken.get_encoding('o200k_base')
+    except Exception as e:
+        print(f"⚠️ tiktoken 인코더 로드 실패 - 토큰 수 근사치 사용: {e}")
+
+
+def _get_encoding():
+    """tiktoken 인코더 (처음 호출 시 백그라운드 로드, 제한 시간 안에 못 받으면 None)
+
+    import 시점에는 로드하지 않음 - 네트워크 다운로드가 멈춰도 모듈 import/스케줄러가 막히지 않음
+    """
+    global _encoding_loader
+    with _encoding_lock:
+        if _encoding_loader is None:
+            _encoding_loader = threading.Thread(target=_load_encoding, name='tiktoken-load', daemon=True)
+            _encoding_loader.start()
+            _encoding_loader.join(ENCODING_LOAD_TIMEOUT)
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 (tiktoken이 없거나 로드 전이면 영문 약 4자/토큰, 한글 등 비ASCII 약 1자/토큰으로 근사)"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def stratified_order(items: List[Dict], day_of: Callable[[Dict], str], source_of: Callable[[Dict], str]) -> List[int]:
+    """날짜(최신 우선)와 출처를 번갈아 가며 뽑은 우선순위 (items 인덱스 목록)
+
+    한 바퀴에 날짜마다 한 개씩, 날짜 안에서는 출처를 돌아가며 선택
+    같은 날짜/출처 안에서는 입력 순서 유지
+    """
+    days = OrderedDict()
+    for idx, item in enumerate(items):
+        sources = days.setdefault(day_of(item) or '', OrderedDict())
+        sources.setdefault(source_of(item) or '', deque()).append(idx)
+
+    # 최신 날짜부터 (날짜 없는 항목은 마지막)
+    day_order = sorted((day for day in days if day), reverse=True) + ([''] if '' in days else [])
+    source_cycles = {day: deque(days[day].keys()) for day in day_order}
+
+    order = []
+    remaining = len(items)
+    while remaining:
+        for day in day_order:
+            cycle = source_cycles[day]
+            while cycle:
+                source = cycle.popleft()
+                queue = days[day][source]
+                if queue:
+                    order.append(queue.popleft())
+                    remaining -= 1
+                    if queue:
+                        cycle.append(source)
+                    break
+    return order
+
+
+def pack_news(items: List[Dict], render: Callable[[int, Dict], str], token_budget: int,
+              day_of: Callable[[Dict], str], source_of: Callable[[Dict], str] = lambda item: item.get('source'),
+              summary_steps=SUMMARY_STEPS, separator: str = "\n\n") -> Dict:
+    """토큰 예산에 맞춰 뉴스 목록을 프롬프트 텍스트로 구성
+
+    Args:
+        render: (번호, 뉴스) → 프롬프트 한 항목 문자열 (뉴스의 'summary'는 잘린 값으로 전달)
+        token_budget: 뉴스 목록 부분에 허용할 토큰 수
+        day_of / source_of: 층화 샘플링 기준
+
+    Returns:
+        {
+            'items': 선택된 뉴스 (원래 순서, summary 잘림 적용된 복사본),
+            'indices': 선택된 뉴스의 원래 인덱스,
+            'text': 프롬프트 텍스트,
+            'tokens': 추정 토큰 수,
+            'summary_chars': 적용된 요약 길이,
+            'dropped': 예산 초과로 제외된 개수
+        }
+    """
+    order = stratified_order(items, day_of, source_of)
+    separator_tokens = estimate_tokens(separator)
+
+    best = None
+    for summary_chars in summary_steps:
+        trimmed = [dict(item, summary=(item.get('summary') or '')[:summary_chars]) for item in items]
+        # 번호는 최종 위치에 따라 바뀌므로 자리수만 맞춘 임시 번호로 비용 계산
+        costs = [estimate_tokens(render(len(items), item)) + separator_tokens for item in trimmed]
+
+        selected = []
+        used = 0
+        for idx in order:
+            if used + costs[idx] > token_budget:
+                continue
+            selected.append(idx)
+            used += costs[idx]
+
+        if best is None or len(selected) > len(best[1]):
+            best = (summary_chars, selected, trimmed)
+        if len(selected) == len(items):
+            break
+
+    summary_chars, selected, trimmed = best
+    indices = sorted(selected)
+    packed_items = [trimmed[idx] for idx in indices]
+    text = separator.join(render(number, item) for number, item in enumerate(packed_items, 1))
+    return {
+        'items': packed_items,
+        'indices': indices,
+        'text': text,
+        'tokens': estimate_tokens(text),
+        'summary_chars': summary_chars,
+        'dropped': len(items) - len(packed_items)
+    }
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+브리프 전송 기록 (Run Ledger)
+브리프 종류 + 시간 윈도우별로 전송 완료 여부를 /data 에 저장
+- 재배포/재시작 시 이미 전송한 윈도우는 다시 실행하지 않음
+- 예: daily:2026-10-17-morning, weekly:2026-W42, monthly:2026-10
+"""
+
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Tuple
+
+LEDGER_RETENTION_DAYS = 90
+
+
+def daily_window(now: datetime, morning_time: str = '08:00', evening_time: str = '22:00') -> Tuple[str, str]:
+    """now 기준 가장 최근 정기 전송 슬롯
+
+    Returns:
+        (윈도우 키, 'morning' 또는 'evening') 예: ('2026-10-17-morning', 'morning')
+    """
+    slots = []
+    for day_offset in (0, 1):
+        day = (now - timedelta(days=day_offset)).date()
+        for time_of_day, hhmm in (('morning', morning_time), ('evening', evening_time)):
+            slot = datetime.combine(day, datetime.strptime(hhmm, '%H:%M').time())
+            if slot <= now:
+                slots.append((slot, time_of_day))
+
+    slot, time_of_day = max(slots)
+    return f"{slot.strftime('%Y-%m-%d')}-{time_of_day}", time_of_day
+
+
+def weekly_window(now: datetime) -> str:
+    """ISO 주차 윈도우 (예: 2026-W42)"""
+    year, week, _ = now.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def monthly_window(now: datetime) -> str:
+    """월 윈도우 (예: 2026-10)"""
+    return now.strftime('%Y-%m')
+
+
+class RunLedger:
+    def __init__(self, ledger_file: str = '/data/run_ledger.json'):
+        self.ledger_file = ledger_file
+        self.lock_file = ledger_file + '.lock'
+
+        ledger_dir = os.path.dirname(ledger_file)
+        if ledger_dir:
+            os.makedirs(ledger_dir, exist_ok=True)
+
+    @contextmanager
+    def _locked(self):
+        """프로세스 간 파일 잠금 (스케줄러 + 수동 실행 동시 접근 대비)"""
+        with open(self.lock_file, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _load(self) -> Dict:
+        try:
+            if os.path.exists(self.ledger_file):
+                with open(self.ledger_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"⚠️ 전송 기록(ledger) 로드 실패: {e}")
+        return {'runs': {}}
+
+    def _save(self, ledger: Dict):
+        tmp_file = self.ledger_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(ledger, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.ledger_file)
+
+    def is_delivered(self, brief_type: str, window: str) -> bool:
+        """해당 윈도우의 브리프를 이미 전송했는지"""
+        with self._locked():
+            return f"{brief_type}:{window}" in self._load().get('runs', {})
+
+    def get(self, brief_type: str, window: str) -> Dict:
+        """해당 윈도우의 전송 기록 (없으면 None)"""
+        with self._locked():
+            return self._load().get('runs', {}).get(f"{brief_type}:{window}")
+
+    def mark_delivered(self, brief_type: str, window: str, **details):
+        """전송 완료 기록 (오래된 기록은 정리)"""
+        try:
+            with self._locked():
+                ledger = self._load()
+                runs = ledger.setdefault('runs', {})
+                runs[f"{brief_type}:{window}"] = {
+                    'delivered_at': datetime.now().isoformat(),
+                    **details
+                }
+
+                cutoff = (datetime.now() - timedelta(days=LEDGER_RETENTION_DAYS)).isoformat()
+                ledger['runs'] = {
+                    key: run for key, run in runs.items()
+                    if run.get('delivered_at', '') > cutoff
+                }
+                self._save(ledger)
+        except Exception as e:
+            print(f"⚠️ 전송 기록(ledger) 저장 실패: {e}")
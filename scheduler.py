@@ -9,11 +9,13 @@
 한국시간(KST) 고정, 섬머타임 고려 안 함
 """
 
-import schedule
+import threading
 import time
 import os
 import sys
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -21,6 +23,11 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from news_summary_gpt import USStockNewsSummary
 from weekly_hot_analyzer import WeeklyHotNewsAnalyzer
 from monthly_hot_analyzer import MonthlyHotNewsAnalyzer
+from run_ledger import RunLedger, weekly_window, monthly_window
+from job_scheduler import JobScheduler
+from message_render import escape_markdown, split_blocks
+from telegram_delivery import get_delivery, message_part
+from news_ingest import get_ingestor
 
 # 환경 변수 로드 (하위 호환성 지원)
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
@@ -32,101 +39,170 @@ HEADER_IMAGE_URL = os.getenv('HEADER_IMAGE_URL')
 MORNING_TIME = os.getenv('MORNING_TIME', '08:00')  # 기본: 오전 8시
 EVENING_TIME = os.getenv('EVENING_TIME', '22:00')  # 기본: 오후 10시
 
-def is_weekend():
+# 미리 준비: 송출 시각 N분 전에 수집/선별/렌더링 시작, M분 전에 늦게 올라온 뉴스 보충 후 정시에 발송
+BRIEF_PREPARE_LEAD_MINUTES = int(os.getenv('BRIEF_PREPARE_LEAD_MINUTES', '15'))
+BRIEF_TOPUP_MINUTES = int(os.getenv('BRIEF_TOPUP_MINUTES', '3'))
+
+# 브리프 전송 기록 - 재시작 시 이미 전송한 윈도우는 건너뜀
+LEDGER = RunLedger('/data/run_ledger.json')
+
+# 모닝/이브닝 브리프가 (따라잡기 실행 등으로) 동시에 실행되지 않도록
+_daily_brief_lock = threading.Lock()
+
+def is_weekend(day: datetime = None):
     """주말(토요일, 일요일) 확인"""
-    return datetime.now().weekday() >= 5  # 5=토요일, 6=일요일
+    return (day or datetime.now()).weekday() >= 5  # 5=토요일, 6=일요일
 
-def is_sunday():
+def is_sunday(day: datetime = None):
     """일요일 확인"""
-    return datetime.now().weekday() == 6
+    return (day or datetime.now()).weekday() == 6
 
-def is_first_of_month():
+def is_first_of_month(day: datetime = None):
     """매월 1일 확인"""
-    return datetime.now().day == 1
+    return (day or datetime.now()).day == 1
+
+def _sleep_until(when: datetime):
+    remaining = (when - datetime.now()).total_seconds()
+    if remaining > 0:
+        time.sleep(remaining)
 
-def send_morning_news():
-    """모닝브리프 전송"""
+def _top_up_before(bot: USStockNewsSummary, brief: dict, send_at: datetime) -> dict:
+    """보충 시각까지 기다렸다가 보충 - 발송 시각까지 끝나지 않으면 준비한 브리프 사용"""
+    _sleep_until(send_at - timedelta(minutes=BRIEF_TOPUP_MINUTES))
+    remaining = (send_at - datetime.now()).total_seconds()
+    if remaining <= 0:
+        return brief
+    
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='brief-topup')
+    future = executor.submit(bot.top_up_brief, brief, 12, 10)
+    executor.shutdown(wait=False)
+    try:
+        return future.result(timeout=remaining)
+    except FutureTimeoutError:
+        print("⏰ 보충이 발송 시각까지 끝나지 않음 - 준비한 브리프 발송\n")
+    except Exception as e:
+        print(f"⚠️ 보충 오류 - 준비한 브리프 발송: {e}\n")
+    return brief
+
+def run_daily_brief(time_of_day: str, window: str, send_at: datetime = None, trigger: str = 'schedule') -> bool:
+    """정기 브리프 실행 (이미 전송한 윈도우면 건너뜀)
+    
+    send_at 전에 호출되면 미리 준비 → 보충 → send_at 정각에 발송
+    
+    Returns:
+        이번 호출로 전송했으면 True
+    """
+    with _daily_brief_lock:
+        if LEDGER.is_delivered('daily', window):
+            print(f"⏭️ {window} 브리프는 이미 전송됨 - 건너뜀\n")
+            return False
+        
+        bot = USStockNewsSummary(
+            telegram_token=TELEGRAM_TOKEN,
+            telegram_chat_ids=TELEGRAM_CHAT_IDS,
+            openai_api_key=OPENAI_API_KEY,
+            news_priority='general'
+        )
+        
+        send_at = send_at or datetime.now()
+        brief = bot.prepare_brief(hours=12, top_n=10, time_of_day=time_of_day, send_at=send_at)
+        if not brief:
+            return False
+        
+        if datetime.now() < send_at:
+            print(f"⏳ 브리프 준비 완료 - {send_at.strftime('%H:%M')} 발송 대기\n")
+            brief = _top_up_before(bot, brief, send_at)
+            _sleep_until(send_at)
+        print(f"🕐 발송 시각 대비 지연: {(datetime.now() - send_at).total_seconds() * 1000:,.0f}ms\n")
+        
+        delivered = bot.deliver_brief(brief, header_image_url=HEADER_IMAGE_URL)
+        if delivered:
+            LEDGER.mark_delivered('daily', window, trigger=trigger)
+        return delivered
+
+def send_morning_news(scheduled_at: datetime = None):
+    """모닝브리프 전송 (scheduled_at: 예정 시각 - 따라잡기 실행도 원래 날짜 기준)"""
+    scheduled_at = scheduled_at or datetime.now()
     print(f"\n{'='*60}")
     print(f"☀️ 모닝브리프 전송 시작 (설정: {MORNING_TIME})")
     print(f"   시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S KST')}")
     print(f"   내용: 미국 장 마감 후 주요 뉴스")
     print(f"{'='*60}\n")
     
-    bot = USStockNewsSummary(
-        telegram_token=TELEGRAM_TOKEN,
-        telegram_chat_ids=TELEGRAM_CHAT_IDS,
-        openai_api_key=OPENAI_API_KEY,
-        news_priority='general'
-    )
-    
     # time_of_day='morning' 명시
-    bot.run(hours=12, top_n=10, header_image_url=HEADER_IMAGE_URL, time_of_day='morning')
-    print("✅ 모닝브리프 전송 완료\n")
-    
-    # 일요일이면 주간 핫 뉴스도 전송
-    if is_sunday():
+    window = f"{scheduled_at.strftime('%Y-%m-%d')}-morning"
+    run_daily_brief('morning', window, send_at=scheduled_at)
+    # 이번 호출에서 보냈거나 이미 보낸 경우만 완료 (수집/선별/전송 실패는 미완료)
+    missing = [] if LEDGER.is_delivered('daily', window) else ['모닝브리프']
+    print("✅ 모닝브리프 전송 완료\n" if not missing else "❌ 모닝브리프 전송 안 됨\n")
+    
+    # 일요일이면 주간, 매월 1일이면 월간 핫 뉴스도 전송 (분석은 동시에, 전송은 주간 → 월간 순)
+    hot_news = []
+    if is_sunday(scheduled_at):
         print(f"📅 일요일 특별 - 주간 핫 뉴스 전송 시작\n")
-        time.sleep(5)  # 일반 뉴스와 5초 간격
-        send_weekly_hot_news()
-    
-    # 매월 1일이면 월간 핫 뉴스도 전송
-    if is_first_of_month():
+        hot_news.append('weekly')
+    if is_first_of_month(scheduled_at):
         print(f"📅 매월 1일 특별 - 월간 핫 뉴스 전송 시작\n")
-        time.sleep(10)  # 주간 뉴스 후 10초 대기
-        send_monthly_hot_news()
+        hot_news.append('monthly')
+    if hot_news:
+        missing += [HOT_NEWS[brief_type][0] for brief_type in send_hot_news(hot_news, scheduled_at)]
+    
+    # 실패하면 예외 - 스케줄러가 이 슬롯을 완료로 기록하지 않아 재시작 시 따라잡기 대상이 됨
+    if missing:
+        raise RuntimeError(f"{', '.join(missing)} 전송 안 됨")
 
-def send_evening_news():
-    """이브닝브리프 전송"""
+def send_evening_news(scheduled_at: datetime = None):
+    """이브닝브리프 전송 (scheduled_at: 예정 시각 - 따라잡기 실행도 원래 날짜 기준)"""
+    scheduled_at = scheduled_at or datetime.now()
     print(f"\n{'='*60}")
     print(f"🌙 이브닝브리프 전송 시작 (설정: {EVENING_TIME})")
     print(f"   시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S KST')}")
     print(f"   내용: 미국 장 시작 전후 주요 뉴스")
     print(f"{'='*60}\n")
     
-    bot = USStockNewsSummary(
-        telegram_token=TELEGRAM_TOKEN,
-        telegram_chat_ids=TELEGRAM_CHAT_IDS,
-        openai_api_key=OPENAI_API_KEY,
-        news_priority='general'
-    )
-    
     # time_of_day='evening' 명시
-    bot.run(hours=12, top_n=10, header_image_url=HEADER_IMAGE_URL, time_of_day='evening')
+    window = f"{scheduled_at.strftime('%Y-%m-%d')}-evening"
+    run_daily_brief('evening', window, send_at=scheduled_at)
+    if not LEDGER.is_delivered('daily', window):
+        # 스케줄러가 이 슬롯을 완료로 기록하지 않도록 (재시작 시 따라잡기 대상)
+        raise RuntimeError("이브닝브리프 전송 안 됨")
     print("✅ 이브닝브리프 전송 완료\n")
 
-def send_weekly_hot_news():
-    """주간 핫 뉴스 TOP 10 (일요일 오전 7시 직후)"""
+def prepare_weekly_hot_news(scheduled_at: datetime = None) -> Optional[Tuple[str, List[str]]]:
+    """주간 핫 뉴스 TOP 10 분석 + 메시지 작성 (전송은 deliver_hot_news)
+    
+    Returns:
+        (윈도우, 분할된 메시지 목록), 이미 전송했거나 분석 실패 시 None
+    """
     print(f"\n{'='*60}")
-    print(f"🔥 주간 핫 뉴스 TOP 10 전송 시작 (GPT-4o)")
+    print(f"🔥 주간 핫 뉴스 TOP 10 분석 시작 (GPT-4o)")
     print(f"   시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S KST')}")
     print(f"{'='*60}\n")
     
+    window = weekly_window(scheduled_at or datetime.now())
+    if LEDGER.is_delivered('weekly', window):
+        print(f"⏭️ {window} 주간 핫 뉴스는 이미 전송됨 - 건너뜀\n")
+        return None
+    
     # 주간 핫 뉴스 분석
     analyzer = WeeklyHotNewsAnalyzer(OPENAI_API_KEY, '/data/sent_news_history.json')
     hot_topics = analyzer.analyze_weekly_hot_news()
     
     if not hot_topics:
         print("⚠️ 분석 실패 또는 핫 뉴스 없음\n")
-        return
-    
-    # 텔레그램 메시지 포맷팅
-    def escape_markdown(text: str) -> str:
-        """MarkdownV2 특수문자 이스케이프"""
-        special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-        for char in special_chars:
-            text = text.replace(char, f'\\{char}')
-        return text
+        return None
     
+    # 텔레그램 메시지 포맷팅 (헤더, 토픽별 블록, 푸터)
     today = datetime.now().strftime('%Y\\-%m\\-%d')
     
-    message = f"""🔥 *주간 핫 뉴스 TOP 10*
+    blocks = [f"""🔥 *주간 핫 뉴스 TOP 10*
 _한 주간 가장 화제였던 이슈_
 
 📅 {today}
 
 ━━━━━━━━━━━━━━━━━━━━
 
-"""
+"""]
     
     for topic in hot_topics:
         rank = topic['rank']
@@ -136,7 +212,7 @@ _한 주간 가장 화제였던 이슈_
         heat_score = topic.get('heat_score', 0)
         tickers = topic.get('related_tickers', [])
         
-        message += f"""{rank}\\. *{title}*
+        block = f"""{rank}\\. *{title}*
 >{summary}
 
 """
@@ -146,81 +222,52 @@ _한 주간 가장 화제였던 이슈_
         if tickers:
             tickers_str = ', '.join(tickers[:3])  # 최대 3개만
             info_line += f" \\| 종목: {escape_markdown(tickers_str)}"
-        message += f"_{info_line}_\n\n"
+        block += f"_{info_line}_\n\n"
+        blocks.append(block)
     
     # 푸터
-    message += f"""━━━━━━━━━━━━━━━━━━━━
+    blocks.append(f"""━━━━━━━━━━━━━━━━━━━━
 📌 Reddit WSB \\+ Google Trends \\+ GPT\\-4o 분석
 🔄 지난 7일 뉴스 종합
 
 해외주식 소식 자동 포워딩 문의👇
-📧 contact@aqresearch\\.com"""
-    
-    # 여러 채팅방에 전송
-    chat_ids = [cid.strip() for cid in TELEGRAM_CHAT_IDS.split(',') if cid.strip()]
-    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-    
-    success_count = 0
-    fail_count = 0
-    
-    for chat_idx, chat_id in enumerate(chat_ids, 1):
-        print(f"📤 [{chat_idx}/{len(chat_ids)}] 채팅방 {chat_id}에 주간 핫 뉴스 전송 중...")
-        
-        payload = {
-            'chat_id': chat_id,
-            'text': message,
-            'parse_mode': 'MarkdownV2',
-            'disable_web_page_preview': True
-        }
-        
-        try:
-            response = requests.post(url, json=payload, timeout=10)
-            if response.status_code == 200:
-                print(f"✅ 채팅방 {chat_id}: 주간 핫 뉴스 전송 완료")
-                success_count += 1
-            else:
-                print(f"❌ 채팅방 {chat_id}: 전송 실패 - {response.text}")
-                fail_count += 1
-        except Exception as e:
-            print(f"❌ 채팅방 {chat_id}: 전송 오류 - {e}")
-            fail_count += 1
-        
-        # 다음 채팅방 전송 전 대기
-        if chat_idx < len(chat_ids):
-            time.sleep(5)  # 채팅방 간 5초 간격
+📧 contact@aqresearch\\.com""")
     
-    print(f"\n📊 주간 핫 뉴스 전송 결과: 성공 {success_count}개, 실패 {fail_count}개\n")
+    # 길면 토픽 경계에서 분할
+    return window, split_blocks(blocks)
 
 
-def send_monthly_hot_news():
-    """월간 핫 뉴스 TOP 10 (매월 1일 오전 7시 직후)"""
+def prepare_monthly_hot_news(scheduled_at: datetime = None) -> Optional[Tuple[str, List[str]]]:
+    """월간 핫 뉴스 TOP 10 분석 + 메시지 작성 (전송은 deliver_hot_news)
+    
+    Returns:
+        (윈도우, 분할된 메시지 목록), 이미 전송했거나 분석 실패 시 None
+    """
     print(f"\n{'='*60}")
-    print(f"📅 월간 핫 뉴스 TOP 10 전송 시작 (GPT-4o)")
+    print(f"📅 월간 핫 뉴스 TOP 10 분석 시작 (GPT-4o)")
     print(f"   시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S KST')}")
     print(f"{'='*60}\n")
     
+    window = monthly_window(scheduled_at or datetime.now())
+    if LEDGER.is_delivered('monthly', window):
+        print(f"⏭️ {window} 월간 핫 뉴스는 이미 전송됨 - 건너뜀\n")
+        return None
+    
     # 월간 핫 뉴스 분석
     analyzer = MonthlyHotNewsAnalyzer(OPENAI_API_KEY, '/data/sent_news_history.json')
     result = analyzer.analyze_monthly_hot_news()
     
     if not result or not result.get('hot_topics'):
         print("⚠️ 분석 실패 또는 핫 뉴스 없음\n")
-        return
-    
-    # 텔레그램 메시지 포맷팅
-    def escape_markdown(text: str) -> str:
-        """MarkdownV2 특수문자 이스케이프"""
-        special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-        for char in special_chars:
-            text = text.replace(char, f'\\{char}')
-        return text
+        return None
     
+    # 텔레그램 메시지 포맷팅 (헤더, 토픽별 블록, 푸터)
     current_month = datetime.now().strftime('%Y년 %m월')
     monthly_summary = result.get('monthly_summary', '')
     market_mood = result.get('market_mood', '')
     hot_topics = result.get('hot_topics', [])
     
-    message = f"""📅 *{escape_markdown(current_month)} 월간 핫 뉴스 TOP 10*
+    header = f"""📅 *{escape_markdown(current_month)} 월간 핫 뉴스 TOP 10*
 _한 달간 가장 중요했던 이슈_
 
 📝 {escape_markdown(monthly_summary)}
@@ -230,6 +277,7 @@ _한 달간 가장 중요했던 이슈_
 
 """
     
+    topic_blocks = []
     for topic in hot_topics:
         rank = topic['rank']
         title = escape_markdown(topic['title'])
@@ -238,7 +286,7 @@ _한 달간 가장 중요했던 이슈_
         outlook = topic.get('outlook', '')
         tickers = topic.get('related_tickers', [])
         
-        message += f"""{rank}\\. *{title}*
+        block = f"""{rank}\\. *{title}*
 >{summary}
 
 """
@@ -254,94 +302,85 @@ _한 달간 가장 중요했던 이슈_
         
         if info_parts:
             separator = ' \\| '
-            message += f"_{separator.join(info_parts)}_\n"
+            block += f"_{separator.join(info_parts)}_\n"
         
         if outlook:
-            message += f"💡 _{escape_markdown(outlook)}_\n"
+            block += f"💡 _{escape_markdown(outlook)}_\n"
         
-        message += "\n"
+        topic_blocks.append(block + "\n")
     
     # 푸터
-    message += f"""━━━━━━━━━━━━━━━━━━━━
+    footer = f"""━━━━━━━━━━━━━━━━━━━━
 📌 GPT\\-4o 월간 심층 분석
 🔄 지난 30일 뉴스 종합
 
 해외주식 소식 자동 포워딩 문의👇
 📧 contact@aqresearch\\.com"""
     
-    # 여러 채팅방에 전송
+    # 메시지가 너무 길면 토픽 경계에서 분할 (분할된 메시지마다 헤더/푸터 반복)
+    return window, split_blocks(topic_blocks, header=header, footer=footer)
+
+
+HOT_NEWS = {
+    'weekly': ('주간 핫 뉴스', prepare_weekly_hot_news, weekly_window),
+    'monthly': ('월간 핫 뉴스', prepare_monthly_hot_news, monthly_window),
+}
+
+
+def deliver_hot_news(brief_type: str, window: str, messages: List[str]):
+    """핫 뉴스 메시지를 모든 채팅방에 동시 전송 (채팅방별 분할 메시지 순서 유지)"""
+    title = HOT_NEWS[brief_type][0]
     chat_ids = [cid.strip() for cid in TELEGRAM_CHAT_IDS.split(',') if cid.strip()]
-    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
+    print(f"\n📤 {len(chat_ids)}개 채팅방에 {title} {len(messages)}개 메시지 전송 중...")
+    results = get_delivery(TELEGRAM_TOKEN).broadcast(chat_ids, [message_part(msg) for msg in messages], label=brief_type)
     
-    # 메시지가 너무 길면 분할
-    max_length = 4000
-    if len(message) <= max_length:
-        messages = [message]
-    else:
-        # 헤더와 푸터 분리
-        header = message.split('━━━━━━━━━━━━━━━━━━━━\n\n')[0] + '━━━━━━━━━━━━━━━━━━━━\n\n'
-        footer = '\n━━━━━━━━━━━━━━━━━━━━\n' + message.split('\n━━━━━━━━━━━━━━━━━━━━\n')[-1]
-        
-        # 뉴스 항목들
-        topics_text = message.replace(header, '').replace(footer, '')
-        topics_list = topics_text.split('\n\n')
-        
-        messages = []
-        current = header
-        for part in topics_list:
-            if len(current) + len(part) + len(footer) < max_length:
-                current += part + "\n\n"
-            else:
-                messages.append(current + footer)
-                current = header + part + "\n\n"
-        
-        if current != header:
-            messages.append(current + footer)
+    success_count = sum(1 for result in results.values() if result['ok'])
+    queued_count = sum(1 for result in results.values() if result['queued'])
+    fail_count = len(results) - success_count - queued_count
     
-    # 모든 채팅방에 전송
-    total_success = 0
-    total_fail = 0
+    print(f"\n📊 {title} 전송 결과: 성공 {success_count}개, 재전송 대기 {queued_count}개, 실패 {fail_count}개 "
+          f"(총 {len(chat_ids)}개 채팅방)\n")
     
-    for chat_idx, chat_id in enumerate(chat_ids, 1):
-        print(f"\n📤 [{chat_idx}/{len(chat_ids)}] 채팅방 {chat_id}에 월간 핫 뉴스 전송 중...")
-        
-        chat_success = 0
-        chat_fail = 0
-        
-        for idx, msg in enumerate(messages):
-            payload = {
-                'chat_id': chat_id,
-                'text': msg,
-                'parse_mode': 'MarkdownV2',
-                'disable_web_page_preview': True
-            }
-            
+    # 재전송 대기분은 아웃박스가 끝까지 보내므로 전송된 것으로 기록 (다시 만들면 중복 전송)
+    if success_count + queued_count > 0:
+        LEDGER.mark_delivered(brief_type, window)
+
+
+def send_hot_news(brief_types: List[str], scheduled_at: datetime = None) -> List[str]:
+    """핫 뉴스 분석은 병렬로, 전송은 brief_types 순서대로 (예: 주간 → 월간)
+    
+    Returns:
+        전송되지 않은 brief_type 목록 (이미 전송한 윈도우는 전송된 것으로 봄)
+    """
+    with ThreadPoolExecutor(max_workers=len(brief_types), thread_name_prefix='hot-news') as executor:
+        futures = [
+            (brief_type, executor.submit(HOT_NEWS[brief_type][1], scheduled_at))
+            for brief_type in brief_types
+        ]
+        for brief_type, future in futures:
             try:
-                response = requests.post(url, json=payload, timeout=10)
-                if response.status_code == 200:
-                    print(f"✅ 채팅방 {chat_id}: 월간 핫 뉴스 {idx+1}/{len(messages)} 전송 완료")
-                    chat_success += 1
-                else:
-                    print(f"❌ 채팅방 {chat_id}: 전송 실패 - {response.text}")
-                    chat_fail += 1
+                prepared = future.result()
             except Exception as e:
-                print(f"❌ 채팅방 {chat_id}: 전송 오류 - {e}")
-                chat_fail += 1
-            
-            # 여러 메시지 전송 시 간격
-            if idx < len(messages) - 1:
-                time.sleep(2)
-        
-        if chat_fail == 0:
-            total_success += 1
-        else:
-            total_fail += 1
-        
-        # 다음 채팅방 전송 전 대기
-        if chat_idx < len(chat_ids):
-            time.sleep(5)  # 채팅방 간 5초 간격
-    
-    print(f"\n📊 월간 핫 뉴스 전송 결과: 성공 {total_success}개, 실패 {total_fail}개 (총 {len(chat_ids)}개 채팅방)\n")
+                print(f"❌ {HOT_NEWS[brief_type][0]} 분석 오류: {e}\n")
+                continue
+            if prepared:
+                deliver_hot_news(brief_type, *prepared)
+    
+    scheduled_at = scheduled_at or datetime.now()
+    return [
+        brief_type for brief_type in brief_types
+        if not LEDGER.is_delivered(brief_type, HOT_NEWS[brief_type][2](scheduled_at))
+    ]
+
+
+def send_weekly_hot_news(scheduled_at: datetime = None) -> bool:
+    """주간 핫 뉴스 TOP 10 (일요일 모닝브리프 직후)"""
+    return not send_hot_news(['weekly'], scheduled_at)
+
+
+def send_monthly_hot_news(scheduled_at: datetime = None) -> bool:
+    """월간 핫 뉴스 TOP 10 (매월 1일 모닝브리프 직후)"""
+    return not send_hot_news(['monthly'], scheduled_at)
 
 def main():
     """스케줄러 메인"""
@@ -364,6 +403,7 @@ def main():
     print(f"   📅 매일:")
     print(f"      - {MORNING_TIME}: 모닝브리프 (미국 장 마감 후 뉴스)")
     print(f"      - {EVENING_TIME}: 이브닝브리프 (미국 장 시작 전후 뉴스)")
+    print(f"      (송출 {BRIEF_PREPARE_LEAD_MINUTES}분 전 준비, {BRIEF_TOPUP_MINUTES}분 전 보충, 정시 발송)")
     print(f"   📅 일요일 추가:")
     print(f"      - {MORNING_TIME} 직후: 🔥 주간 핫 TOP 10 (GPT-4o)")
     print(f"   📅 매월 1일 추가:")
@@ -383,18 +423,26 @@ def main():
     
     # 스케줄 등록 - 한국시간(KST) 고정
     # 환경 변수로 설정 가능 (기본값: 오전 8시, 오후 10시)
-    schedule.every().day.at(MORNING_TIME).do(send_morning_news)
-    schedule.every().day.at(EVENING_TIME).do(send_evening_news)
+    scheduler = JobScheduler.from_env()
+    scheduler.every_day('morning', MORNING_TIME, send_morning_news, lead_minutes=BRIEF_PREPARE_LEAD_MINUTES)
+    scheduler.every_day('evening', EVENING_TIME, send_evening_news, lead_minutes=BRIEF_PREPARE_LEAD_MINUTES)
+    
+    print(f"✅ 스케줄 등록 완료 (놓친 전송은 {scheduler.grace} 안이면 시작 시 따라잡기). 대기 중...\n")
+    
+    # 실패한 텔레그램 전송 재시도 (아웃박스, 재시작 전 남은 메시지 포함)
+    delivery = get_delivery(TELEGRAM_TOKEN)
+    pending = delivery.outbox.stats().get('pending', 0)
+    if pending:
+        print(f"📮 아웃박스에 재전송 대기 중인 메시지 {pending}개\n")
+    delivery.start_retrier()
     
-    print("✅ 스케줄 등록 완료. 대기 중...\n")
+    # RSS 상시 수집 - 브리프는 로컬 저장소에서 조회 (피드 페이지 크기/전송 시각과 무관하게 전체 수집)
+    get_ingestor().start()
     
-    # 무한 루프로 스케줄 실행
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # 1분마다 체크
+    # 놓친 전송 따라잡기 후 다음 예정 시각까지 대기하며 실행
+    scheduler.run_forever()
 
 if __name__ == "__main__":
-    import requests  # 여기서 import
     try:
         main()
     except KeyboardInterrupt:
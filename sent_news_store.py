@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+전송 뉴스 기록 저장소 (SQLite)
+- sent_at 인덱스가 있는 추가 전용 테이블 (전체 파일 재작성 없음)
+- WAL 모드 + busy timeout으로 스케줄러/수동 실행 동시 쓰기 안전
+- 보관 기간 정리는 하루 한 번 백그라운드에서 수행
+- 기존 sent_news_history.json 자동 마이그레이션
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Union
+
+DEFAULT_DB_FILE = '/data/sent_news_history.db'
+DEFAULT_RETENTION_DAYS = 1095  # 3년
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sent_news (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    link TEXT,
+    summary TEXT,
+    sent_at TEXT NOT NULL,
+    original_title TEXT,
+    original_summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sent_news_sent_at ON sent_news (sent_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# 이후 추가된 컬럼 (기존 DB에는 ALTER TABLE로 추가)
+ADDED_COLUMNS = {
+    'original_title': 'TEXT',
+    'original_summary': 'TEXT',
+}
+
+
+class SentNewsStore:
+    def __init__(self, db_file: str = DEFAULT_DB_FILE, legacy_json_file: str = None,
+                 retention_days: int = DEFAULT_RETENTION_DAYS):
+        self.db_file = db_file
+        self.legacy_json_file = legacy_json_file
+        self.retention_days = retention_days
+
+        db_dir = os.path.dirname(db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+            self._add_missing_columns(conn)
+        finally:
+            conn.close()
+
+        if legacy_json_file:
+            self._migrate_legacy_json()
+
+    @classmethod
+    def from_legacy_file(cls, sent_news_file: str) -> 'SentNewsStore':
+        """기존 JSON 경로에 대응하는 저장소 (예: sent_news_history.json → sent_news_history.db)"""
+        db_file = os.path.splitext(sent_news_file)[0] + '.db'
+        return cls(db_file, legacy_json_file=sent_news_file)
+
+    def _connect(self) -> sqlite3.Connection:
+        """연결 생성 (호출마다 새 연결 - 스레드/프로세스 간 공유하지 않음)"""
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA busy_timeout=30000')
+        # 기록 삭제 시 유사도 인덱스(minhash_index) 행도 함께 삭제
+        conn.execute('PRAGMA foreign_keys=ON')
+        return conn
+
+    def _add_missing_columns(self, conn: sqlite3.Connection):
+        """이전 버전으로 생성된 DB에 새 컬럼 추가"""
+        existing = {row['name'] for row in conn.execute('PRAGMA table_info(sent_news)')}
+        for column, column_type in ADDED_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f'ALTER TABLE sent_news ADD COLUMN {column} {column_type}')
+        conn.commit()
+
+    def _get_meta(self, conn: sqlite3.Connection, key: str) -> str:
+        row = conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: str):
+        conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def _migrate_legacy_json(self):
+        """기존 JSON 기록을 한 번만 가져오기"""
+        if not os.path.exists(self.legacy_json_file):
+            return
+
+        conn = self._connect()
+        try:
+            # 다른 프로세스와 동시에 마이그레이션하지 않도록 쓰기 잠금 선점
+            conn.execute('BEGIN IMMEDIATE')
+            if self._get_meta(conn, 'legacy_migrated_at'):
+                conn.rollback()
+                return
+
+            with open(self.legacy_json_file, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+
+            rows = [
+                (news.get('title', ''), news.get('link', ''), news.get('summary', ''), news.get('sent_at', ''))
+                for news in history.get('sent_news', [])
+                if news.get('sent_at')
+            ]
+            # sent_at 순서대로 넣어 id 순서와 시간 순서를 맞춤
+            rows.sort(key=lambda row: row[3])
+            conn.executemany(
+                'INSERT INTO sent_news (title, link, summary, sent_at) VALUES (?, ?, ?, ?)',
+                rows
+            )
+            self._set_meta(conn, 'legacy_migrated_at', datetime.now().isoformat())
+            conn.commit()
+            print(f"📦 기존 전송 기록 {len(rows)}개를 SQLite로 마이그레이션 완료")
+        except Exception as e:
+            conn.rollback()
+            print(f"⚠️ 전송 기록 마이그레이션 실패: {e}")
+            return
+        finally:
+            conn.close()
+
+        # 마이그레이션된 원본은 보관용으로 이름 변경
+        try:
+            os.replace(self.legacy_json_file, self.legacy_json_file + '.migrated')
+        except OSError as e:
+            print(f"⚠️ 기존 기록 파일 이름 변경 실패: {e}")
+
+    def append(self, news_list: List[Dict], sent_at: str = None) -> List[int]:
+        """전송된 뉴스 추가 (기존 기록은 건드리지 않음) - 추가된 행 id 반환"""
+        sent_at = sent_at or datetime.now().isoformat()
+        rows = [
+            (
+                news['title'], news.get('link', ''), news.get('summary', ''), sent_at,
+                news.get('original_title'), news.get('original_summary')
+            )
+            for news in news_list
+        ]
+
+        ids = []
+        conn = self._connect()
+        try:
+            with conn:
+                for row in rows:
+                    cursor = conn.execute(
+                        'INSERT INTO sent_news (title, link, summary, sent_at, original_title, original_summary) '
+                        'VALUES (?, ?, ?, ?, ?, ?)',
+                        row
+                    )
+                    ids.append(cursor.lastrowid)
+        finally:
+            conn.close()
+        return ids
+
+    def _rows_to_dicts(self, rows) -> List[Dict]:
+        return [
+            {
+                'id': row['id'],
+                'title': row['title'],
+                'link': row['link'],
+                'summary': row['summary'],
+                'sent_at': row['sent_at'],
+                'original_title': row['original_title'],
+                'original_summary': row['original_summary']
+            }
+            for row in rows
+        ]
+
+    def between(self, start: Union[datetime, str], end: Union[datetime, str] = None) -> List[Dict]:
+        """start < sent_at <= end 구간의 전송 기록 (오래된 순)
+        
+        sent_at 인덱스의 B-tree 탐색으로 해당 구간만 읽으므로
+        보관 기간이 늘어나도 로드 시간/메모리는 구간 크기에만 비례
+        """
+        start_str = start.isoformat() if isinstance(start, datetime) else start
+        params = [start_str]
+        query = 'SELECT * FROM sent_news WHERE sent_at > ?'
+        if end is not None:
+            query += ' AND sent_at <= ?'
+            params.append(end.isoformat() if isinstance(end, datetime) else end)
+        query += ' ORDER BY sent_at, id'
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        return self._rows_to_dicts(rows)
+
+    def get_many(self, ids: List[int]) -> List[Dict]:
+        """id 목록에 해당하는 전송 기록"""
+        if not ids:
+            return []
+        placeholders = ', '.join('?' * len(ids))
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f'SELECT * FROM sent_news WHERE id IN ({placeholders}) ORDER BY sent_at, id',
+                list(ids)
+            ).fetchall()
+        finally:
+            conn.close()
+        return self._rows_to_dicts(rows)
+
+    def daily_counts(self, start_day: str, end_day: str) -> Dict[str, int]:
+        """start_day ~ end_day (YYYY-MM-DD, 양끝 포함) 날짜별 전송 건수"""
+        end_exclusive = (datetime.fromisoformat(end_day) + timedelta(days=1)).strftime('%Y-%m-%d')
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT substr(sent_at, 1, 10) AS day, COUNT(*) AS count FROM sent_news '
+                'WHERE sent_at >= ? AND sent_at < ? GROUP BY day',
+                (start_day, end_exclusive)
+            ).fetchall()
+        finally:
+            conn.close()
+        return {row['day']: row['count'] for row in rows}
+
+    def since(self, ts: Union[datetime, str]) -> List[Dict]:
+        """ts 이후 전송 기록 (오래된 순)"""
+        return self.between(ts)
+
+    def prune(self, days: int = None) -> int:
+        """N일 이전 기록 삭제 (기본 3년)"""
+        days = days or self.retention_days
+        cutoff_str = (datetime.now() - timedelta(days=days)).isoformat()
+
+        conn = self._connect()
+        try:
+            with conn:
+                removed = conn.execute('DELETE FROM sent_news WHERE sent_at <= ?', (cutoff_str,)).rowcount
+                self._set_meta(conn, 'last_pruned_at', datetime.now().isoformat())
+        finally:
+            conn.close()
+
+        if removed > 0:
+            print(f"🗑️ {removed}개의 오래된 기록 삭제 ({days}일 이상)")
+        return removed
+
+    def prune_in_background(self, interval_hours: int = 24):
+        """마지막 정리 후 interval_hours가 지났으면 백그라운드 스레드에서 정리"""
+        conn = self._connect()
+        try:
+            last_pruned_at = self._get_meta(conn, 'last_pruned_at')
+        finally:
+            conn.close()
+
+        if last_pruned_at:
+            next_prune = datetime.fromisoformat(last_pruned_at) + timedelta(hours=interval_hours)
+            if datetime.now() < next_prune:
+                return None
+
+        def _run():
+            try:
+                self.prune()
+            except Exception as e:
+                print(f"⚠️ 오래된 기록 정리 실패: {e}")
+
+        thread = threading.Thread(target=_run, name='sent-news-prune', daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+텔레그램 동시 전송 엔진 (여러 채팅방 팬아웃)
+- 텔레그램 제한을 토큰 버킷으로 모델링
+  · 봇 전체: 초당 약 30개
+  · 채팅방별: 초당 1개
+  · 그룹/채널별: 분당 20개
+- 제한 안에서 여러 채팅방에 동시에 전송 (고정 sleep 없음)
+- 채팅방 하나의 분할 메시지는 항상 순서대로 전송
+- 429 응답의 retry_after 만큼 해당 채팅방만 대기 후 재시도
+- 모든 메시지는 아웃박스(telegram_outbox)를 거쳐 전송 - 실패분은 백그라운드에서 재전송
+"""
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import requests
+
+import http_client
+from telegram_outbox import TelegramOutbox
+
+TELEGRAM_API_URL = 'https://api.telegram.org/bot{token}/{method}'
+PERMANENT_STATUS_CODES = {400, 403}  # 채팅방 없음/봇 차단 등 - 재시도해도 실패
+MAX_WORKERS = 128  # 전송 제한에서 계산한 워커 수 상한 (대부분 버킷 대기 중인 스레드)
+
+
+class TokenBucket:
+    """토큰 버킷 (rate: 초당 충전량, capacity: 최대 누적량)
+
+    acquire()는 토큰을 먼저 예약하고 필요한 만큼만 대기 → 대기 중인 스레드끼리 순서 보장
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = max(-self.tokens / self.rate, self.blocked_until - now, 0.0)
+        if wait > 0:
+            time.sleep(wait)
+
+    def block_for(self, seconds: float):
+        """retry_after 동안 새 토큰 발급 중지"""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+def message_part(text: str) -> Dict:
+    """sendMessage 파트 (MarkdownV2)"""
+    return {
+        'method': 'sendMessage',
+        'payload': {
+            'text': text,
+            'parse_mode': 'MarkdownV2',
+            'disable_web_page_preview': True
+        }
+    }
+
+
+def photo_part(photo: str, caption: str, fallback: Dict = None) -> Dict:
+    """sendPhoto 파트 (photo: URL 또는 file_id, fallback: 실패 시 대신 보낼 파트)"""
+    return {
+        'method': 'sendPhoto',
+        'payload': {
+            'photo': photo,
+            'caption': caption,
+            'parse_mode': 'MarkdownV2'
+        },
+        'fallback': fallback
+    }
+
+
+class TelegramDelivery:
+    def __init__(self, telegram_token: str, global_rate: float = 30, chat_rate: float = 1,
+                 group_per_minute: float = 20, max_workers: int = None, max_attempts: int = 4,
+                 outbox: TelegramOutbox = None):
+        """
+        Args:
+            max_workers: 동시에 전송할 채팅방 수 (None이면 전송 제한에서 계산 - workers_for)
+        """
+        self.telegram_token = telegram_token
+        self.outbox = outbox or TelegramOutbox()
+        self._retrier_started = False
+        self._active_batches = set()  # 이 프로세스에서 broadcast가 전송 중인 배치 (재시도 드레인이 가로채지 않도록)
+        self.chat_rate = chat_rate
+        self.group_per_minute = group_per_minute
+        self.max_workers = max_workers or self.workers_for(global_rate, chat_rate, group_per_minute)
+        self.max_attempts = max_attempts
+
+        # 버스트 없이 고르게 (초당 global_rate개)
+        self.global_bucket = TokenBucket(global_rate)
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+        self._group_buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, telegram_token: str) -> 'TelegramDelivery':
+        """환경 변수 설정을 따르는 전송 엔진"""
+        return cls(
+            telegram_token,
+            global_rate=float(os.getenv('TELEGRAM_GLOBAL_RATE', '30')),
+            chat_rate=float(os.getenv('TELEGRAM_CHAT_RATE', '1')),
+            group_per_minute=float(os.getenv('TELEGRAM_GROUP_PER_MINUTE', '20')),
+            max_workers=int(os.getenv('TELEGRAM_MAX_WORKERS') or 0) or None,
+            outbox=TelegramOutbox(os.getenv('TELEGRAM_OUTBOX_FILE', '/data/telegram_outbox.db'))
+        )
+
+    @staticmethod
+    def workers_for(global_rate: float, chat_rate: float, group_per_minute: float) -> int:
+        """전역 한도를 채우는 데 필요한 워커 수
+
+        워커 하나는 채팅방 하나를 맡아 그 채팅방 한도(그룹은 분당 20개 = 초당 1/3개)로만 보내므로
+        전역 초당 한도 / 가장 느린 채팅방 초당 한도 만큼 있어야 초당 30개를 채움 (30 / (1/3) = 90)
+        """
+        slowest = min(chat_rate, group_per_minute / 60)
+        return max(1, min(MAX_WORKERS, math.ceil(global_rate / slowest)))
+
+    def _buckets_for(self, chat_id: str) -> List[TokenBucket]:
+        """채팅방 → 거쳐야 할 버킷 목록 (전역 버킷은 마지막에 따로)"""
+        with self._buckets_lock:
+            if chat_id not in self._chat_buckets:
+                self._chat_buckets[chat_id] = TokenBucket(self.chat_rate)
+                # 그룹/채널 id는 음수
+                if str(chat_id).startswith('-'):
+                    self._group_buckets[chat_id] = TokenBucket(self.group_per_minute / 60)
+            buckets = [self._chat_buckets[chat_id]]
+            if chat_id in self._group_buckets:
+                buckets.append(self._group_buckets[chat_id])
+            return buckets
+
+    def _send_part(self, chat_id: str, part: Dict) -> Dict:
+        """파트 하나 전송 (429/5xx/연결 오류 재시도)
+
+        Returns:
+            {'ok': bool, 'status': HTTP 상태 코드 또는 None, 'error': 오류 내용, 'response': 응답 JSON}
+        """
+        url = TELEGRAM_API_URL.format(token=self.telegram_token, method=part['method'])
+        payload = dict(part['payload'], chat_id=chat_id)
+        chat_buckets = self._buckets_for(chat_id)
+
+        status, error = None, None
+        for attempt in range(self.max_attempts):
+            for bucket in chat_buckets:
+                bucket.acquire()
+            # 전역 토큰은 채팅방 대기가 끝난 뒤에 가져감 (대기 중인 채팅방이 전역 한도를 점유하지 않도록)
+            self.global_bucket.acquire()
+
+            try:
+                # 재시도는 여기서 채팅방 단위로 처리 (호스트 전체를 막지 않도록)
+                # 429는 채팅방별 제한일 수 있으므로 api.telegram.org 전체의 동시성은 줄이지 않음
+                response = http_client.post(url, json=payload, timeout=30, max_retries=0, host_throttle=False)
+            except requests.Timeout as e:
+                if not isinstance(e, requests.ConnectionError):
+                    # 읽기 타임아웃 - 이미 전송됐을 수 있으므로 바로 재전송하지 않고 아웃박스 재시도에 맡김
+                    return {'ok': False, 'status': None, 'error': f"응답 시간 초과: {e}", 'response': None}
+                status, error, delay = None, str(e), http_client.backoff(attempt)
+            except requests.RequestException as e:
+                status, error, delay = None, str(e), http_client.backoff(attempt)
+            else:
+                if response.status_code == 200:
+                    return {'ok': True, 'status': 200, 'error': None, 'response': response.json()}
+
+                status, error = response.status_code, response.text
+                if status == 429:
+                    delay = http_client.retry_after(response) or http_client.backoff(attempt)
+                    for bucket in chat_buckets:
+                        bucket.block_for(delay)
+                    print(f"⏳ 채팅방 {chat_id}: 전송 제한 - {delay:.1f}초 후 재시도")
+                    delay = 0  # 다음 시도의 버킷 대기가 retry_after를 반영
+                elif status >= 500:
+                    delay = http_client.backoff(attempt)
+                else:
+                    break
+
+            if attempt < self.max_attempts - 1:
+                time.sleep(delay)
+
+        return {'ok': False, 'status': status, 'error': error, 'response': None}
+
+    def _deliver_rows(self, batch: str, chat_id: str, rows: List[Dict]) -> Dict:
+        """채팅방 하나의 아웃박스 파트를 순서대로 전송
+
+        실패하면 그 뒤 파트는 보내지 않고 재시도 예약 (순서 유지)
+        첫 시도에서 fallback이 있는 파트가 실패하면 대체 파트로 바꿔 전송 (예: 이미지 실패 → 텍스트만)
+        """
+        sent = 0
+        queued = False
+        errors = []
+        responses = []
+        for row in rows:
+            result = self._send_part(chat_id, row)
+            # 403(봇 차단)이면 대체 파트도 실패하므로 제외
+            if not result['ok'] and row['fallback'] and result['status'] != 403:
+                print(f"⚠️ 채팅방 {chat_id}: 파트 {row['part_index'] + 1} 실패 - 대체 메시지로 전송 ({result['error']})")
+                self.outbox.use_fallback(row)
+                row = dict(row, **row['fallback'], fallback=None)
+                result = self._send_part(chat_id, row)
+
+            if result['ok']:
+                self.outbox.mark_sent(row['id'])
+                responses.append(result['response'])
+                sent += 1
+                continue
+
+            error = f"{result['status']} {result['error']}"
+            errors.append(f"{row['part_index'] + 1}: {error}")
+            if result['status'] in PERMANENT_STATUS_CODES:
+                self.outbox.dead_letter(batch, chat_id, error)
+            else:
+                queued = self.outbox.retry_later(batch, chat_id, row, error)
+            break
+
+        ok = sent == len(rows)
+        if ok:
+            print(f"✅ 채팅방 {chat_id}: {sent}/{len(rows)}개 전송 완료")
+        else:
+            print(f"❌ 채팅방 {chat_id}: {sent}/{len(rows)}개 전송 - {'; '.join(errors)[:300]}")
+        return {'ok': ok, 'queued': queued, 'sent': sent, 'total': len(rows), 'errors': errors,
+                'responses': responses}
+
+    def _deliver_chat(self, batch: str, chat_id: str) -> Dict:
+        """채팅방 하나를 선점해 전송 (워커가 맡을 때 선점 - 대기 중인 채팅방은 선점하지 않음)
+
+        Returns:
+            전송 결과, 다른 드레인이 먼저 선점했으면 None
+        """
+        rows = self.outbox.claim_chat(batch, chat_id)
+        if not rows:
+            return None
+        try:
+            return self._deliver_rows(batch, chat_id, rows)
+        except Exception as e:
+            # 예상치 못한 오류 - 선점만 풀어두고 다음 재시도에 맡김
+            self.outbox.release(batch, chat_id)
+            print(f"❌ 채팅방 {chat_id}: 전송 오류 - {e}")
+            return {'ok': False, 'queued': True, 'sent': 0, 'total': len(rows), 'errors': [str(e)], 'responses': []}
+
+    def drain(self, batch: str = None) -> Dict[str, Dict]:
+        """아웃박스에서 전송할 차례인 파트를 전송 (batch 지정 시 해당 배치만)
+
+        Returns:
+            {chat_id: {'ok', 'queued'(실패했지만 아웃박스 재전송 예정), 'sent', 'total', 'errors',
+                       'responses'(전송된 파트의 응답 JSON)}}
+        """
+        due = self.outbox.due_chats(batch)
+        if batch is None:
+            due = [(batch_id, chat_id) for batch_id, chat_id in due if batch_id not in self._active_batches]
+        if not due:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(due)))) as executor:
+            futures = [
+                (chat_id, executor.submit(self._deliver_chat, batch_id, chat_id))
+                for batch_id, chat_id in due
+            ]
+            results = {chat_id: future.result() for chat_id, future in futures}
+        return {chat_id: result for chat_id, result in results.items() if result is not None}
+
+    def broadcast(self, chat_ids: List[str], parts: List[Dict], label: str = 'message') -> Dict[str, Dict]:
+        """모든 채팅방에 파트 목록 전송 (아웃박스 기록 후 채팅방끼리는 동시, 채팅방 안에서는 순서대로)
+
+        실패한 채팅방은 아웃박스에 남아 백그라운드 재시도 대상이 됨
+
+        Returns:
+            drain()과 같은 형식
+        """
+        if not chat_ids or not parts:
+            return {}
+
+        started = time.monotonic()
+        batch = self.outbox.enqueue(label, chat_ids, parts)
+        self._active_batches.add(batch)
+        try:
+            results = self.drain(batch)
+        finally:
+            self._active_batches.discard(batch)
+
+        success = sum(1 for result in results.values() if result['ok'])
+        queued = sum(1 for result in results.values() if result['queued'])
+        print(f"\n📊 전송 결과: 성공 {success}개, 재전송 대기 {queued}개, 실패 {len(results) - success - queued}개 "
+              f"(총 {len(chat_ids)}개 채팅방, {len(parts)}개 메시지, {time.monotonic() - started:.1f}초)")
+        return results
+
+    def start_retrier(self, interval_seconds: int = 30):
+        """아웃박스 재시도 백그라운드 스레드 (프로세스당 한 번)"""
+        if self._retrier_started:
+            return
+        self._retrier_started = True
+
+        def _run():
+            while True:
+                try:
+                    maintenance = self.outbox.maintain()
+                    if maintenance['released']:
+                        print(f"🔓 아웃박스: 중단된 전송 {maintenance['released']}개 재시도 대기열로 복귀")
+                    results = self.drain()
+                    if results:
+                        success = sum(1 for result in results.values() if result['ok'])
+                        print(f"📮 아웃박스 재전송: 성공 {success}개, 실패 {len(results) - success}개 채팅방")
+                except Exception as e:
+                    print(f"⚠️ 아웃박스 재전송 오류: {e}")
+                time.sleep(interval_seconds)
+
+        threading.Thread(target=_run, daemon=True, name='telegram-outbox-retrier').start()
+
+
+_default_delivery = None
+_default_delivery_lock = threading.Lock()
+
+
+def get_delivery(telegram_token: str) -> TelegramDelivery:
+    """프로세스 공용 전송 엔진 (일간/주간/월간 전송이 같은 채팅방 버킷을 공유)"""
+    global _default_delivery
+    with _default_delivery_lock:
+        if _default_delivery is None or _default_delivery.telegram_token != telegram_token:
+            _default_delivery = TelegramDelivery.from_env(telegram_token)
+        return _default_delivery
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+텔레그램 전송 아웃박스 (SQLite, /data)
+- 모든 전송 메시지를 채팅방 × 파트 단위로 먼저 기록한 뒤 전송
+- 실패한 파트는 지수 백오프로 재시도 (채팅방 안의 파트 순서 유지)
+- 403/400(봇 차단, 채팅방 없음 등) 또는 재시도 한도 초과 시 dead-letter 처리
+- 재시작해도 남은 메시지를 이어서 전송 → GPT 파이프라인을 다시 돌리지 않고 복구 (at-least-once)
+- 채팅방 단위로 워커가 맡을 때 선점, 선점한 프로세스는 하트비트를 기록
+  → 하트비트가 끊긴(죽은) 프로세스의 선점만 대기열로 되돌림 (오래 걸리는 전송을 중복 전송하지 않음)
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Tuple
+
+MAX_ATTEMPTS = 8
+RETRY_BASE_DELAY = 30     # 초
+RETRY_MAX_DELAY = 3600    # 초
+HEARTBEAT_SECONDS = 30
+STALE_CLAIM_SECONDS = 300  # 선점한 프로세스의 하트비트가 이만큼 끊기면 죽은 것으로 보고 다시 대기열로
+SENT_RETENTION_DAYS = 7
+DEAD_RETENTION_DAYS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch TEXT NOT NULL,
+    chat_id TEXT NOT NULL,
+    part_index INTEGER NOT NULL,
+    method TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    fallback TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claim TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (batch, chat_id, part_index)
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+CREATE TABLE IF NOT EXISTS claim_owners (
+    owner TEXT PRIMARY KEY,
+    heartbeat_at REAL NOT NULL
+);
+"""
+
+
+class TelegramOutbox:
+    def __init__(self, db_file: str = '/data/telegram_outbox.db'):
+        self.db_file = db_file
+        # 선점 소유자 (이 인스턴스) - 선점 토큰은 '소유자:임의값'
+        self.owner = uuid.uuid4().hex
+        self._heartbeat_thread = None
+        self._heartbeat_lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA busy_timeout=30000')
+        return conn
+
+    def enqueue(self, label: str, chat_ids: List[str], parts: List[Dict]) -> str:
+        """채팅방 × 파트를 대기열에 기록
+
+        Args:
+            label: 배치 이름 (예: 'daily', 'weekly')
+            parts: [{'method', 'payload', 'fallback'(선택)}] - fallback은 실패 시 대신 보낼 파트
+
+        Returns:
+            배치 id
+        """
+        batch = f"{label}-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        now = time.time()
+        rows = [
+            (
+                batch, str(chat_id), idx, part['method'],
+                json.dumps(part['payload'], ensure_ascii=False),
+                json.dumps(part['fallback'], ensure_ascii=False) if part.get('fallback') else None,
+                now, now, now
+            )
+            for chat_id in chat_ids
+            for idx, part in enumerate(parts)
+        ]
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    'INSERT INTO outbox (batch, chat_id, part_index, method, payload, fallback, '
+                    'next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    rows
+                )
+        finally:
+            conn.close()
+        return batch
+
+    def _heartbeat(self):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO claim_owners (owner, heartbeat_at) VALUES (?, ?)',
+                    (self.owner, time.time())
+                )
+        finally:
+            conn.close()
+
+    def _start_heartbeat(self):
+        """선점 소유자 하트비트 (프로세스가 살아 있는 동안 HEARTBEAT_SECONDS마다 기록)"""
+        with self._heartbeat_lock:
+            if self._heartbeat_thread:
+                return
+            self._heartbeat()
+
+            def _run():
+                while True:
+                    time.sleep(HEARTBEAT_SECONDS)
+                    try:
+                        self._heartbeat()
+                    except Exception as e:
+                        print(f"⚠️ 아웃박스 하트비트 기록 실패: {e}")
+
+            self._heartbeat_thread = threading.Thread(target=_run, daemon=True, name='telegram-outbox-heartbeat')
+            self._heartbeat_thread.start()
+
+    def due_chats(self, batch: str = None) -> List[Tuple[str, str]]:
+        """전송할 차례인 파트가 있는 (배치, 채팅방) 목록 - 선점하지 않음"""
+        query = ("SELECT DISTINCT batch, chat_id FROM outbox "
+                 "WHERE status = 'pending' AND next_attempt_at <= ?")
+        params = [time.time()]
+        if batch:
+            query += ' AND batch = ?'
+            params.append(batch)
+        query += ' ORDER BY batch, chat_id'
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        return [(row['batch'], row['chat_id']) for row in rows]
+
+    def claim_chat(self, batch: str, chat_id: str) -> List[Dict]:
+        """채팅방 하나의 전송할 차례인 파트를 선점 (워커가 전송을 시작할 때)
+
+        다른 프로세스/스레드가 먼저 선점했으면 빈 목록
+
+        Returns:
+            파트 순서대로의 행 목록
+        """
+        self._start_heartbeat()
+        claim = f"{self.owner}:{uuid.uuid4().hex}"
+        now = time.time()
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "UPDATE outbox SET status = 'sending', claim = ?, updated_at = ? "
+                    "WHERE batch = ? AND chat_id = ? AND status = 'pending' AND next_attempt_at <= ?",
+                    (claim, now, batch, chat_id, now)
+                )
+            rows = conn.execute(
+                'SELECT * FROM outbox WHERE claim = ? ORDER BY part_index',
+                (claim,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {
+                'id': row['id'],
+                'part_index': row['part_index'],
+                'method': row['method'],
+                'payload': json.loads(row['payload']),
+                'fallback': json.loads(row['fallback']) if row['fallback'] else None,
+                'attempts': row['attempts']
+            }
+            for row in rows
+        ]
+
+    def mark_sent(self, row_id: int):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "UPDATE outbox SET status = 'sent', claim = NULL, last_error = NULL, updated_at = ? WHERE id = ?",
+                    (time.time(), row_id)
+                )
+        finally:
+            conn.close()
+
+    def use_fallback(self, row: Dict):
+        """파트를 대체 파트로 교체 (예: 이미지+캡션 → 텍스트) - 재시도 시에도 대체 파트 사용"""
+        fallback = row['fallback']
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'UPDATE outbox SET method = ?, payload = ?, fallback = NULL, updated_at = ? WHERE id = ?',
+                    (fallback['method'], json.dumps(fallback['payload'], ensure_ascii=False), time.time(), row['id'])
+                )
+        finally:
+            conn.close()
+
+    def retry_later(self, batch: str, chat_id: str, row: Dict, error: str) -> bool:
+        """실패한 파트와 그 뒤 파트를 백오프 후 재시도로 되돌림 (한도 초과 시 dead-letter)
+
+        Returns:
+            재시도 예약했으면 True, dead-letter 처리했으면 False
+        """
+        attempts = row['attempts'] + 1
+        if attempts >= MAX_ATTEMPTS:
+            self.dead_letter(batch, chat_id, f"재시도 {attempts}회 초과: {error}")
+            return False
+
+        now = time.time()
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** row['attempts'])) * random.uniform(0.5, 1.0)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'UPDATE outbox SET attempts = ?, last_error = ? WHERE id = ?',
+                    (attempts, error[:1000], row['id'])
+                )
+                # 뒤 파트도 같은 시각까지 미뤄서 순서가 뒤바뀌지 않게 함
+                conn.execute(
+                    "UPDATE outbox SET status = 'pending', claim = NULL, next_attempt_at = ?, updated_at = ? "
+                    "WHERE batch = ? AND chat_id = ? AND part_index >= ? AND status IN ('pending', 'sending')",
+                    (now + delay, now, batch, chat_id, row['part_index'])
+                )
+        finally:
+            conn.close()
+        print(f"🔁 채팅방 {chat_id}: 파트 {row['part_index'] + 1} {delay:.0f}초 후 재전송 예정 ({attempts}/{MAX_ATTEMPTS})")
+        return True
+
+    def dead_letter(self, batch: str, chat_id: str, error: str):
+        """채팅방의 남은 파트를 dead-letter 처리 (더 이상 재시도하지 않음)"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "UPDATE outbox SET status = 'dead', claim = NULL, last_error = ?, updated_at = ? "
+                    "WHERE batch = ? AND chat_id = ? AND status IN ('pending', 'sending')",
+                    (error[:1000], time.time(), batch, chat_id)
+                )
+        finally:
+            conn.close()
+        print(f"🪦 채팅방 {chat_id}: dead-letter 처리 ({batch}) - {error[:200]}")
+
+    def release(self, batch: str, chat_id: str):
+        """선점했지만 보내지 못한 파트를 대기열로 되돌림"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "UPDATE outbox SET status = 'pending', claim = NULL, updated_at = ? "
+                    "WHERE batch = ? AND chat_id = ? AND status = 'sending'",
+                    (time.time(), batch, chat_id)
+                )
+        finally:
+            conn.close()
+
+    def maintain(self) -> Dict[str, int]:
+        """죽은 프로세스의 선점 해제 + 오래된 기록 정리
+
+        선점 토큰의 소유자 하트비트가 STALE_CLAIM_SECONDS 안이면 전송이 오래 걸려도 건드리지 않음
+
+        Returns:
+            {'released': 되돌린 파트 수, 'deleted': 삭제한 행 수}
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                live_after = now - STALE_CLAIM_SECONDS
+                released = conn.execute(
+                    "UPDATE outbox SET status = 'pending', claim = NULL, updated_at = ? "
+                    "WHERE status = 'sending' AND NOT EXISTS ("
+                    "SELECT 1 FROM claim_owners o "
+                    "WHERE outbox.claim LIKE o.owner || ':%' AND o.heartbeat_at >= ?)",
+                    (now, live_after)
+                ).rowcount
+                conn.execute('DELETE FROM claim_owners WHERE heartbeat_at < ?', (live_after,))
+                deleted = conn.execute(
+                    "DELETE FROM outbox WHERE (status = 'sent' AND updated_at < ?) "
+                    "OR (status = 'dead' AND updated_at < ?)",
+                    (now - SENT_RETENTION_DAYS * 86400, now - DEAD_RETENTION_DAYS * 86400)
+                ).rowcount
+        finally:
+            conn.close()
+        return {'released': released, 'deleted': deleted}
+
+    def stats(self) -> Dict[str, int]:
+        """상태별 파트 수"""
+        conn = self._connect()
+        try:
+            rows = conn.execute('SELECT status, COUNT(*) AS count FROM outbox GROUP BY status').fetchall()
+        finally:
+            conn.close()
+        return {row['status']: row['count'] for row in rows}
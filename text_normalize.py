@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+RSS 요약문 정규화 (프롬프트/저장 전에 한 번)
+- HTML 태그, 이미지/추적 픽셀, script/style 제거 + 엔티티 디코딩 + 공백 정리
+- 매체 상투 문구 제거 ("The post ... appeared first on ...", "Continue reading", "[…]" 등)
+- 제목을 그대로 반복한 요약 앞부분 제거
+- 결과는 (항목 id, 원문 요약/제목 해시)별로 캐시 (같은 항목을 다시 파싱해도 재계산하지 않고, 요약이 수정되면 다시 계산)
+"""
+
+import hashlib
+import html
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from prompt_packer import estimate_tokens
+
+SUMMARY_MAX_CHARS = 500
+
+_BLOCK_TAGS = re.compile(r'<\s*(script|style|noscript|iframe|figure|figcaption)\b.*?<\s*/\s*\1\s*>',
+                         re.IGNORECASE | re.DOTALL)
+_COMMENTS = re.compile(r'<!--.*?-->', re.DOTALL)
+_BREAK_TAGS = re.compile(r'<\s*(br|/p|/div|/li|/h\d|/tr)\b[^>]*>', re.IGNORECASE)
+_TAGS = re.compile(r'<[^>]*>')
+_INVISIBLE = re.compile('[\u200b-\u200f\u2060\ufeff\u00ad]')  # 폭 없는 문자, soft hyphen
+_WHITESPACE = re.compile(r'\s+')
+
+# 매체 상투 문구 (본문 정보 없음)
+BOILERPLATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'The post .{1,300}? appeared first on .{1,100}?\.?\s*$',
+        r'This (article|story) (was )?(originally )?(appeared|published) (first )?(on|in|at) .{1,100}?\.?\s*$',
+        r'(Continue|Keep) reading.{0,60}$',
+        r'Read (the )?(more|full (article|story)).{0,60}$',
+        r'Click here to .{1,120}?(\.|$)',
+        r'Sign up (for|to) .{1,120}?newsletter.{0,60}?(\.|$)',
+        r'Subscribe to .{1,120}?(\.|$)',
+        r'See (the )?full (article|story).{0,60}$',
+        r'\s*(\[\s*(\.\.\.|…)\s*\]|\[\s*more\s*\]|»|\.\.\.|…)\s*$',
+    )
+]
+
+
+def strip_html(text: str) -> str:
+    """HTML 제거 + 엔티티 디코딩 + 공백 정리"""
+    if not text:
+        return ''
+    if '<' in text:
+        text = _COMMENTS.sub(' ', text)
+        text = _BLOCK_TAGS.sub(' ', text)
+        text = _BREAK_TAGS.sub(' ', text)
+        text = _TAGS.sub('', text)
+    if '&' in text:
+        # 이중 인코딩(&amp;amp;)까지 풀리도록 두 번
+        text = html.unescape(html.unescape(text))
+        # 엔티티로 인코딩돼 있던 태그 (<description>&lt;p&gt;...)
+        if '<' in text:
+            text = _TAGS.sub('', _BLOCK_TAGS.sub(' ', text))
+    text = _INVISIBLE.sub('', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def strip_boilerplate(text: str, title: str = '') -> str:
+    """상투 문구와 제목 반복 제거"""
+    for pattern in BOILERPLATE_PATTERNS:
+        text = pattern.sub('', text).strip()
+    if title:
+        title = strip_html(title)
+        if text.lower().startswith(title.lower()):
+            text = text[len(title):].lstrip(' .:-–—|')
+    return text
+
+
+def normalize_summary(summary: str, title: str = '') -> str:
+    return strip_boilerplate(strip_html(summary), title)[:SUMMARY_MAX_CHARS]
+
+
+class SummaryNormalizer:
+    def __init__(self, max_entries: int = 5000):
+        """
+        Args:
+            max_entries: 캐시할 최대 항목 수 (오래 쓰지 않은 항목부터 제거)
+        """
+        self.max_entries = max_entries
+        self._cache: 'OrderedDict[Tuple[str, bytes], Tuple[str, int, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def normalize(self, entry_id: str, summary: str, title: str = '') -> Dict:
+        """항목 요약 정규화 ((id, 원문 요약/제목 해시)별 캐시 - 매체가 요약을 고치면 새로 계산)
+
+        Returns:
+            {'summary': 정규화된 요약, 'summary_tokens': 정규화 후 토큰 수,
+             'raw_summary_tokens': 정규화 전(앞 500자) 토큰 수}
+        """
+        key = None
+        if entry_id:
+            # 제목도 정규화 결과(제목 반복 제거)에 영향을 주므로 함께 해시
+            raw = f"{summary or ''}\0{title or ''}".encode('utf-8')
+            digest = hashlib.blake2b(raw, digest_size=8).digest()
+            key = (entry_id, digest)
+
+        with self._lock:
+            cached = self._cache.get(key) if key else None
+            if cached:
+                self._cache.move_to_end(key)
+
+        if not cached:
+            cleaned = normalize_summary(summary, title)
+            cached = (cleaned, estimate_tokens(cleaned), estimate_tokens((summary or '')[:SUMMARY_MAX_CHARS]))
+            if key:
+                with self._lock:
+                    self._cache[key] = cached
+                    while len(self._cache) > self.max_entries:
+                        self._cache.popitem(last=False)
+
+        return {'summary': cached[0], 'summary_tokens': cached[1], 'raw_summary_tokens': cached[2]}
@@ -10,7 +10,10 @@ import re
 from datetime import datetime, timedelta
 from collections import Counter
 from typing import List, Dict
-import requests
+
+import llm_cache
+from daily_rollup import MAX_STORIES, DailyRollupStore, render_digest
+from sent_news_store import SentNewsStore
 
 # Reddit & Google Trends
 try:
@@ -31,36 +34,24 @@ except ImportError:
 class WeeklyHotNewsAnalyzer:
     def __init__(self, openai_api_key: str, sent_news_file: str):
         self.openai_api_key = openai_api_key
-        self.sent_news_file = sent_news_file
+        self.sent_news_store = SentNewsStore.from_legacy_file(sent_news_file)
+        self.daily_rollups = DailyRollupStore(self.sent_news_store)
         
         # Reddit 설정 (환경 변수에서 가져오기)
         self.reddit_client_id = os.getenv('REDDIT_CLIENT_ID')
         self.reddit_client_secret = os.getenv('REDDIT_CLIENT_SECRET')
         
-    def _load_weekly_news_history(self) -> List[Dict]:
-        """지난 7일간 전송된 뉴스 기록 로드"""
+    def _load_weekly_digests(self) -> List[Dict]:
+        """지난 7일간 일별 롤업 로드 (원본 기록 대신 날짜별 digest)"""
         try:
-            if not os.path.exists(self.sent_news_file):
-                print("⚠️ 뉴스 기록 파일 없음")
-                return []
-            
-            with open(self.sent_news_file, 'r', encoding='utf-8') as f:
-                history = json.load(f)
+            today = datetime.now().date()
+            digests = self.daily_rollups.digests(today - timedelta(days=6), today)
             
-            # 7일 전 날짜 계산
-            seven_days_ago = datetime.now() - timedelta(days=7)
-            
-            # 7일 이내 뉴스만 필터링
-            weekly_news = [
-                news for news in history.get('sent_news', [])
-                if news.get('sent_at', '') > seven_days_ago.isoformat()
-            ]
-            
-            print(f"📊 지난 7일간 전송된 뉴스: {len(weekly_news)}개")
-            return weekly_news
+            print(f"📊 지난 7일간 전송된 뉴스: {sum(d['news_count'] for d in digests)}개 ({len(digests)}일치 롤업)")
+            return digests
             
         except Exception as e:
-            print(f"⚠️ 뉴스 기록 로드 실패: {e}")
+            print(f"⚠️ 일별 롤업 로드 실패: {e}")
             return []
     
     def get_reddit_wsb_hot_tickers(self, limit: int = 100) -> Dict[str, int]:
@@ -194,10 +185,11 @@ class WeeklyHotNewsAnalyzer:
         print(f"🔥 주간 핫 뉴스 TOP 10 분석 시작")
         print(f"{'='*60}\n")
         
-        # 1. 지난 7일 뉴스 기록 로드
-        weekly_news = self._load_weekly_news_history()
+        # 1. 지난 7일 일별 롤업 로드
+        weekly_digests = self._load_weekly_digests()
+        weekly_news_count = sum(digest['news_count'] for digest in weekly_digests)
         
-        if not weekly_news:
+        if not weekly_news_count:
             print("❌ 분석할 뉴스가 없습니다.")
             return []
         
@@ -213,11 +205,8 @@ class WeeklyHotNewsAnalyzer:
         # 4. GPT에게 종합 분석 요청
         print(f"\n🤖 GPT-4o-mini로 종합 분석 중...\n")
         
-        # 뉴스 데이터 준비
-        news_summary = "\n\n".join([
-            f"[{idx+1}] {news.get('title', '')}\n요약: {news.get('summary', '')[:200]}\n발송: {news.get('sent_at', '')[:10]}"
-            for idx, news in enumerate(weekly_news[:100])  # 최대 100개
-        ])
+        # 뉴스 데이터 준비 (날짜별 digest - 한 번의 호출이므로 하루 대표 뉴스는 상위 MAX_STORIES개)
+        news_summary = "\n\n".join(render_digest(digest, MAX_STORIES) for digest in weekly_digests)
         
         # Reddit 데이터 준비
         reddit_summary = ""
@@ -238,7 +227,7 @@ class WeeklyHotNewsAnalyzer:
 
 지난 7일간의 미국 주식 뉴스와 소셜 데이터를 종합 분석하여 **주간 핫 이슈 TOP 10**을 선정해주세요.
 
-**지난 7일간 전송된 뉴스** ({len(weekly_news)}개):
+**지난 7일간 전송된 뉴스** ({weekly_news_count}개, 날짜별 종목/주제 빈도와 대표 이슈):
 {news_summary}
 
 **소셜 미디어 분석**:
@@ -281,13 +270,9 @@ class WeeklyHotNewsAnalyzer:
 JSON만 출력하세요."""
 
         try:
-            response = requests.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers={
-                    'Authorization': f'Bearer {self.openai_api_key}',
-                    'Content-Type': 'application/json'
-                },
-                json={
+            response = llm_cache.chat_completion(
+                self.openai_api_key,
+                {
                     'model': 'gpt-4o',  # GPT-4o 사용 (주간 분석)
                     'messages': [
                         {'role': 'system', 'content': '당신은 금융 뉴스 분석 전문가입니다. JSON 형식으로만 응답하세요.'},